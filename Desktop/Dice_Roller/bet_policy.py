@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Optimal bet sizing by dynamic programming, with policy tables cached on disk.
+
+A state is (balance, opponents, target): the player wants to reach `target`
+before going broke, and every opponent matches the player's bet. With V(0) = 0
+and V(target) = 1, value iteration repeats
+
+    V(b) = max over bets a <= b of  sum over next balances n of  P(n | b, a) * V(n)
+
+using the same one-round transitions as risk_of_ruin (rank distribution with
+'No Score' re-rolled, split pots and the remainder policy). Plain value
+iteration needs thousands of sweeps here, because small bets make long
+games; instead each greedy policy is evaluated exactly with the risk_of_ruin
+solver and improved with one backup (policy iteration), which reaches the
+same fixed point in a handful of steps. The bet that attains the maximum
+(the smallest one on ties) is the policy. A solved table is a plain list indexed by balance, so looking up
+a bet at the table is O(1); tables are saved as JSON under BET_POLICY_DIR and
+loaded instead of re-solved.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import BET_POLICY_DIR, BET_POLICY_MAX_TARGET, INITIAL_PLAYER_BALANCE, REMAINDER_POLICY
+from risk_of_ruin import risk_of_ruin, round_outcomes, solve_chain, transitions
+from rules import get_active_rules
+
+# numpy is optional; without it the backups run in plain Python
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+POLICY_FORMAT_VERSION = 1
+
+
+class BetPolicy:
+    """
+    A solved policy table for one (opponents, target) pair.
+    """
+    def __init__(self, opponents: int, target: int, bets: List[int], values: List[float],
+                 iterations: int = 0) -> None:
+        """
+        Args:
+            opponents (int): Opponents the table was solved for.
+            target (int): Balance the player is trying to reach.
+            bets (List[int]): Optimal bet for every balance 0..target (0 where there is no bet).
+            values (List[float]): Probability of reaching the target from every balance under the policy.
+            iterations (int): Improvement steps it took.
+        """
+        self.opponents = opponents
+        self.target = target
+        self.bets = bets
+        self.values = values
+        self.iterations = iterations
+
+    def bet(self, balance: int) -> int:
+        """Optimal bet at a balance (0 when broke or at/over the target)."""
+        return self.bets[balance] if 0 <= balance < len(self.bets) else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": POLICY_FORMAT_VERSION, "opponents": self.opponents, "target": self.target,
+                "bets": self.bets, "values": self.values, "iterations": self.iterations}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BetPolicy":
+        if data.get("version") != POLICY_FORMAT_VERSION:
+            raise ValueError("Unsupported policy table format")
+        return cls(data["opponents"], data["target"], data["bets"], data["values"], data.get("iterations", 0))
+
+
+def _jumps(bet: int, opponents: int, outcomes: Dict[int, float], remainder_policy: str) -> List[Tuple[int, float]]:
+    """
+    Balance changes of one round at a stake of `bet`, with their probabilities.
+    They are the same for every balance that covers the bet.
+    """
+    cap = bet * (opponents + 2)  # Above any payout, so nothing is merged
+    return [(n - bet, p) for n, p in transitions(bet, bet, opponents, cap, outcomes, remainder_policy).items()]
+
+
+def solve_policy(opponents: int, target: int, rules: Any = None, remainder_policy: str = REMAINDER_POLICY,
+                 bet_step: int = 1, tolerance: float = 1e-9, max_iterations: int = 1000,
+                 solver: str = "auto") -> BetPolicy:
+    """
+    Solve the bet that maximizes the chance of reaching `target` for every balance.
+    Args:
+        opponents (int): Opponents at the table, each matching the bet.
+        target (int): Balance the player is trying to reach.
+        rules (Any): RuleSet to use (the active rules if None).
+        remainder_policy (str): "first_seat", "house" or "carry" (see risk_of_ruin).
+        bet_step (int): Bets considered are multiples of this, plus going all-in.
+        tolerance (float): A bet only replaces the current one if it is better by more than this.
+        max_iterations (int): Safety cap on improvement steps.
+        solver (str): Linear solver for the policy evaluations (see risk_of_ruin.solve_chain).
+    Returns:
+        BetPolicy: The policy table.
+    """
+    if opponents < 1:
+        raise ValueError("opponents must be at least 1")
+    if target < 2:
+        raise ValueError("target must be at least 2")
+    if bet_step < 1:
+        raise ValueError("bet_step must be at least 1")
+    outcomes = round_outcomes(opponents, rules)
+    # Bet columns: every multiple of bet_step below the target, then all-in
+    step_bets = list(range(bet_step, target, bet_step))
+    step_jumps = [_jumps(bet, opponents, outcomes, remainder_policy) for bet in step_bets]
+    all_in_jumps = [_jumps(balance, opponents, outcomes, remainder_policy) for balance in range(1, target)]
+    all_in = len(step_bets)
+
+    if _numpy_available:
+        # One (delta, probability) array pair per branch position, padded with zero-probability branches
+        def pad(jumps_list: List[List[Tuple[int, float]]]) -> List[Tuple[Any, Any]]:
+            width = max(len(jumps) for jumps in jumps_list)
+            full = [jumps + [(0, 0.0)] * (width - len(jumps)) for jumps in jumps_list]
+            return [(np.array([jumps[k][0] for jumps in full]), np.array([jumps[k][1] for jumps in full]))
+                    for k in range(width)]
+        padded_steps = pad(step_jumps) if step_bets else []
+        padded_all_in = pad(all_in_jumps)
+
+    def backup(values: List[float]) -> Any:
+        """One Bellman backup: the value of every bet column at every balance (-1 if not allowed)."""
+        if _numpy_available:
+            v = np.asarray(values)
+            balances = np.arange(1, target)[:, None]
+            q = np.full((target - 1, all_in + 1), -1.0)
+            if step_bets:
+                q[:, :all_in] = sum(p * v[np.clip(balances + d, 0, target)] for d, p in padded_steps)
+                q[:, :all_in][np.array(step_bets)[None, :] > balances] = -1.0
+            q[:, all_in] = sum(p * v[np.minimum(balances[:, 0] + d, target)] for d, p in padded_all_in)
+            return q
+        q = []
+        for balance in range(1, target):
+            row = [-1.0] * (all_in + 1)
+            for j, jumps in enumerate(step_jumps[:balance // bet_step]):
+                row[j] = sum(p * values[min(balance + d, target)] for d, p in jumps)
+            row[all_in] = sum(p * values[min(balance + d, target)] for d, p in all_in_jumps[balance - 1])
+            q.append(row)
+        return q
+
+    picks = [0 if bet_step <= balance else all_in for balance in range(1, target)]  # Smallest bet first
+    for iterations in range(1, max_iterations + 1):
+        # Evaluate the current policy exactly: (I - Q) v = chance of reaching the target next round
+        rows, rhs = [], [0.0] * (target - 1)
+        for i, pick in enumerate(picks):
+            balance = i + 1
+            row = {i: 1.0}
+            for d, p in step_jumps[pick] if pick < all_in else all_in_jumps[i]:
+                n = min(balance + d, target)
+                if n == target:
+                    rhs[i] += p
+                elif n > 0:
+                    row[n - 1] = row.get(n - 1, 0.0) - p
+            rows.append(row)
+        values = [0.0] + solve_chain(rows, [rhs], solver)[0] + [1.0]
+        # Improve greedily, keeping the current bet unless another is clearly better
+        q = backup(values)
+        if _numpy_available:
+            best = q.max(axis=1)
+            current = q[np.arange(target - 1), picks]
+            switch = current < best - tolerance
+            improved = np.where(switch, (q >= best[:, None] - tolerance).argmax(axis=1), picks).tolist()
+        else:
+            improved = []
+            for row, pick in zip(q, picks):
+                best = max(row)
+                if row[pick] < best - tolerance:
+                    pick = next(j for j, value in enumerate(row) if value >= best - tolerance)
+                improved.append(pick)
+        if improved == picks:
+            break
+        picks = improved
+    bets = [0] + [step_bets[pick] if pick < all_in else balance
+                  for balance, pick in enumerate(picks, start=1)] + [0]
+    return BetPolicy(opponents, target, bets, values, iterations)
+
+
+class BetAdvisor:
+    """
+    Policy tables on demand: memory first, then the disk cache, then a solve (which is saved).
+
+    Solving a table takes from a fraction of a second to many seconds as the
+    target grows, so interactive callers look tables up with solve=False and
+    fill the cache ahead of time with precompute(), which solves on a
+    background thread. Targets above max_target are never solved.
+    """
+    def __init__(self, rules: Any = None, remainder_policy: str = REMAINDER_POLICY, bet_step: int = 1,
+                 cache_dir: Optional[str] = BET_POLICY_DIR, max_target: int = BET_POLICY_MAX_TARGET) -> None:
+        """
+        Args:
+            rules (Any): RuleSet to use (the active rules if None).
+            remainder_policy (str): Remainder policy of the table.
+            bet_step (int): Bet granularity of the tables.
+            cache_dir (Optional[str]): Directory of cached tables (None keeps them in memory only).
+            max_target (int): Largest target a table is solved for.
+        """
+        self.rules = rules
+        self.remainder_policy = remainder_policy
+        self.bet_step = bet_step
+        self.cache_dir = cache_dir
+        self.max_target = max_target
+        self._policies: Dict[Tuple[int, int], BetPolicy] = {}
+        self._solving: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()  # One solve at a time, and never the same table twice
+
+    def _cache_path(self, opponents: int, target: int) -> str:
+        # Keyed on the full rule spec (flags, dice and sides), not just the variant's name
+        rules = self.rules or get_active_rules()
+        spec = hashlib.sha1(json.dumps(rules.to_spec(), sort_keys=True).encode()).hexdigest()[:12]
+        name = f"{rules.name}-{spec}_{self.remainder_policy}_step{self.bet_step}_vs{opponents}_to{target}.json"
+        return os.path.join(self.cache_dir, name)
+
+    def cached(self, opponents: int, target: int) -> Optional[BetPolicy]:
+        """
+        The policy table if it is in memory or on disk (None otherwise); never solves.
+        """
+        key = (opponents, target)
+        policy = self._policies.get(key)
+        if policy is None and self.cache_dir:
+            path = self._cache_path(opponents, target)
+            if os.path.exists(path):
+                try:
+                    with open(path) as f:
+                        policy = BetPolicy.from_dict(json.load(f))
+                except (OSError, ValueError, KeyError):
+                    return None  # Unreadable or outdated cache: the next solve replaces it
+                self._policies[key] = policy
+        return policy
+
+    def policy(self, opponents: int, target: int) -> BetPolicy:
+        """
+        The policy table for a state's (opponents, target), solving it if it is not cached.
+        Raises ValueError if target is above max_target.
+        """
+        if target > self.max_target:
+            raise ValueError(f"target {target} is above the policy table limit of {self.max_target}")
+        with self._lock:
+            policy = self.cached(opponents, target)
+            if policy is None:
+                policy = solve_policy(opponents, target, self.rules, self.remainder_policy, self.bet_step)
+                if self.cache_dir:
+                    path = self._cache_path(opponents, target)
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    tmp_path = f"{path}.tmp"
+                    with open(tmp_path, "w") as f:
+                        json.dump(policy.to_dict(), f)
+                    os.replace(tmp_path, path)
+                self._policies[(opponents, target)] = policy
+        return policy
+
+    def precompute(self, tables: Iterable[Tuple[int, int]]) -> Optional[threading.Thread]:
+        """
+        Solve the (opponents, target) tables that are not cached yet, one after another
+        on a background thread.
+        Returns:
+            Optional[threading.Thread]: The worker, or None if there was nothing to solve.
+        """
+        todo = []
+        for opponents, target in tables:
+            key = (opponents, target)
+            if 1 <= opponents and 2 <= target <= self.max_target and key not in self._solving \
+                    and key not in todo and self.cached(opponents, target) is None:
+                todo.append(key)
+        if not todo:
+            return None
+        self._solving.update(todo)
+
+        def run() -> None:
+            for opponents, target in todo:
+                try:
+                    self.policy(opponents, target)
+                except (OSError, ValueError, RuntimeError) as e:
+                    print(f"Bet policy for {opponents} opponent(s), target {target} failed: {e}")
+                finally:
+                    self._solving.discard((opponents, target))
+
+        worker = threading.Thread(target=run, name="bet-policy", daemon=True)
+        worker.start()
+        return worker
+
+    def suggest(self, balance: int, opponents: int, target: int, solve: bool = True) -> Optional[int]:
+        """
+        Suggested bet for a player, or None when there is nothing to suggest
+        (no opponents, broke, already at the target, target above max_target,
+        or, with solve=False, the table is not cached yet).
+        """
+        if opponents < 1 or balance <= 0 or balance >= target or target > self.max_target:
+            return None
+        policy = self.policy(opponents, target) if solve else self.cached(opponents, target)
+        if policy is None:
+            return None
+        return policy.bet(balance) or None
+
+    def bot_bet(self, player_manager: Any, name: str, target: Optional[int] = None) -> int:
+        """
+        The bet a bot following the policy sets for the table (everyone matches it, as with
+        the app's flat bet).
+        Args:
+            player_manager (Any): The PlayerManager for the table.
+            name (str): The bot's player name.
+            target (Optional[int]): Balance the bot plays for (table_target if None).
+        Returns:
+            int: The bet (all-in when there is nothing to suggest).
+        """
+        balance = player_manager.players[name]["balance"]
+        opponents = len(player_manager.get_players_with_balance()) - 1
+        suggestion = self.suggest(balance, opponents, table_target(player_manager) if target is None else target)
+        return suggestion or balance
+
+
+def table_target(player_manager: Any, ledger: Any = None) -> int:
+    """
+    The money on the table (every balance plus a carried-over pot): the target a player
+    trying to win the whole table plays for.
+    """
+    carry_over = ledger.carry_over if ledger is not None else 0
+    return sum(player["balance"] for player in player_manager.players.values()) + carry_over
+
+
+def _compare(advisor: BetAdvisor, opponents: int, flat_bet: int, games: int, seed: int,
+             max_rounds: int = 500) -> Dict[str, Dict[str, float]]:
+    """
+    Play games in which P0 sets the stake by the policy, and games with a flat stake.
+    Returns:
+        Dict[str, Dict[str, float]]: For "policy" and "flat", the share of games P0 won
+        (last player with money) and the share still running after max_rounds.
+    """
+    from ledger import SettlementLedger
+    from player_manager import PlayerManager
+    from round_manager import play_round
+    rng = random.Random(seed)
+    results = {}
+    for mode in ("policy", "flat"):
+        won = unfinished = 0
+        for _ in range(games):
+            pm = PlayerManager(history_limit=0)
+            for i in range(opponents + 1):
+                pm.add_player(f"P{i}")
+            ledger = SettlementLedger(advisor.remainder_policy)
+            target = table_target(pm)
+            for _ in range(max_rounds):
+                if len(pm.get_players_with_balance()) <= 1:
+                    break
+                bet = flat_bet
+                if mode == "policy" and pm.players["P0"]["balance"] > 0:
+                    bet = advisor.bot_bet(pm, "P0", target)
+                play_round(pm, bet, ledger, rng)
+            active = pm.get_players_with_balance()
+            won += active == ["P0"]
+            unfinished += len(active) > 1
+        results[mode] = {"won": won / games, "unfinished": unfinished / games}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve and cache optimal Cee-lo bet-sizing tables.")
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 3, 4], help="Table sizes to precompute")
+    parser.add_argument("--target", type=int, default=None, help="Target balance (table's starting money if omitted)")
+    parser.add_argument("--bet-step", type=int, default=1)
+    parser.add_argument("--remainder-policy", default=REMAINDER_POLICY, choices=("carry", "house", "first_seat"))
+    parser.add_argument("--compare-games", type=int, default=0,
+                        help="Also play this many games with a policy bot setting the stake")
+    parser.add_argument("--flat-bet", type=int, default=10)
+    args = parser.parse_args()
+    # Offline precomputation is not bound by the interactive size limit
+    largest = max([args.target or 0] + [players * INITIAL_PLAYER_BALANCE for players in args.players])
+    advisor = BetAdvisor(remainder_policy=args.remainder_policy, bet_step=args.bet_step,
+                         max_target=max(BET_POLICY_MAX_TARGET, largest))
+    for players in args.players:
+        target = args.target or players * INITIAL_PLAYER_BALANCE
+        policy = advisor.policy(players - 1, target)
+        balance = min(INITIAL_PLAYER_BALANCE, target - 1)
+        print(f"{players} players, target {target}: bet {policy.bet(balance)} at {balance} "
+              f"(reach target {policy.values[balance]:.4f}, {policy.iterations} steps)")
+        flat = risk_of_ruin(balance, args.flat_bet, players - 1, target, advisor.rules, args.remainder_policy,
+                            match_all_in=True)
+        print(f"  A flat ${args.flat_bet} bet reaches it with probability {flat['target_probability']:.4f}")
+        if args.compare_games:
+            result = _compare(advisor, players - 1, args.flat_bet, args.compare_games, seed=players)
+            for mode, label in (("policy", "Policy bot"), ("flat", f"Flat ${args.flat_bet}")):
+                print(f"  {label}: won {result[mode]['won']:.3f} of {args.compare_games} games "
+                      f"({result[mode]['unfinished']:.3f} unfinished)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,18 @@ MUSIC_FILE = "background_music.mp3"  # !!! IMPORTANT: Replace with your actual m
 DICE_SIDES = 6
 NUM_DICE = 3
 INITIAL_PLAYER_BALANCE = 100
+HOUSE_RULES = "standard"  # Rule variant: "standard", "trips_high", "no_auto_loss" or "ace_point"
+REMAINDER_POLICY = "carry"  # Remainder of a split pot: "carry", "house" or "first_seat"
+BATCH_SETTLE_MIN_SEATS = 64  # Rounds with at least this many seats are ranked and settled in one vectorized pass
+LEADERBOARD_TOP_K = 10  # Number of players shown in the leaderboard popup
+ROLL_ANIMATION_FRAMES = 10  # Frames of the dice-roll animation (0 shows the result at once)
+PROFILE_DB_FILE = "player_profiles.db"  # SQLite file for persistent player profiles
+PROFILE_FLUSH_INTERVAL_MS = 5000  # Write-behind interval for profile changes
+BET_POLICY_DIR = "bet_policies"  # Cached optimal bet-sizing tables (see bet_policy.py)
+BET_POLICY_MAX_TARGET = 2000  # Largest table money a bet policy is solved for (cost grows with its square)
+SPECTATOR_PORT = 0  # Loopback TCP port of the spectator feed (0 = off)
+# Debug: sample widget, Tcl command, after-handle and heap counts every N rounds (0 = off)
+LEAK_MONITOR_ROUNDS = int(os.environ.get("CEELO_LEAK_MONITOR_ROUNDS", "0"))
 
 # --- Color Palette (Customizable!) ---
 COLOR_PRIMARY = "#2c3e50"     # Dark Blue/Gray for background
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Columnar, chunked export of round data for analysis.
+
+Rows are buffered in typed column arrays (uint8 dice, int32 money) and flushed
+every chunk_rows rows, so memory stays bounded however many rounds are written.
+Each row is a player's scoring roll for the round; 'No Score' re-rolls are not
+exported (they are counted in GameStats and kept in session recordings).
+CSV is always available; Parquet is written as well when pyarrow is installed.
+"""
+import argparse
+import csv
+import os
+import random
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import NUM_DICE, INITIAL_PLAYER_BALANCE, REMAINDER_POLICY
+from ledger import SettlementLedger
+from player_manager import PlayerManager
+from round_manager import play_round
+from stats import OUTCOME_CATEGORIES
+
+# pyarrow is optional; without it only CSV is written
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _pyarrow_available = True
+except ImportError:
+    _pyarrow_available = False
+
+OUTCOME_CODES = {category: code for code, category in enumerate(OUTCOME_CATEGORIES)}
+
+
+def _column_types(num_dice: int) -> Dict[str, str]:
+    """Column name -> array typecode (B: uint8, H: uint16, I: uint32, i: int32)."""
+    columns = {"round_id": "I", "seat": "H"}
+    columns.update({f"die{i + 1}": "B" for i in range(num_dice)})
+    columns.update({"outcome": "B", "point": "B", "bet": "i", "payout": "i", "balance": "i"})
+    return columns
+
+
+_ARROW_TYPES = {"B": "uint8", "H": "uint16", "I": "uint32", "i": "int32"}
+
+
+class RoundExporter:
+    """
+    Streams one row per player per round (final scoring roll, outcome, bet,
+    payout and balance after settlement) to CSV and, when available, Parquet.
+    'No Score' re-rolls before the scoring roll are not exported.
+    """
+    def __init__(self, path_prefix: str, formats: Sequence[str] = ("csv", "parquet"),
+                 chunk_rows: int = 65536, num_dice: int = NUM_DICE) -> None:
+        """
+        Args:
+            path_prefix (str): Output path without extension (".csv"/".parquet" are appended).
+            formats (Sequence[str]): Any of "csv" and "parquet"; parquet is skipped without pyarrow.
+            chunk_rows (int): Rows buffered before a flush (one Parquet row group per chunk).
+            num_dice (int): Dice per roll.
+        """
+        self.path_prefix = path_prefix
+        self.chunk_rows = chunk_rows
+        self.num_dice = num_dice
+        self.types = _column_types(num_dice)
+        self.columns: Dict[str, array] = {name: array(code) for name, code in self.types.items()}
+        self.rows_written = 0
+        self.write_csv = "csv" in formats
+        self.write_parquet = "parquet" in formats and _pyarrow_available
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        if self.write_csv:
+            self._csv_file = open(f"{path_prefix}.csv", "w", newline="")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(list(self.types))
+        if self.write_parquet:
+            schema = pa.schema([(name, getattr(pa, _ARROW_TYPES[code])()) for name, code in self.types.items()])
+            self._parquet_writer = pq.ParquetWriter(f"{path_prefix}.parquet", schema)
+
+    def __enter__(self) -> "RoundExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def buffered_rows(self) -> int:
+        return len(self.columns["round_id"])
+
+    def add_row(self, round_id: int, seat: int, dice: List[int], outcome: str, point: int,
+                bet: int, payout: int, balance: int) -> None:
+        """
+        Buffer one row, flushing when the chunk is full.
+        """
+        cols = self.columns
+        cols["round_id"].append(round_id)
+        cols["seat"].append(seat)
+        for i in range(self.num_dice):
+            cols[f"die{i + 1}"].append(dice[i])
+        cols["outcome"].append(OUTCOME_CODES[outcome])
+        cols["point"].append(point)
+        cols["bet"].append(bet)
+        cols["payout"].append(payout)
+        cols["balance"].append(balance)
+        if self.buffered_rows >= self.chunk_rows:
+            self.flush()
+
+    def add_round(self, round_id: int, player_manager: Any, round_rolls: Dict[str, Dict[str, Any]],
+                  settlement: Dict[str, Any]) -> None:
+        """
+        Buffer every player's row for a settled round (e.g. the result of play_round).
+        """
+        payouts = settlement.get("payouts", {})
+        seats = {name: seat for seat, name in enumerate(player_manager.players)}
+        for name, info in round_rolls.items():
+            point = info["value"] if info["outcome"] == "Point" else 0
+            self.add_row(round_id, seats[name], info["rolls"], info["outcome"], point,
+                         info["bet"], payouts.get(name, 0), player_manager.players[name]["balance"])
+
+    def flush(self) -> None:
+        """
+        Write the buffered chunk to every output and clear the buffers.
+        """
+        if not self.buffered_rows:
+            return
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(zip(*self.columns.values()))
+        if self._parquet_writer is not None:
+            arrays = [pa.array(self.columns[name], type=getattr(pa, _ARROW_TYPES[code])())
+                      for name, code in self.types.items()]
+            self._parquet_writer.write_table(pa.Table.from_arrays(arrays, names=list(self.types)))
+        self.rows_written += self.buffered_rows
+        self.columns = {name: array(code) for name, code in self.types.items()}
+
+    def close(self) -> None:
+        """
+        Flush remaining rows and close all outputs.
+        """
+        self.flush()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def export_simulation(path_prefix: str, rounds: int, players: int = 4, bet: int = 10,
+                      seed: Optional[int] = None, chunk_rows: int = 65536,
+                      formats: Sequence[str] = ("csv", "parquet")) -> int:
+    """
+    Simulate rounds at one table and export them. Busted players are re-bought
+    to the initial balance so the table keeps running.
+    Returns the number of rows written.
+    """
+    rng = random.Random(seed)
+    pm = PlayerManager(history_limit=0)  # No undo history needed for bulk play
+    for i in range(players):
+        pm.add_player(f"Player{i + 1}")
+    ledger = SettlementLedger(REMAINDER_POLICY)
+    with RoundExporter(path_prefix, formats, chunk_rows) as exporter:
+        for round_id in range(rounds):
+            result = play_round(pm, bet, ledger, rng)
+            exporter.add_round(round_id, pm, result["round_rolls"], result["settlement"])
+            for name, data in pm.players.items():
+                if data["is_out"]:
+                    data["balance"] = INITIAL_PLAYER_BALANCE
+                    data["is_out"] = False
+                    pm.notify_player_changed(name)
+    return exporter.rows_written
+
+
+def main() -> None:
+    """
+    Command-line entry point: simulate and export rounds.
+    """
+    parser = argparse.ArgumentParser(description="Export simulated Cee-lo rounds in columnar chunks.")
+    parser.add_argument("output", help="Output path prefix (extensions are added)")
+    parser.add_argument("--rounds", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    parser.add_argument("--format", action="append", choices=("csv", "parquet"),
+                        help="Output format (repeatable; default: csv and parquet if pyarrow is installed)")
+    args = parser.parse_args()
+    formats = args.format or ("csv", "parquet")
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    rows = export_simulation(args.output, args.rounds, args.players, args.bet, args.seed,
+                             args.chunk_rows, formats)
+    written = [f for f in formats if f == "csv" or _pyarrow_available]
+    if "parquet" in formats and not _pyarrow_available:
+        print("pyarrow is not available; Parquet output was skipped. To install pyarrow: pip install pyarrow")
+    print(f"Wrote {rows} rows to {args.output}.* ({', '.join(written)})")
+
+
+if __name__ == "__main__":
+    main()
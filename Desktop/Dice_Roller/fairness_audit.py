@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+RNG fairness audit for the production dice roll path.
+
+Draws dice exactly as a table does: each chunk is one table RNG, a
+random.Random seeded with random.randrange(2 ** 32) like
+CeeLoDiceGameApp._start_game, rolled through roll_single_die. Chunks run across
+worker processes and are folded into running totals, so memory use does not
+grow with the number of dice. Reports chi-square tests per face and per roll
+combination, a lag-1 serial correlation test and a runs test (above/below the
+mean face), with p-values and throughput.
+
+roll_single_die is the only roll path: the app, play_round and every bulk
+runner draw their dice through it, so it is the whole audit surface.
+"""
+import argparse
+import math
+import random
+import time
+from multiprocessing import Pool
+from typing import Any, Dict, List, Tuple
+
+from config import DICE_SIDES, NUM_DICE
+from dice_logic import roll_single_die
+
+# numpy is optional; it speeds up the per-chunk tallies
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+AUDIT_MODES = ("single", "batch")
+
+
+# --- p-value helpers (no scipy needed) ---------------------------------------
+
+def _gamma_q(a: float, x: float) -> float:
+    """Regularized upper incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        # Series expansion of P(a, x)
+        term = total = 1.0 / a
+        n = a
+        for _ in range(10000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
+
+
+def chi_square_p_value(statistic: float, dof: int) -> float:
+    """Upper-tail p-value of a chi-square statistic."""
+    return _gamma_q(dof / 2.0, statistic / 2.0)
+
+
+def normal_p_value(z: float) -> float:
+    """Two-sided p-value of a standard normal statistic."""
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+# --- Workers -----------------------------------------------------------------
+
+def _empty_totals(sides: int, num_dice: int) -> Dict[str, Any]:
+    return {
+        "dice": 0,
+        "faces": [0] * sides,
+        "combos": [0] * sides ** num_dice,
+        "lag_pairs": 0, "sum_x": 0, "sum_y": 0, "sum_xy": 0,
+        "runs": 0, "runs_expected": 0.0, "runs_variance": 0.0,
+    }
+
+
+def _runs_moments(n_high: int, n_low: int) -> Tuple[float, float]:
+    """Mean and variance of the number of runs in a two-valued sequence (Wald-Wolfowitz)."""
+    n = n_high + n_low
+    if n_high == 0 or n_low == 0:
+        return 1.0, 0.0
+    mean = 1 + 2.0 * n_high * n_low / n
+    variance = (mean - 1) * (mean - 2) / (n - 1)
+    return mean, variance
+
+
+def table_rng(seed: int) -> random.Random:
+    """
+    The RNG a table plays a game with: random.Random, seeded per game (see CeeLoDiceGameApp._start_game).
+    """
+    rng = random.Random()
+    rng.seed(seed)
+    return rng
+
+
+def audit_chunk(task: Tuple[int, int, int, int, str]) -> Dict[str, Any]:
+    """
+    Roll one chunk of dice with a table RNG and return its partial test statistics.
+    Args:
+        task: (num_rolls, sides, num_dice, seed, mode); "batch" tallies the chunk with numpy,
+            "single" tallies die by die. Both draw the same dice for the same seed.
+    Returns:
+        Dict[str, Any]: Partial totals to be merged with merge_totals.
+    """
+    num_rolls, sides, num_dice, seed, mode = task
+    totals = _empty_totals(sides, num_dice)
+    mid = (sides + 1) / 2.0
+    rng = table_rng(seed)
+    if mode == "batch" and _numpy_available:
+        n = num_rolls * num_dice
+        stream = np.fromiter((roll_single_die(sides, rng) for _ in range(n)), dtype=np.int64, count=n)
+        rolls = stream.reshape(num_rolls, num_dice)
+        totals["faces"] = np.bincount(stream - 1, minlength=sides).tolist()
+        codes = (rolls - 1) @ (sides ** np.arange(num_dice, dtype=np.int64))
+        totals["combos"] = np.bincount(codes, minlength=sides ** num_dice).tolist()
+        totals["sum_x"] = int(stream[:-1].sum())
+        totals["sum_y"] = int(stream[1:].sum())
+        totals["sum_xy"] = int((stream[:-1] * stream[1:]).sum())
+        high = stream > mid
+        totals["runs"] = 1 + int(np.count_nonzero(high[1:] != high[:-1]))
+        n_high = int(high.sum())
+    else:
+        faces, combos = totals["faces"], totals["combos"]
+        previous = None
+        sum_x = sum_y = sum_xy = runs = n_high = 0
+        previous_high = None
+        for _ in range(num_rolls):
+            code = 0
+            for position in range(num_dice):
+                die = roll_single_die(sides, rng)
+                faces[die - 1] += 1
+                code += (die - 1) * sides ** position
+                if previous is not None:
+                    sum_x += previous
+                    sum_y += die
+                    sum_xy += previous * die
+                is_high = die > mid
+                n_high += is_high
+                if is_high != previous_high:
+                    runs += 1
+                previous, previous_high = die, is_high
+            combos[code] += 1
+        totals.update(sum_x=sum_x, sum_y=sum_y, sum_xy=sum_xy, runs=runs)
+    n = num_rolls * num_dice
+    totals["dice"] = n
+    totals["lag_pairs"] = n - 1
+    totals["runs_expected"], totals["runs_variance"] = _runs_moments(n_high, n - n_high)
+    return totals
+
+
+def merge_totals(total: Dict[str, Any], part: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold one chunk's partial statistics into the running totals.
+    Chunks are independent streams, so runs are compared per chunk and summed.
+    """
+    total["faces"] = [a + b for a, b in zip(total["faces"], part["faces"])]
+    total["combos"] = [a + b for a, b in zip(total["combos"], part["combos"])]
+    for key in ("dice", "lag_pairs", "sum_x", "sum_y", "sum_xy", "runs", "runs_expected", "runs_variance"):
+        total[key] += part[key]
+    return total
+
+
+def _chi_square(counts: List[int]) -> Tuple[float, int]:
+    total = sum(counts)
+    expected = total / len(counts)
+    return sum((c - expected) ** 2 for c in counts) / expected, len(counts) - 1
+
+
+def summarize(totals: Dict[str, Any], sides: int) -> List[Dict[str, Any]]:
+    """
+    Turn merged totals into test results with statistics and p-values.
+    """
+    results = []
+    statistic, dof = _chi_square(totals["faces"])
+    results.append({"test": "chi-square per face", "statistic": statistic, "dof": dof,
+                    "p_value": chi_square_p_value(statistic, dof)})
+    statistic, dof = _chi_square(totals["combos"])
+    results.append({"test": f"chi-square per roll ({len(totals['combos'])} combinations)",
+                    "statistic": statistic, "dof": dof, "p_value": chi_square_p_value(statistic, dof)})
+    # Lag-1 serial correlation against the theoretical mean/variance of a fair die
+    m = totals["lag_pairs"]
+    mean = (sides + 1) / 2.0
+    variance = (sides * sides - 1) / 12.0
+    covariance = (totals["sum_xy"] - mean * (totals["sum_x"] + totals["sum_y"]) + m * mean * mean) / m
+    r = covariance / variance
+    z = r * math.sqrt(m)
+    results.append({"test": "lag-1 serial correlation", "statistic": r, "dof": None, "p_value": normal_p_value(z)})
+    z = (totals["runs"] - totals["runs_expected"]) / math.sqrt(totals["runs_variance"]) if totals["runs_variance"] else 0.0
+    results.append({"test": "runs above/below mean", "statistic": z, "dof": None, "p_value": normal_p_value(z)})
+    return results
+
+
+def run_audit(num_dice_total: int, workers: int = None, mode: str = "batch", chunk_dice: int = 3_000_000,
+              sides: int = DICE_SIDES, num_dice: int = NUM_DICE, seed: int = None) -> Dict[str, Any]:
+    """
+    Run the audit over num_dice_total dice (rounded up to whole rolls) split into chunks.
+    Returns the merged totals, test results and throughput.
+    """
+    if mode not in AUDIT_MODES:
+        raise ValueError(f"Unknown audit mode: {mode}")
+    seed = seed if seed is not None else random.randrange(2 ** 32)
+    seeder = random.Random(seed)  # Draws a game seed per chunk, as the app does per game
+    rolls_total = -(-num_dice_total // num_dice)
+    rolls_per_chunk = max(1, chunk_dice // num_dice)
+    tasks = []
+    remaining = rolls_total
+    while remaining > 0:
+        count = min(rolls_per_chunk, remaining)
+        tasks.append((count, sides, num_dice, seeder.randrange(2 ** 32), mode))
+        remaining -= count
+    totals = _empty_totals(sides, num_dice)
+    start = time.perf_counter()
+    if workers == 0:
+        for task in tasks:
+            merge_totals(totals, audit_chunk(task))
+    else:
+        with Pool(workers) as pool:
+            for part in pool.imap_unordered(audit_chunk, tasks):
+                merge_totals(totals, part)
+    elapsed = time.perf_counter() - start
+    return {"totals": totals, "results": summarize(totals, sides), "seconds": elapsed,
+            "dice_per_second": totals["dice"] / elapsed if elapsed else float("inf"), "seed": seed}
+
+
+def main() -> None:
+    """
+    Command-line entry point: run the audit and print a report.
+    """
+    parser = argparse.ArgumentParser(description="Audit the fairness of the dice RNG.")
+    parser.add_argument("--dice", type=float, default=1e8, help="Number of dice to draw (e.g. 1e9)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--mode", choices=AUDIT_MODES, default="batch" if _numpy_available else "single",
+                        help="Both roll through roll_single_die; batch tallies each chunk with numpy, single die by die")
+    parser.add_argument("--chunk", type=int, default=3_000_000, help="Dice per worker chunk")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.mode == "batch" and not _numpy_available:
+        print("numpy is not available; tallying die by die.")
+        args.mode = "single"
+
+    report = run_audit(int(args.dice), args.workers, args.mode, args.chunk, seed=args.seed)
+    print(f"Dice drawn: {report['totals']['dice']:,} (roll_single_die, {args.mode} tallies, seed {report['seed']})")
+    print(f"Throughput: {report['dice_per_second']:,.0f} dice/s in {report['seconds']:.1f}s")
+    for result in report["results"]:
+        dof = f" (dof={result['dof']})" if result["dof"] is not None else ""
+        print(f"{result['test']}: statistic={result['statistic']:.6g}{dof} p={result['p_value']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import math
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Tuple
+from config import *
+from gui_components import setup_fonts
+from rules import get_active_rules
+
+# A row of the panel: (label, observed count, observed share, expected share, z-score)
+FrequencyRow = Tuple[str, int, float, float, float]
+
+
+def _row(label: str, count: int, trials: int, expected: float) -> FrequencyRow:
+    observed = count / trials if trials else 0.0
+    spread = math.sqrt(trials * expected * (1 - expected))
+    z = (count - trials * expected) / spread if spread else 0.0
+    return (label, count, observed, expected, z)
+
+
+def frequency_rows(counter: Any, theoretical: Dict[str, Dict[Any, float]], num_dice: int = NUM_DICE) -> List[FrequencyRow]:
+    """
+    Compare an OutcomeCounter with the theoretical frequencies of a rule set.
+    Outcome and point shares are per roll; face shares are per die rolled.
+    The z-score is the deviation from the expected count in binomial standard deviations.
+    """
+    rows = []
+    for category, expected in theoretical["outcomes"].items():
+        rows.append(_row(category, counter.outcomes.get(category, 0), counter.rolls, expected))
+    for point, expected in theoretical["points"].items():
+        rows.append(_row(f"Point {point}", counter.points.get(point, 0), counter.rolls, expected))
+    dice = counter.rolls * num_dice
+    for face, expected in theoretical["faces"].items():
+        rows.append(_row(f"Face {face}", counter.faces.get(face, 0), dice, expected))
+    return rows
+
+
+class OutcomeFrequencyPanel(tk.Frame):
+    """
+    Live table of observed vs. theoretical roll frequencies.
+
+    The counts come from the session's OutcomeCounter, which is already updated
+    in O(1) per roll; notify() only schedules a repaint, and repaints happen at
+    most once per min_interval_ms however fast rolls arrive. Rows whose z-score
+    is beyond 2 or 3 are highlighted, which makes a biased die or a broken RNG
+    stand out after a few hundred rolls.
+    """
+    def __init__(self, parent, counter_getter: Callable[[], Any], min_interval_ms: int = 250,
+                 rules: Any = None, **kwargs) -> None:
+        """
+        Args:
+            parent: The parent widget.
+            counter_getter (Callable[[], Any]): Returns the OutcomeCounter to display.
+            min_interval_ms (int): Minimum time between repaints.
+            rules (Any): RuleSet giving the expected frequencies (the active rules if None).
+        """
+        super().__init__(parent, bg=COLOR_SECONDARY, **kwargs)
+        self.counter_getter = counter_getter
+        self.min_interval_ms = min_interval_ms
+        self.theoretical = (rules or get_active_rules()).theoretical_frequencies()
+        self._pending = False
+        font = setup_fonts()['player_label_font']
+        self._cells: List[List[tk.Label]] = []
+        for col, title in enumerate(("Result", "Count", "Observed", "Expected", "z")):
+            tk.Label(self, text=title, font=font, fg=COLOR_ACCENT, bg=COLOR_SECONDARY).grid(
+                row=0, column=col, padx=4, sticky="e" if col else "w")
+        for i, row in enumerate(frequency_rows(counter_getter(), self.theoretical)):
+            cells = []
+            for col in range(5):
+                cell = tk.Label(self, font=font, fg=COLOR_TEXT_LIGHT, bg=COLOR_SECONDARY)
+                cell.grid(row=i + 1, column=col, padx=4, sticky="e" if col else "w")
+                cells.append(cell)
+            self._cells.append(cells)
+        self._redraw()
+
+    def notify(self) -> None:
+        """A roll was counted; repaint soon (coalesced)."""
+        if not self._pending:
+            self._pending = True
+            self.after(self.min_interval_ms, self._redraw)
+
+    def _redraw(self) -> None:
+        self._pending = False
+        rows = frequency_rows(self.counter_getter(), self.theoretical)
+        for cells, (label, count, observed, expected, z) in zip(self._cells, rows):
+            color = COLOR_LOSE if abs(z) >= 3 else COLOR_POINT if abs(z) >= 2 else COLOR_TEXT_LIGHT
+            for cell, text in zip(cells, (label, f"{count:,}", f"{observed:.2%}", f"{expected:.2%}", f"{z:+.1f}")):
+                cell.config(text=text, fg=color)
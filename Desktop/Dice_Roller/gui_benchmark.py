@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Headless UI-latency benchmark for CeeLoDiceGameApp.
+
+Drives the real Tk application the way a player would (add players through
+the setup screen, place bets in the all-bets dialog, roll with _roll_dice) and
+times each operation including the Tk redraw it causes:
+
+- roll: _roll_dice until the result is on screen (animation included if enabled)
+- round_turnover: settling a round and opening the next one (bets dialog included)
+- font_refresh: one font-size step
+- high_contrast: one palette toggle
+
+Message boxes are answered automatically and modal dialogs are either filled
+in (the bets dialog) or closed, so no one has to sit at a screen. Without a
+DISPLAY, a private Xvfb server is started for the run.
+
+    python3 gui_benchmark.py --players 2 10 100 --rounds 5 --json ui_latency.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import time
+import tkinter as tk
+from tkinter import messagebox
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from stats import percentile
+
+BETS_DIALOG_TITLE = "Enter Bet for All Players"
+
+
+def start_virtual_display(display: int = 99, timeout: float = 10.0) -> Optional[subprocess.Popen]:
+    """
+    Start Xvfb and point DISPLAY at it, unless a display is already set.
+    Returns:
+        Optional[subprocess.Popen]: The Xvfb process to terminate afterwards (None if a display existed).
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("No DISPLAY and Xvfb is not installed (e.g. apt-get install xvfb).")
+    process = subprocess.Popen([xvfb, f":{display}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = f"/tmp/.X11-unix/X{display}"
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Xvfb did not start on display :{display}")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{display}"
+    return process
+
+
+@contextlib.contextmanager
+def automated_popups(bet: int) -> Iterator[Dict[str, int]]:
+    """
+    Answer every popup while the block runs.
+    Message boxes return at once; the all-bets dialog is filled in with bet and
+    submitted; any other modal dialog is closed. Yields counts per popup kind.
+    """
+    counts = {"message": 0, "bets": 0, "closed": 0}
+    patched = {}
+
+    def answer_message(*args, **kwargs):
+        counts["message"] += 1
+        return True
+
+    def wait_window(self, window=None):
+        window = window or self
+        if isinstance(window, tk.Toplevel) and window.winfo_exists():
+            if window.title() == BETS_DIALOG_TITLE:
+                counts["bets"] += 1
+                _submit_bets_dialog(window, bet)
+            if window.winfo_exists():
+                counts["closed"] += 1
+                window.destroy()
+
+    for name in ("showinfo", "showwarning", "showerror", "askyesno", "askokcancel"):
+        patched[(messagebox, name)] = getattr(messagebox, name)
+        setattr(messagebox, name, answer_message)
+    patched[(tk.Misc, "wait_window")] = tk.Misc.wait_window
+    patched[(tk.Misc, "grab_set")] = tk.Misc.grab_set
+    tk.Misc.wait_window = wait_window
+    tk.Misc.grab_set = lambda self: None  # Dialogs are answered before they are ever mapped
+    try:
+        yield counts
+    finally:
+        for (owner, name), original in patched.items():
+            setattr(owner, name, original)
+
+
+def _submit_bets_dialog(dialog: tk.Toplevel, bet: int) -> None:
+    """Type the bet into the dialog's entry and press its submit button."""
+    entry = next(w for w in dialog.winfo_children() if isinstance(w, tk.Entry))
+    button = next(w for w in dialog.winfo_children() if isinstance(w, tk.Button))
+    entry.delete(0, tk.END)
+    entry.insert(0, str(bet))
+    button.invoke()
+
+
+class GuiBenchmark:
+    """
+    One app instance driven through a number of rounds with a fixed table size.
+    """
+    def __init__(self, players: int, rounds: int = 5, bet: int = 1, animation_frames: int = 0,
+                 roll_timeout: float = 10.0) -> None:
+        """
+        Args:
+            players (int): Players at the table.
+            rounds (int): Rounds to play (fewer if the game ends first).
+            bet (int): Bet placed for everyone in each bets dialog.
+            animation_frames (int): Dice animation frames (0 measures the work alone).
+            roll_timeout (float): Seconds a roll may take before the run is aborted
+                (e.g. the app rejected the roll or a popup ended the game).
+        """
+        self.players = players
+        self.rounds = rounds
+        self.bet = bet
+        self.animation_frames = animation_frames
+        self.roll_timeout = roll_timeout
+        self.samples: Dict[str, List[float]] = {
+            "roll": [], "round_turnover": [], "font_refresh": [], "high_contrast": []}
+
+    def _timed(self, name: str, action: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = action()
+        self.root.update()  # Include the redraw the operation caused
+        self.samples[name].append(time.perf_counter() - start)
+        return result
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """
+        Play the rounds and return per-operation latency summaries in milliseconds.
+        """
+        from main import CeeLoDiceGameApp
+
+        self.root = tk.Tk()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), automated_popups(self.bet):
+                app = CeeLoDiceGameApp(self.root)
+                if app.profile_store is not None:
+                    app.profile_store.close()  # Keep benchmark players out of the real profiles
+                    app.profile_store = None
+                app.roll_animation_frames = self.animation_frames
+                self._play(app)
+        finally:
+            self.root.destroy()
+        return self.summary()
+
+    def _play(self, app: Any) -> None:
+        for i in range(self.players):
+            app.player_entry.insert(0, f"Bench{i + 1}")
+            app._add_player()
+        self.root.update()
+        app._start_game()  # Opens (and answers) the first bets dialog
+        settle = app._end_round_and_declare_winner
+        app._end_round_and_declare_winner = lambda: self._timed("round_turnover", settle)
+        turnovers = self.samples["round_turnover"]
+        while app.round_number <= self.rounds and len(app.player_manager.get_players_with_balance()) > 1:
+            rolls, settled = app.stats.outcomes.rolls, len(turnovers)
+            start = time.perf_counter()
+            app._roll_dice()
+            deadline = time.monotonic() + self.roll_timeout
+            while app.stats.outcomes.rolls == rolls:  # Animated rolls finish on the clock
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Roll {rolls + 1} did not complete within {self.roll_timeout}s "
+                                       f"(round {app.round_number}); the app did not accept it")
+                self.root.update()
+            self.root.update()
+            elapsed = time.perf_counter() - start
+            if len(turnovers) > settled:
+                elapsed -= turnovers[-1]  # The last roll of a round also settled it; count that separately
+            self.samples["roll"].append(elapsed)
+        for _ in range(3):
+            self._timed("font_refresh", app._increase_font_size)
+            self._timed("font_refresh", app._decrease_font_size)
+            self._timed("high_contrast", app._toggle_high_contrast_mode)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name, values in self.samples.items():
+            values = sorted(v * 1000 for v in values)
+            result[name] = {"count": len(values), "p50_ms": percentile(values, 50),
+                            "p95_ms": percentile(values, 95), "max_ms": values[-1] if values else 0.0}
+        return result
+
+
+def main() -> None:
+    """
+    Command-line entry point: benchmark the UI at several table sizes.
+    """
+    parser = argparse.ArgumentParser(description="Measure Cee-lo UI latency under a virtual X server.")
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 10, 100])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--bet", type=int, default=1)
+    parser.add_argument("--animation-frames", type=int, default=0, help="Dice animation frames per roll")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    xvfb = start_virtual_display()
+    try:
+        results = {}
+        for players in args.players:
+            results[players] = GuiBenchmark(players, args.rounds, args.bet, args.animation_frames).run()
+            print(f"{players} players:")
+            for name, s in results[players].items():
+                print(f"  {name:15s} n={s['count']:<5d} p50 {s['p50_ms']:8.2f} ms  "
+                      f"p95 {s['p95_ms']:8.2f} ms  max {s['max_ms']:8.2f} ms")
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"players": results, "rounds": args.rounds, "animation_frames": args.animation_frames}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
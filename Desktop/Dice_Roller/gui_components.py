@@ -13,8 +13,15 @@ def get_unique_style_name():
     return f'CustomStyle{_style_counter}'
 
 
+# Fonts are created once per Tk root and shared by every widget and table
+_font_cache = {"root": None, "fonts": None}
+
+
 def setup_fonts():
-    """Configure application fonts."""
+    """Configure application fonts (cached per Tk root)."""
+    root = tk._default_root
+    if root is not None and _font_cache["root"] is root:
+        return _font_cache["fonts"]
     try:
         fonts = {
             'mono_font': tkfont.Font(family="Courier New", size=11, weight="bold"),
@@ -37,9 +44,54 @@ def setup_fonts():
             'player_label_font': ("TkDefaultFont", 12),
             'bet_button_font': ("TkDefaultFont", 12)
         }
+        return fonts
+    if root is not None:
+        _font_cache.update(root=root, fonts=fonts)
     return fonts
 
 
+class AnimationClock:
+    """
+    A single `after` timer shared by every animation in a Tk root.
+    Each callback is called with its frame number once per tick and returns
+    True to keep running; the timer only runs while an animation is active.
+    """
+    def __init__(self, widget, interval_ms: int = 50) -> None:
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self._animations = []  # [callback, frame]
+        self._after_id = None
+
+    @property
+    def active(self) -> int:
+        return len(self._animations)
+
+    def add(self, callback) -> None:
+        """Start an animation; its first frame is drawn immediately."""
+        if callback(0):
+            self._animations.append([callback, 1])
+            if self._after_id is None:
+                self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        self._after_id = None
+        current, self._animations = self._animations, []
+        running = []
+        for entry in current:
+            callback, frame = entry
+            try:
+                keep = callback(frame)
+            except tk.TclError:
+                keep = False  # The animation's widgets were destroyed
+            if keep:
+                entry[1] = frame + 1
+                running.append(entry)
+        # Animations started by a callback during this tick were appended to self._animations
+        self._animations = running + self._animations
+        if self._animations and self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+
 def create_title_label(parent, text, font_key='title_font'):
     """Create a title label with consistent styling."""
     fonts = setup_fonts()
@@ -174,36 +226,38 @@ def create_scrolled_text(parent, **kwargs):
     )
 
 
-def show_message(title, message, message_type="info"):
+# Colored message popups: type -> (heading, background, text color, OK button text color)
+_MESSAGE_STYLES = {
+    "error": ("❌ ERROR", "#c0392b", "#fff", "#c0392b"),
+    "warning": ("⚠️ WARNING", "#f1c40f", "#222", "#f1c40f"),
+}
+
+
+def show_message(title, message, message_type="info", parent=None, modal=True):
     """
     Show a message box with consistent styling. Uses colored popups for errors and warnings.
+    With modal=False the popup stays above parent's window but neither grabs input nor
+    waits, so other tables in the same window remain usable.
     """
-    if message_type == "error":
-        # Custom error popup with red background and icon
-        popup = tk.Toplevel()
-        popup.title(title)
-        popup.configure(bg="#c0392b")
-        popup.resizable(False, False)
-        tk.Label(popup, text="❌ ERROR", font=("Arial", 16, "bold"), fg="#fff", bg="#c0392b").pack(padx=20, pady=(15, 5))
-        tk.Label(popup, text=message, font=("Arial", 12), fg="#fff", bg="#c0392b", wraplength=350, justify="left").pack(padx=20, pady=(0, 15))
-        tk.Button(popup, text="OK", command=popup.destroy, bg="#fff", fg="#c0392b", font=("Arial", 12, "bold"), relief=tk.RAISED).pack(pady=(0, 15))
-        popup.grab_set()
+    if modal and message_type not in _MESSAGE_STYLES:
+        messagebox.showinfo(title, message)
+        return
+    heading, bg, fg, button_fg = _MESSAGE_STYLES.get(
+        message_type, (title, COLOR_SECONDARY, COLOR_TEXT_LIGHT, COLOR_TEXT_DARK))
+    popup = tk.Toplevel(parent)
+    popup.title(title)
+    popup.configure(bg=bg)
+    popup.resizable(False, False)
+    tk.Label(popup, text=heading, font=("Arial", 16, "bold"), fg=fg, bg=bg).pack(padx=20, pady=(15, 5))
+    tk.Label(popup, text=message, font=("Arial", 12), fg=fg, bg=bg, wraplength=350, justify="left").pack(padx=20, pady=(0, 15))
+    tk.Button(popup, text="OK", command=popup.destroy, bg="#fff", fg=button_fg, font=("Arial", 12, "bold"), relief=tk.RAISED).pack(pady=(0, 15))
+    if parent is not None:
+        popup.transient(parent.winfo_toplevel())
+    else:
         popup.transient()
-        popup.wait_window()
-    elif message_type == "warning":
-        # Custom warning popup with yellow background and icon
-        popup = tk.Toplevel()
-        popup.title(title)
-        popup.configure(bg="#f1c40f")
-        popup.resizable(False, False)
-        tk.Label(popup, text="⚠️ WARNING", font=("Arial", 16, "bold"), fg="#222", bg="#f1c40f").pack(padx=20, pady=(15, 5))
-        tk.Label(popup, text=message, font=("Arial", 12), fg="#222", bg="#f1c40f", wraplength=350, justify="left").pack(padx=20, pady=(0, 15))
-        tk.Button(popup, text="OK", command=popup.destroy, bg="#fff", fg="#f1c40f", font=("Arial", 12, "bold"), relief=tk.RAISED).pack(pady=(0, 15))
+    if modal:
         popup.grab_set()
-        popup.transient()
         popup.wait_window()
-    else:
-        messagebox.showinfo(title, message)
 
 
 def center_window(window):
@@ -231,17 +285,24 @@ def add_tooltip(widget, text: str) -> None:
     """
     Add a tooltip to a widget. Usage: add_tooltip(button, 'Click to roll the dice!')
     """
-    tooltip = tk.Toplevel(widget)
-    tooltip.withdraw()
-    tooltip.overrideredirect(True)
-    label = tk.Label(tooltip, text=text, bg='#222', fg='#fff', relief=tk.SOLID, borderwidth=1, font=("Arial", 10))
-    label.pack(ipadx=4, ipady=2)
+    # The Toplevel only exists while the pointer is over the widget; buttons are
+    # rebuilt often, and a hidden window per button adds up
+    tooltip = None
     def enter(event):
+        nonlocal tooltip
+        if tooltip is not None:
+            return
+        tooltip = tk.Toplevel(widget)
+        tooltip.overrideredirect(True)
+        label = tk.Label(tooltip, text=text, bg='#222', fg='#fff', relief=tk.SOLID, borderwidth=1, font=("Arial", 10))
+        label.pack(ipadx=4, ipady=2)
         x = widget.winfo_rootx() + 20
         y = widget.winfo_rooty() + widget.winfo_height() + 2
         tooltip.geometry(f'+{x}+{y}')
-        tooltip.deiconify()
     def leave(event):
-        tooltip.withdraw()
+        nonlocal tooltip
+        if tooltip is not None:
+            tooltip.destroy()
+            tooltip = None
     widget.bind('<Enter>', enter)
     widget.bind('<Leave>', leave) 
\ No newline at end of file
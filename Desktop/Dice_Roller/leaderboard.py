@@ -0,0 +1,163 @@
+import random
+from typing import Dict, List, Optional, Tuple
+
+
+class _Node:
+    """A treap node keyed by a leaderboard sort key."""
+    __slots__ = ("key", "name", "priority", "size", "left", "right")
+
+    def __init__(self, key: tuple, name: str, priority: float) -> None:
+        self.key = key
+        self.name = name
+        self.priority = priority
+        self.size = 1
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node else 0
+
+
+def _update(node: _Node) -> None:
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _split(node: Optional[_Node], key: tuple) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split a treap into (keys < key, keys >= key)."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        _update(node)
+        return node, right
+    left, right = _split(node.left, key)
+    node.left = right
+    _update(node)
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps where every key in left is smaller than every key in right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+class LeaderboardIndex:
+    """
+    Ordered index of players by (rounds_won, balance), best first.
+
+    Backed by a size-augmented treap, so updates, rank-of-player and
+    k-th-place queries are O(log n) and top-k is O(log n + k).
+    Ties are broken by seat order (the order players were first indexed).
+    """
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._root: Optional[_Node] = None
+        self._keys: Dict[str, tuple] = {}
+        self._seats: Dict[str, int] = {}
+        self._next_seat = 0
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def _make_key(self, name: str, rounds_won: int, balance: int) -> tuple:
+        if name not in self._seats:
+            self._seats[name] = self._next_seat
+            self._next_seat += 1
+        return (-rounds_won, -balance, self._seats[name])
+
+    def update(self, name: str, rounds_won: int, balance: int) -> None:
+        """
+        Insert a player or move them to their new position. O(log n).
+        """
+        key = self._make_key(name, rounds_won, balance)
+        old_key = self._keys.get(name)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self._delete(old_key)
+        self._keys[name] = key
+        left, right = _split(self._root, key)
+        node = _Node(key, name, self._rng.random())
+        self._root = _merge(_merge(left, node), right)
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a player from the index. O(log n).
+        """
+        key = self._keys.pop(name, None)
+        self._seats.pop(name, None)
+        if key is not None:
+            self._delete(key)
+
+    def _delete(self, key: tuple) -> None:
+        left, right = _split(self._root, key)
+        # The smallest key in right is the one being deleted
+        _, right = _split(right, (key[0], key[1], key[2] + 1))
+        self._root = _merge(left, right)
+
+    def rank(self, name: str) -> Optional[int]:
+        """
+        Return the 1-based leaderboard position of a player, or None. O(log n).
+        """
+        key = self._keys.get(name)
+        if key is None:
+            return None
+        rank = 1
+        node = self._root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                rank += _size(node.left) + 1
+                node = node.right
+            else:
+                return rank + _size(node.left)
+        return None
+
+    def kth(self, position: int) -> Optional[str]:
+        """
+        Return the player at a 1-based leaderboard position, or None. O(log n).
+        """
+        node = self._root
+        while node is not None:
+            left_size = _size(node.left)
+            if position <= left_size:
+                node = node.left
+            elif position == left_size + 1:
+                return node.name
+            else:
+                position -= left_size + 1
+                node = node.right
+        return None
+
+    def top(self, k: Optional[int] = None) -> List[str]:
+        """
+        Return the names of the best k players (all players if k is None), best first.
+        """
+        limit = len(self) if k is None else k
+        result: List[str] = []
+        stack: List[_Node] = []
+        node = self._root
+        while (stack or node is not None) and len(result) < limit:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append(node.name)
+            node = node.right
+        return result
@@ -0,0 +1,169 @@
+"""
+Debug instrumentation for finding slow leaks in long-running Tk sessions.
+
+Every N rounds the monitor samples live widgets per class, the number of Tcl
+commands (every Python callback registered with Tk is one), pending `after`
+handles and the Python heap as seen by tracemalloc. A metric that grew at each
+of the last few samples is reported as a suspected leak, together with the
+source lines that allocated the most memory since monitoring started.
+
+Enable it with LEAK_MONITOR_ROUNDS in config.py or the CEELO_LEAK_MONITOR_ROUNDS
+environment variable. tracemalloc slows Python down, so keep it off in production.
+"""
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def count_widgets(root: Any) -> Counter:
+    """
+    Count root and all of its descendants (Toplevels included) by widget class.
+    """
+    counts: Counter = Counter()
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        counts[widget.winfo_class()] += 1
+        stack.extend(widget.winfo_children())
+    return counts
+
+
+class LeakMonitor:
+    """
+    Samples UI and heap counters every few rounds and flags monotonic growth.
+    """
+    def __init__(self, root: Any, every_rounds: int = 10, window: int = 5, keep: int = 100) -> None:
+        """
+        Args:
+            root (Any): Widget whose subtree is counted (Tcl commands and after handles are per interpreter).
+            every_rounds (int): Take a sample after every this many rounds.
+            window (int): A metric that grew at each of this many consecutive samples is flagged.
+            keep (int): Samples kept in memory.
+        """
+        if every_rounds < 1 or window < 2:
+            raise ValueError("every_rounds must be at least 1 and window at least 2")
+        self.root = root
+        self.every_rounds = every_rounds
+        self.window = window
+        self.keep = keep
+        self.rounds = 0
+        self.samples: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        self._baseline = None
+
+    def start(self) -> None:
+        """
+        Start tracemalloc (if nobody else has) and take the baseline sample.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+        self.sample()
+
+    def stop(self) -> None:
+        """
+        Stop tracemalloc if this monitor started it.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._baseline = None
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Record the current counters.
+        Returns:
+            Dict[str, Any]: round, widgets (per class), widget_total, tcl_commands, after_handles, heap_bytes.
+        """
+        tk = self.root.tk
+        widgets = count_widgets(self.root)
+        sample = {
+            "round": self.rounds,
+            "widgets": widgets,
+            "widget_total": sum(widgets.values()),
+            "tcl_commands": len(tk.splitlist(tk.call("info", "commands"))),
+            "after_handles": len(tk.splitlist(tk.call("after", "info"))),
+            "heap_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0,
+        }
+        self.samples.append(sample)
+        del self.samples[:-self.keep]
+        return sample
+
+    def on_round_end(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Count a finished round and sample when one is due.
+        Returns:
+            Dict[str, Tuple[int, int]]: Metrics flagged at this sample (see growing); empty otherwise.
+        """
+        self.rounds += 1
+        if self.rounds % self.every_rounds:
+            return {}
+        self.sample()
+        growth = self.growing()
+        if growth:
+            print(f"Leak monitor (round {self.rounds}): steady growth in "
+                  + ", ".join(f"{name} {first} -> {last}" for name, (first, last) in growth.items()))
+        return growth
+
+    @staticmethod
+    def _metrics(sample: Dict[str, Any]) -> Dict[str, int]:
+        metrics = {key: sample[key] for key in ("widget_total", "tcl_commands", "after_handles", "heap_bytes")}
+        metrics.update((f"widgets[{cls}]", count) for cls, count in sample["widgets"].items())
+        return metrics
+
+    def growing(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Metrics that increased at every one of the last `window` samples.
+        Returns:
+            Dict[str, Tuple[int, int]]: metric name -> (value at the start of the window, latest value).
+        """
+        if len(self.samples) < self.window:
+            return {}
+        recent = [self._metrics(sample) for sample in self.samples[-self.window:]]
+        growth = {}
+        for name, last in recent[-1].items():
+            values = [metrics.get(name, 0) for metrics in recent]
+            if all(b > a for a, b in zip(values, values[1:])):
+                growth[name] = (values[0], last)
+        return growth
+
+    def top_allocations(self, limit: int = 10) -> List[str]:
+        """
+        Source lines whose live allocations grew the most since start().
+        """
+        if self._baseline is None or not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline, "lineno")
+        return [str(stat) for stat in stats[:limit] if stat.size_diff > 0]
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Human-readable summary: first and latest sample, flagged metrics and top allocation sites.
+        """
+        if not self.samples:
+            return "Leak monitor: no samples yet."
+        first, last = self.samples[0], self.samples[-1]
+        lines = [f"Leak monitor: {len(self.samples)} samples over {last['round']} rounds"]
+        for key in ("widget_total", "tcl_commands", "after_handles", "heap_bytes"):
+            lines.append(f"  {key}: {first[key]} -> {last[key]}")
+        changed = {cls: last["widgets"][cls] - first["widgets"].get(cls, 0) for cls in last["widgets"]}
+        lines.extend(f"  widgets[{cls}]: {diff:+d}" for cls, diff in sorted(changed.items()) if diff)
+        growth = self.growing()
+        lines.append("Steady growth: " + (", ".join(growth) if growth else "none"))
+        allocations = self.top_allocations(limit)
+        if allocations:
+            lines.append("Top allocation growth:")
+            lines.extend(f"  {line}" for line in allocations)
+        return "\n".join(lines)
+
+
+def monitor_from_config(root: Any, every_rounds: Optional[int]) -> Optional[LeakMonitor]:
+    """
+    Build and start a monitor when every_rounds is positive, otherwise return None.
+    """
+    if not every_rounds or every_rounds < 1:
+        return None
+    monitor = LeakMonitor(root, every_rounds)
+    monitor.start()
+    return monitor
@@ -0,0 +1,173 @@
+from contextlib import nullcontext
+from typing import Dict, List, Any
+from config import BATCH_SETTLE_MIN_SEATS
+from round_manager import settle_round_batch
+
+# Where the indivisible part of a split pot goes:
+#   "carry"      - stays in the pot and is added to the next round's pot
+#   "house"      - is kept by the house (tracked in house_total)
+#   "first_seat" - goes to the winner seated first at the table
+REMAINDER_POLICIES = ("carry", "house", "first_seat")
+
+
+class ConservationError(Exception):
+    """Raised when a settlement creates or destroys money."""
+
+
+class SettlementLedger:
+    """
+    Single settlement path for rounds: collects bets, splits the pot exactly and
+    accounts for every unit of money.
+
+    All amounts are integers in the game's smallest currency unit (whole dollars
+    in this game), so no rounding ever happens; the indivisible remainder of a
+    tied pot is routed by the remainder policy instead of being dropped.
+    """
+    def __init__(self, remainder_policy: str = "carry", check_conservation: bool = False) -> None:
+        """
+        Args:
+            remainder_policy (str): One of REMAINDER_POLICIES.
+            check_conservation (bool): Verify after every settlement that no money was created or lost.
+        """
+        if remainder_policy not in REMAINDER_POLICIES:
+            raise ValueError(f"Unknown remainder policy: {remainder_policy}")
+        self.remainder_policy = remainder_policy
+        self.check_conservation = check_conservation
+        self.carry_over = 0
+        self.house_total = 0
+        self.rounds_settled = 0
+
+    def reset(self) -> None:
+        """Clear carried-over pot and house totals (e.g. when a new game starts)."""
+        self.carry_over = 0
+        self.house_total = 0
+        self.rounds_settled = 0
+
+    def pay_carry_over(self, player_manager: Any, player_name: str) -> int:
+        """
+        Pay whatever is still carried over to one player, e.g. the winner of a finished
+        game, so no money is left in the pot when the ledger is reset.
+        Returns the amount paid.
+        """
+        amount = self.carry_over
+        if amount:
+            update = getattr(player_manager, "update_player", None) or self._update_fields(player_manager)
+            update(player_name, balance=player_manager.players[player_name]["balance"] + amount)
+            self.carry_over = 0
+        return amount
+
+    def split_pot(self, pot: int, winners: List[str]) -> Dict[str, int]:
+        """
+        Split a pot among winners (given in seat order), including any carried-over amount.
+        Returns a dict of winner -> payout. Updates carry_over/house_total for the remainder.
+        """
+        if not isinstance(pot, int):
+            raise TypeError("Pot must be an integer amount.")
+        pot += self.carry_over
+        self.carry_over = 0
+        if not winners:
+            self.carry_over = pot
+            return {}
+        split, remainder = divmod(pot, len(winners))
+        payouts = {w: split for w in winners}
+        if remainder:
+            if self.remainder_policy == "first_seat":
+                payouts[winners[0]] += remainder
+            elif self.remainder_policy == "house":
+                self.house_total += remainder
+            else:
+                self.carry_over = remainder
+        return payouts
+
+    def _money_in_system(self, player_manager: Any) -> int:
+        return sum(p["balance"] for p in player_manager.players.values()) + self.carry_over + self.house_total
+
+    def settle_round(self, player_manager: Any, round_rolls: Dict[str, Dict[str, Any]], winners: List[str]) -> Dict[str, Any]:
+        """
+        Collect every bet in round_rolls, pay the winners and update player state.
+        Args:
+            player_manager (Any): The player manager (must have .players dict).
+            round_rolls (Dict[str, Dict[str, Any]]): Player roll/outcome data for the round.
+            winners (List[str]): Winner player names.
+        Returns:
+            Dict[str, Any]: pot, payouts, carry_over and house_total after settlement.
+        If the settlement fails part-way (e.g. a ConservationError), a PlayerManager's
+        transaction rolls the players back and the ledger's own totals are restored.
+        Rounds with BATCH_SETTLE_MIN_SEATS seats or more are settled through settle_batch.
+        """
+        players = player_manager.players
+        before = self._money_in_system(player_manager) if self.check_conservation else 0
+        saved = (self.carry_over, self.house_total, self.rounds_settled)
+        transaction = getattr(player_manager, "transaction", nullcontext)
+        update = getattr(player_manager, "update_player", None) or self._update_fields(player_manager)
+        try:
+            with transaction():
+                names = [name for name in players if name in round_rolls]  # Seat order
+                bets = [round_rolls[name]["bet"] for name in names]
+                old_balances = [players[name]["balance"] for name in names]
+                pot = sum(bets)
+                if winners and len(names) >= BATCH_SETTLE_MIN_SEATS:
+                    # Pot, split, remainder and balances in one vectorized pass
+                    winner_set = set(winners)
+                    result = self.settle_batch([name in winner_set for name in names], bets, old_balances)
+                    balances = [int(balance) for balance in result["balances"]]
+                    payouts = {name: balance - old + bet for name, balance, old, bet, won
+                               in zip(names, balances, old_balances, bets, result["winner_mask"]) if won}
+                else:
+                    payouts = self.split_pot(pot, [name for name in names if name in winners])
+                    balances = [old - bet + payouts.get(name, 0) for name, old, bet in zip(names, old_balances, bets)]
+                    self.rounds_settled += 1
+                for name, balance in zip(names, balances):
+                    if name in payouts:
+                        update(name, balance=balance, current_bet=0, rounds_won=players[name]["rounds_won"] + 1)
+                    elif balance <= 0:
+                        update(name, balance=balance, current_bet=0, is_out=True)
+                    else:
+                        update(name, balance=balance, current_bet=0)
+                if self.check_conservation:
+                    after = self._money_in_system(player_manager)
+                    if after != before:
+                        raise ConservationError(f"Round {self.rounds_settled}: money before {before}, after {after}")
+        except BaseException:
+            self.carry_over, self.house_total, self.rounds_settled = saved
+            raise
+        return {"pot": pot, "payouts": payouts, "carry_over": self.carry_over, "house_total": self.house_total}
+
+    @staticmethod
+    def _update_fields(player_manager: Any) -> Any:
+        """Field updater for a plain holder of a .players dict (no command log)."""
+        notify = getattr(player_manager, "notify_player_changed", None)
+
+        def update(name: str, **fields: Any) -> None:
+            player_manager.players[name].update(fields)
+            if notify is not None:
+                notify(name)
+        return update
+
+    def settle_batch(self, ranks: Any, bets: Any, balances: Any) -> Dict[str, Any]:
+        """
+        Vectorized settlement for large tables (see round_manager.settle_round_batch),
+        with the remainder routed by this ledger's policy.
+        """
+        carry = self.carry_over
+        self.carry_over = 0
+        result = settle_round_batch(ranks, bets, balances, extra_pot=carry)
+        remainder = result["remainder"]
+        house_before = self.house_total
+        if remainder:
+            if not any(result["winner_mask"]):
+                self.carry_over = remainder
+            elif self.remainder_policy == "first_seat":
+                first = next(i for i, won in enumerate(result["winner_mask"]) if won)
+                result["balances"][first] += remainder
+            elif self.remainder_policy == "house":
+                self.house_total += remainder
+            else:
+                self.carry_over = remainder
+        self.rounds_settled += 1
+        if self.check_conservation:
+            before = sum(int(b) for b in balances) + carry
+            after = sum(int(b) for b in result["balances"]) + self.carry_over + self.house_total - house_before
+            if after != before:
+                raise ConservationError(f"Round {self.rounds_settled}: money before {before}, after {after}")
+        return result
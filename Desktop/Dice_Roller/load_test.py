@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Load generator for table hosting.
+
+Thousands of simulated clients run join/bet/roll cycles against TableHost,
+the headless table logic built on PlayerManager, SettlementLedger and
+round_manager. Clients are seated at tables of a fixed size; a round is
+settled when every player who bet has rolled. Every operation is timed and
+the run reports throughput and p50/p99/p999 latency per operation.
+
+Modes:
+    inprocess  clients call TableHost directly (the cost of the table logic alone)
+    loopback   an asyncio JSON-lines server on 127.0.0.1 and the clients in one process
+    serve      only the server, for clients on other processes or machines
+    connect    only the clients, against --host/--port
+
+    python3 load_test.py --clients 5000 --rounds 20
+    python3 load_test.py --mode loopback --clients 1000 --rounds 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DICE_SIDES, NUM_DICE, REMAINDER_POLICY
+from dice_logic import evaluate_roll, roll_single_die
+from ledger import SettlementLedger
+from player_manager import PlayerManager
+from round_manager import determine_winners
+from stats import percentile
+
+OPERATIONS = ("join", "bet", "roll", "sync", "leave")
+
+
+class HostedTable:
+    """One table: its players, ledger, dice and the round in progress."""
+    def __init__(self, table_id: int, remainder_policy: str, rng: random.Random) -> None:
+        self.table_id = table_id
+        self.player_manager = PlayerManager(history_limit=0)  # No undo history on hosted tables
+        self.ledger = SettlementLedger(remainder_policy)
+        self.rng = rng
+        self.round_rolls: Dict[str, Dict[str, Any]] = {}
+        self.round_number = 1
+
+
+class TableHost:
+    """
+    Seats clients at tables and runs their operations. Each public method is one
+    client operation and returns (ok, result), where result holds an "error" message
+    when ok is False.
+    """
+    def __init__(self, seats_per_table: int = 8, seed: Optional[int] = None,
+                 remainder_policy: str = REMAINDER_POLICY, max_rerolls: int = 1000) -> None:
+        """
+        Args:
+            seats_per_table (int): Players per table before a new table is opened.
+            seed (Optional[int]): Seed for the tables' dice (random if None).
+            remainder_policy (str): Remainder policy of every table's ledger.
+            max_rerolls (int): Cap on No Score rerolls within one roll operation.
+        """
+        if seats_per_table < 1:
+            raise ValueError("seats_per_table must be at least 1")
+        self.seats_per_table = seats_per_table
+        self.remainder_policy = remainder_policy
+        self.max_rerolls = max_rerolls
+        self.tables: List[HostedTable] = []
+        self._open: List[int] = []  # Tables with a free seat
+        self._rng = random.Random(seed)
+        self.rounds_settled = 0
+
+    def join(self, name: str) -> Tuple[bool, Dict[str, Any]]:
+        """Seat a new player at the first table with a free seat."""
+        if not self._open:
+            table = HostedTable(len(self.tables), self.remainder_policy, random.Random(self._rng.random()))
+            self.tables.append(table)
+            self._open.append(table.table_id)
+        table = self.tables[self._open[-1]]
+        ok, message = table.player_manager.add_player(name)
+        if not ok:
+            return False, {"error": message}
+        if len(table.player_manager.players) >= self.seats_per_table:
+            self._open.pop()
+        return True, {"table": table.table_id, "round": table.round_number}
+
+    def bet(self, table_id: int, name: str, amount: int) -> Tuple[bool, Dict[str, Any]]:
+        """Place a bet in the table's current round."""
+        table = self.tables[table_id]
+        if name in table.round_rolls:
+            return False, {"error": "Already rolled this round."}
+        ok, message = table.player_manager.set_bet(name, amount)
+        return ok, ({"round": table.round_number} if ok else {"error": message})
+
+    def roll(self, table_id: int, name: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Roll until a scoring outcome (No Score rerolls), and settle the round if
+        this was the last player with an open bet.
+        """
+        table = self.tables[table_id]
+        pm = table.player_manager
+        player = pm.players.get(name)
+        if player is None or player["current_bet"] <= 0 or name in table.round_rolls:
+            return False, {"error": "Place a bet first."}
+        for _ in range(self.max_rerolls):
+            rolls = [roll_single_die(DICE_SIDES, table.rng) for _ in range(NUM_DICE)]
+            outcome = evaluate_roll(rolls)
+            if outcome["outcome"] != "No Score":
+                break
+        round_number = table.round_number
+        table.round_rolls[name] = {"rolls": rolls, "outcome": outcome["outcome"],
+                                   "value": outcome["value"], "bet": player["current_bet"]}
+        pm.update_player(name, last_roll_outcome=outcome["outcome"], point_value=outcome["value"], current_bet=0)
+        settled = not any(p["current_bet"] > 0 for p in pm.players.values())
+        if settled:
+            table.ledger.settle_round(pm, table.round_rolls, determine_winners(table.round_rolls))
+            table.round_rolls = {}
+            table.round_number += 1
+            self.rounds_settled += 1
+        return True, {"rolls": rolls, "outcome": outcome["outcome"], "round": round_number, "settled": settled}
+
+    def balance(self, table_id: int, name: str) -> int:
+        return self.tables[table_id].player_manager.players[name]["balance"]
+
+    def leave(self, table_id: int, name: str) -> Tuple[bool, Dict[str, Any]]:
+        """Give up a seat (not allowed while the player's roll awaits settlement)."""
+        table = self.tables[table_id]
+        if name in table.round_rolls:
+            return False, {"error": "Wait for the round to be settled."}
+        ok, message = table.player_manager.remove_player(name)
+        if ok and table_id not in self._open:
+            self._open.append(table_id)
+        return ok, ({} if ok else {"error": message})
+
+
+class LatencyRecorder:
+    """Per-operation latency samples (seconds) and run time."""
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            Dict[str, Dict[str, float]]: op -> count, errors, ops_per_s, p50_us, p99_us, p999_us, max_us.
+        """
+        result = {}
+        for op in OPERATIONS:
+            values = sorted(v * 1e6 for v in self.samples.get(op, ()))
+            if not values:
+                continue
+            result[op] = {"count": len(values), "errors": self.errors.get(op, 0),
+                          "ops_per_s": len(values) / self.elapsed if self.elapsed else 0.0,
+                          "p50_us": percentile(values, 50), "p99_us": percentile(values, 99),
+                          "p999_us": percentile(values, 99.9), "max_us": values[-1]}
+        return result
+
+
+# --- In-process -------------------------------------------------------------------
+
+def run_inprocess(clients: int, rounds: int, bet: int = 10, seats_per_table: int = 8,
+                  seed: Optional[int] = None) -> Tuple[LatencyRecorder, TableHost]:
+    """
+    Drive TableHost directly: every round each client bets and then rolls; a client
+    that cannot cover its bet leaves and rejoins as a new player.
+    """
+    host = TableHost(seats_per_table, seed)
+    recorder = LatencyRecorder()
+    samples, errors = recorder.samples, recorder.errors
+    clock = time.perf_counter
+
+    def timed(op, call, *args):
+        start = clock()
+        ok, result = call(*args)
+        samples[op].append(clock() - start)
+        if not ok:
+            errors[op] += 1
+        return ok, result
+
+    seats: List[Tuple[int, str]] = []
+    generation = [0] * clients
+    for client in range(clients):
+        name = f"c{client}"
+        _, result = timed("join", host.join, name)
+        seats.append((result["table"], name))
+    for _ in range(rounds):
+        for client, (table_id, name) in enumerate(seats):
+            ok, _ = timed("bet", host.bet, table_id, name, bet)
+            if not ok:
+                timed("leave", host.leave, table_id, name)
+                generation[client] += 1
+                name = f"c{client}.{generation[client]}"
+                _, result = timed("join", host.join, name)
+                seats[client] = (result["table"], name)
+                timed("bet", host.bet, result["table"], name, bet)
+        for table_id, name in seats:
+            timed("roll", host.roll, table_id, name)
+    recorder.stop()
+    return recorder, host
+
+
+# --- Loopback server and clients -------------------------------------------------------
+
+class TableServer:
+    """
+    JSON-lines TCP front end for a TableHost; one connection is one client.
+    Requests: {"op": "join", "name"}, {"op": "bet", "amount"}, {"op": "roll"},
+    {"op": "sync", "round"} (answered once that round is settled) and {"op": "leave"}.
+    """
+    def __init__(self, host: TableHost) -> None:
+        self.host = host
+        self._settled: Dict[int, asyncio.Event] = {}
+
+    def _round_event(self, table_id: int) -> asyncio.Event:
+        event = self._settled.get(table_id)
+        if event is None:
+            event = self._settled[table_id] = asyncio.Event()
+        return event
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        seat: Optional[Tuple[int, str]] = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "join":
+                    ok, result = self.host.join(request["name"])
+                    seat = (result["table"], request["name"]) if ok else seat
+                elif seat is None:
+                    ok, result = False, {"error": "Join a table first."}
+                elif op == "bet":
+                    ok, result = self.host.bet(seat[0], seat[1], int(request["amount"]))
+                elif op == "roll":
+                    ok, result = self.host.roll(*seat)
+                    if ok and result["settled"]:
+                        self._round_event(seat[0]).set()
+                        self._settled[seat[0]] = asyncio.Event()
+                elif op == "sync":
+                    table = self.host.tables[seat[0]]
+                    if table.round_number <= request["round"]:
+                        await self._round_event(seat[0]).wait()
+                    ok, result = True, {"balance": self.host.balance(*seat)}
+                elif op == "leave":
+                    ok, result = self.host.leave(*seat)
+                    seat = None if ok else seat
+                else:
+                    ok, result = False, {"error": f"Unknown op: {op}"}
+                result["ok"] = ok
+                writer.write((json.dumps(result, separators=(",", ":")) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, ValueError, KeyError):
+            pass  # Broken client; its seat stays until the host is discarded
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, backlog: int = 4096) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, backlog=backlog)
+
+
+async def _tcp_client(client: int, host: str, port: int, rounds: int, bet: int,
+                      recorder: LatencyRecorder) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    samples, errors = recorder.samples, recorder.errors
+    clock = time.perf_counter
+
+    async def call(op: str, **fields: Any) -> Dict[str, Any]:
+        fields["op"] = op
+        start = clock()
+        writer.write((json.dumps(fields, separators=(",", ":")) + "\n").encode())
+        response = json.loads(await reader.readline())
+        samples[op].append(clock() - start)
+        if not response["ok"]:
+            errors[op] += 1
+        return response
+
+    try:
+        generation = 0
+        await call("join", name=f"c{client}")
+        for _ in range(rounds):
+            response = await call("bet", amount=bet)
+            if not response["ok"]:
+                await call("leave")
+                generation += 1
+                await call("join", name=f"c{client}.{generation}")
+                await call("bet", amount=bet)
+            response = await call("roll")
+            if response["ok"]:
+                await call("sync", round=response["round"])
+    finally:
+        writer.close()
+
+
+async def run_clients(clients: int, rounds: int, bet: int = 10, host: str = "127.0.0.1",
+                      port: int = 0) -> LatencyRecorder:
+    """Run TCP clients concurrently against a server and record their latencies."""
+    recorder = LatencyRecorder()
+    await asyncio.gather(*(_tcp_client(i, host, port, rounds, bet, recorder) for i in range(clients)))
+    recorder.stop()
+    return recorder
+
+
+async def run_loopback(clients: int, rounds: int, bet: int = 10, seats_per_table: int = 8,
+                       seed: Optional[int] = None) -> Tuple[LatencyRecorder, TableHost]:
+    """Host a server on 127.0.0.1 and run the clients against it in the same event loop."""
+    table_host = TableHost(seats_per_table, seed)
+    server = await TableServer(table_host).start()
+    port = server.sockets[0].getsockname()[1]
+    try:
+        recorder = await run_clients(clients, rounds, bet, "127.0.0.1", port)
+    finally:
+        server.close()
+        await server.wait_closed()
+    return recorder, table_host
+
+
+def print_report(recorder: LatencyRecorder, label: str) -> None:
+    report = recorder.report()
+    total = sum(r["count"] for r in report.values())
+    print(f"{label}: {total:,} operations in {recorder.elapsed:.2f}s ({total / recorder.elapsed:,.0f} ops/s)")
+    print(f"  {'op':6s} {'count':>9s} {'errors':>7s} {'ops/s':>10s} {'p50 us':>9s} {'p99 us':>9s} {'p999 us':>9s} {'max us':>10s}")
+    for op, r in report.items():
+        print(f"  {op:6s} {r['count']:9,d} {r['errors']:7,d} {r['ops_per_s']:10,.0f} {r['p50_us']:9.1f} "
+              f"{r['p99_us']:9.1f} {r['p999_us']:9.1f} {r['max_us']:10.1f}")
+
+
+def main() -> None:
+    """
+    Command-line entry point: run a load test and print the per-operation report.
+    """
+    parser = argparse.ArgumentParser(description="Load-test Cee-lo table hosting.")
+    parser.add_argument("--mode", choices=("inprocess", "loopback", "serve", "connect"), default="inprocess")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--seats", type=int, default=8, help="Players per table")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="Port for serve/connect")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        async def serve() -> None:
+            server = await TableServer(TableHost(args.seats, args.seed)).start(args.host, args.port)
+            print(f"Serving tables on {args.host}:{args.port}")
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve())
+        return
+    if args.mode == "inprocess":
+        recorder, host = run_inprocess(args.clients, args.rounds, args.bet, args.seats, args.seed)
+    elif args.mode == "loopback":
+        recorder, host = asyncio.run(run_loopback(args.clients, args.rounds, args.bet, args.seats, args.seed))
+    else:
+        recorder, host = asyncio.run(run_clients(args.clients, args.rounds, args.bet, args.host, args.port)), None
+    label = f"{args.mode}, {args.clients:,} clients"
+    if host is not None:
+        label += f", {len(host.tables):,} tables, {host.rounds_settled:,} rounds settled"
+    print_report(recorder, label)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"mode": args.mode, "clients": args.clients, "rounds": args.rounds,
+                       "elapsed": recorder.elapsed, "operations": recorder.report()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
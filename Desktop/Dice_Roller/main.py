@@ -1,6 +1,8 @@
+import os
 import sys
+import random
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import messagebox, simpledialog, filedialog
 
 # Import our modular components
 from config import *
@@ -8,6 +10,18 @@ from dice_logic import roll_single_die, get_die_ascii_face, evaluate_roll
 from music_manager import MusicManager
 from player_manager import PlayerManager
 from gui_components import *
+from player_view import VirtualPlayerList
+from frequency_panel import OutcomeFrequencyPanel
+from ledger import SettlementLedger
+from stats import GameStats
+from replay import SessionRecorder, SessionReplayer, load_session
+from profile_store import ProfileStore
+from leak_monitor import monitor_from_config
+from round_profiler import RoundProfiler
+from spectator import SpectatorBroadcaster
+from state_sync import TableStateServer
+from bet_policy import BetAdvisor, table_target
+from export import RoundExporter
 
 # Try to import tkinter early
 try:
@@ -32,14 +46,34 @@ class CeeLoDiceGameApp:
     Main application class for the Cee-lo Dice Game GUI.
     Manages the game state, player actions, and UI.
     """
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Misc, embedded: bool = False, animation_clock: AnimationClock = None) -> None:
         """
         Initialize the Cee-lo Dice Game application.
         Args:
-            master (tk.Tk): The root Tkinter window.
+            master (tk.Misc): The root Tkinter window, or the container frame when embedded.
+            embedded (bool): Run as one table inside a host window (see multi_table.py):
+                skips window setup, the menu bar and key bindings, which the host owns.
+            animation_clock (AnimationClock): Shared animation timer (a private one if None).
         """
         self.master = master
+        self.embedded = embedded
+        self.animation_clock = animation_clock or AnimationClock(master)
         self.player_manager = PlayerManager()
+        self.ledger = SettlementLedger(REMAINDER_POLICY)
+        self.bet_advisor = BetAdvisor(remainder_policy=REMAINDER_POLICY)  # Cached optimal-bet tables
+        self.stats = GameStats()  # Live accumulators for this session (constant memory)
+        self.rng = random.Random()  # Seeded per game so sessions can be replayed
+        self.session_recorder = SessionRecorder()
+        self.replayer = None  # Active SessionReplayer while a replay window is open
+        self.round_exporter = None  # RoundExporter while Session > Export Rounds is on
+        self._replay_after_id = None
+        self._replay_window = None
+        try:
+            self.profile_store = ProfileStore(PROFILE_DB_FILE)  # Returning players keep their balance
+            self.profile_store.attach(self.player_manager)
+        except Exception as e:
+            print(f"Player profiles are disabled: {e}")
+            self.profile_store = None
         self.current_player_name_var = tk.StringVar(self.master)
         self.current_player_name_var.set("No Player Selected")
         self.round_rolls = {}  # Track each player's roll and outcome for the round
@@ -47,7 +81,9 @@ class CeeLoDiceGameApp:
         self.game_has_started = False  # Track if the game has started
         self.high_contrast_mode = False  # Accessibility: high contrast mode
         self.font_scale = 1.0  # Accessibility: font scaling
+        self.show_frequencies = False  # Live outcome-frequency panel on the game screen
         self.round_number = 1  # Track the current round number
+        self.roll_animation_frames = ROLL_ANIMATION_FRAMES
         self.betting_phase = False  # Track if we're in the betting phase
         self.roll_sound = None
         try:
@@ -56,12 +92,66 @@ class CeeLoDiceGameApp:
             self.roll_sound = pygame.mixer.Sound("roll_dice.wav")
         except Exception:
             self.roll_sound = None
-        self._setup_window()
+        if not self.embedded:
+            self._setup_window()
         self.fonts = setup_fonts()
-        self._create_menu_bar()
+        if not self.embedded:
+            self._create_menu_bar()
         self._create_widgets()
         self._update_player_dropdown()
-        self._setup_keyboard_navigation()
+        if not self.embedded:
+            self._setup_keyboard_navigation()
+        self.leak_monitor = monitor_from_config(self.master, LEAK_MONITOR_ROUNDS)  # Debug only
+        self.round_profiler = RoundProfiler()
+        self.state_sync = TableStateServer(self.player_manager, self._round_state)  # Deltas for remote mirrors
+        # Read-only event feed for venue displays; joiners and lagging spectators get a state snapshot at once
+        self.spectators = SpectatorBroadcaster(
+            WINDOW_TITLE, snapshot=lambda: {"state": self.state_sync.snapshot(self.state_sync.last_round)})
+        if SPECTATOR_PORT and not self.embedded:
+            try:
+                self.spectators.serve_tcp(SPECTATOR_PORT)
+            except OSError as e:
+                print(f"Spectator feed is disabled: {e}")
+        self.master.bind("<Destroy>", self._on_destroy, add="+")
+        if self.profile_store is not None:
+            self.master.after(PROFILE_FLUSH_INTERVAL_MS, self._flush_profiles)
+
+    def _flush_profiles(self) -> None:
+        """
+        Periodically write pending profile changes (write-behind).
+        """
+        if self.profile_store is not None:
+            self.profile_store.flush_if_due()
+            self.master.after(PROFILE_FLUSH_INTERVAL_MS, self._flush_profiles)
+
+    def _round_state(self) -> dict:
+        """
+        Round-level state sent with every state-sync message.
+        """
+        return {"round": self.round_number, "player_up": self.current_player_name_var.get(),
+                "betting": self.betting_phase}
+
+    def _publish_state(self) -> None:
+        """
+        Push a state delta to spectators (new spectators already got a snapshot when they joined).
+        """
+        if self.spectators.subscribers:
+            self.spectators.publish("state", state=self.state_sync.next_message())
+
+    def _on_destroy(self, event) -> None:
+        """
+        Save pending profile changes, close a running round export and end the spectator feed
+        when the window (or embedded table) closes.
+        """
+        if event.widget is not self.master:
+            return
+        self.spectators.close()
+        if self.round_exporter is not None:
+            self.round_exporter.close()
+            self.round_exporter = None
+        if self.profile_store is not None:
+            self.profile_store.close()
+            self.profile_store = None
 
     def _setup_window(self) -> None:
         """
@@ -76,12 +166,33 @@ class CeeLoDiceGameApp:
         Create the menu bar with Accessibility and Help options.
         """
         menubar = tk.Menu(self.master)
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Undo", command=self._undo, accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Redo", command=self._redo, accelerator="Ctrl+Y")
+        menubar.add_cascade(label="Edit", menu=edit_menu)
         accessibility_menu = tk.Menu(menubar, tearoff=0)
         accessibility_menu.add_command(label="Toggle High Contrast Mode", command=self._toggle_high_contrast_mode, accelerator="Ctrl+H")
         accessibility_menu.add_command(label="Increase Font Size", command=self._increase_font_size, accelerator="Ctrl+=")
         accessibility_menu.add_command(label="Decrease Font Size", command=self._decrease_font_size, accelerator="Ctrl+-")
         accessibility_menu.add_command(label="Toggle Fullscreen", command=self._toggle_fullscreen, accelerator="F11")
         menubar.add_cascade(label="Accessibility", menu=accessibility_menu)
+        # Session menu
+        session_menu = tk.Menu(menubar, tearoff=0)
+        session_menu.add_command(label="Save Session...", command=self._save_session)
+        session_menu.add_command(label="Replay Session...", command=self._open_replay)
+        session_menu.add_separator()
+        session_menu.add_command(label="Export Rounds...", command=self._start_export)
+        session_menu.add_command(label="Stop Export", command=self._stop_export)
+        menubar.add_cascade(label="Session", menu=session_menu)
+        # Tools menu
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_command(label="Show/Hide Outcome Frequencies", command=self._toggle_frequency_panel)
+        tools_menu.add_command(label="Profile Next N Rounds...", command=self._profile_next_rounds)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        if LEAK_MONITOR_ROUNDS:
+            debug_menu = tk.Menu(menubar, tearoff=0)
+            debug_menu.add_command(label="Leak Report...", command=self._show_leak_report)
+            menubar.add_cascade(label="Debug", menu=debug_menu)
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="How to Play", command=self._show_how_to_play)
@@ -151,8 +262,13 @@ class CeeLoDiceGameApp:
         """
         Refresh the colors of all main widgets to reflect the current palette.
         """
-        # Recreate widgets to apply new colors
+        # Recreate widgets to apply new colors. Destroying the old container also
+        # unsubscribes its player lists from the PlayerManager change feed.
+        self.main_container_frame.destroy()
         self._create_widgets()
+        if self.game_has_started:
+            self.setup_frame.pack_forget()
+            self.game_frame.pack(expand=True, fill=tk.BOTH)
         self._update_player_dropdown()
 
     def _create_widgets(self) -> None:
@@ -191,9 +307,10 @@ class CeeLoDiceGameApp:
         self._create_game_widgets()
 
         # Now set geometry after widgets are packed
-        self.master.update_idletasks()
-        self.master.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
-        center_window(self.master)
+        if not self.embedded:
+            self.master.update_idletasks()
+            self.master.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
+            center_window(self.master)
 
     def _create_setup_widgets(self) -> None:
         """
@@ -233,8 +350,21 @@ class CeeLoDiceGameApp:
         list_frame = create_frame(player_frame)
         list_frame.pack(pady=10)
 
-        create_label(list_frame, "Players:").pack()
-        self.player_listbox = create_listbox(list_frame, height=6, width=40)
+        list_header = create_frame(list_frame)
+        list_header.pack(fill=tk.X)
+        create_label(list_header, "Players:").pack(side=tk.LEFT)
+        self.sort_var = tk.StringVar(self.master, value="seat")
+        sort_menu = tk.OptionMenu(list_header, self.sort_var, *VirtualPlayerList.SORT_KEYS,
+                                  command=self._on_sort_change)
+        sort_menu.config(font=self.fonts['player_label_font'], bg=COLOR_BUTTON_BET, fg=COLOR_TEXT_DARK)
+        sort_menu.pack(side=tk.RIGHT)
+        create_label(list_header, "Sort by:", font_key='player_label_font').pack(side=tk.RIGHT, padx=5)
+        self.player_listbox = VirtualPlayerList(
+            list_frame,
+            self.player_manager,
+            visible_rows=6,
+            status_func=self._player_row_status
+        )
         self.player_listbox.pack()
 
         # Start game button
@@ -268,9 +398,15 @@ class CeeLoDiceGameApp:
         self.game_title.grid(row=0, column=0, pady=20, sticky="n")
 
         # Player info area (persistent)
-        self.player_info_area = create_frame(self.game_frame)
+        self.player_info_area = VirtualPlayerList(
+            self.game_frame,
+            self.player_manager,
+            visible_rows=4,
+            font_key='header_font',
+            row_height=30,
+            status_func=self._player_row_status
+        )
         self.player_info_area.grid(row=1, column=0, pady=5, sticky="ew")
-        self._update_player_info_area()
 
         # Player selection
         player_select_frame = create_frame(self.game_frame)
@@ -308,6 +444,11 @@ class CeeLoDiceGameApp:
         )
         self.dice_placeholder.pack(pady=20)
 
+        # Observed vs. expected roll frequencies (Tools menu), under the dice
+        self.frequency_panel = OutcomeFrequencyPanel(self.game_frame, lambda: self.stats.outcomes)
+        if self.show_frequencies:
+            self.frequency_panel.grid(row=3, column=2, rowspan=3, padx=(20, 10), pady=10, sticky="ne")
+
         # Roll button
         self.roll_button = create_colored_button(
             self.game_frame,
@@ -364,26 +505,30 @@ class CeeLoDiceGameApp:
         Add a new player from the entry field to the player manager and update the UI.
         """
         player_name = self.player_entry.get().strip()
-        success, message = self.player_manager.add_player(player_name)
+        with self.player_manager.transaction():  # Seat and restored profile are one undo step
+            success, message = self.player_manager.add_player(player_name)
+            restored = success and self.profile_store is not None and \
+                self.profile_store.restore_player(self.player_manager, player_name)
         
         if success:
+            if restored:
+                message = f"Welcome back, {player_name}! Balance: ${self.player_manager.get_player(player_name)['balance']}"
             self.player_entry.delete(0, tk.END)
             self._update_player_listbox()
             self._update_player_dropdown()
             self._log_message(message)
         else:
-            show_message("Error", message, "error")
+            self._show_message("Error", message, "error")
 
     def _remove_player(self) -> None:
         """
         Remove the selected player from the player manager and update the UI.
         """
-        selection = self.player_listbox.curselection()
-        if not selection:
-            show_message("Error", "Please select a player to remove.", "error")
+        player_name = self.player_listbox.get_selected()
+        if not player_name:
+            self._show_message("Error", "Please select a player to remove.", "error")
             return
 
-        player_name = self.player_listbox.get(selection[0])
         success, message = self.player_manager.remove_player(player_name)
         
         if success:
@@ -391,18 +536,17 @@ class CeeLoDiceGameApp:
             self._update_player_dropdown()
             self._log_message(message)
         else:
-            show_message("Error", message, "error")
+            self._show_message("Error", message, "error")
 
     def _deposit_funds(self) -> None:
         """
         Add funds to the selected player's balance via a dialog prompt.
         """
-        selection = self.player_listbox.curselection()
-        if not selection:
-            show_message("Error", "Please select a player to deposit funds.", "error")
+        player_name = self.player_listbox.get_selected()
+        if not player_name:
+            self._show_message("Error", "Please select a player to deposit funds.", "error")
             return
 
-        player_name = self.player_listbox.get(selection[0])
         amount = tk.simpledialog.askinteger("Deposit Funds", f"Enter amount to deposit for {player_name}:")
         
         if amount:
@@ -411,52 +555,67 @@ class CeeLoDiceGameApp:
                 self._update_player_listbox()
                 self._log_message(message)
             else:
-                show_message("Error", message, "error")
+                self._show_message("Error", message, "error")
 
     def _start_game(self) -> None:
         """
         Start the game by switching to the game screen and initializing state.
         """
         if not self.player_manager.get_all_players():
-            show_message("Error", "Please add at least one player before starting the game.", "error")
+            self._show_message("Error", "Please add at least one player before starting the game.", "error")
             return
         self.setup_frame.pack_forget()
         self.game_frame.pack(expand=True, fill=tk.BOTH)
         self._log_message("Game started!")
         self.game_has_started = True
+        self.player_manager.clear_history()  # Setup steps cannot be undone into a running game
+        seed = random.randrange(2 ** 32)
+        self.rng.seed(seed)
+        self.session_recorder.start(self.player_manager, seed, self.ledger.remainder_policy)
         # Start betting phase for all players
         self._start_betting_phase()
 
     def _back_to_setup(self) -> None:
         """
-        Return to the setup screen and reset the game state.
+        Return to the setup screen and reset the game state (ending a replay, if one is open).
         """
+        self._end_replay()
         self.game_frame.pack_forget()
         self.setup_frame.pack(expand=True, fill=tk.BOTH)
         self.player_manager.reset_game()
+        self.player_manager.clear_history()  # Settled rounds are not undoable from the setup screen
         self._log_message("Returned to setup screen.")
         self.game_has_started = False
 
     def _update_player_listbox(self) -> None:
         """
-        Update the player listbox with current player names, balances, and statuses.
+        Repaint the visible rows of the player list.
+        Row contents follow the PlayerManager change feed; this only refreshes
+        statuses that depend on the whole table (e.g. WINNER).
         """
-        self.player_listbox.delete(0, tk.END)
-        all_players = self.player_manager.get_all_players()
-        active_players = self.player_manager.get_players_with_balance()
-        winner_name = active_players[0] if len(active_players) == 1 and self.game_has_started else None
-        for player_name in all_players:
-            player = self.player_manager.get_player(player_name)
-            if player["is_out"]:
-                status = " (OUT)"
-            elif winner_name and player_name == winner_name:
-                status = " (WINNER)"
-            else:
-                status = ""
-            self.player_listbox.insert(tk.END, f"{player_name}: ${player['balance']}{status}")
+        self.player_listbox.refresh()
         # Also update the persistent info area
         self._update_player_info_area()
 
+    def _player_row_status(self, player_name: str, player: dict) -> tuple:
+        """
+        Build the text and color for a player row in the player lists.
+        """
+        if player["is_out"]:
+            return f"{player_name}: ${player['balance']} (OUT)", COLOR_LOSE
+        if self.game_has_started:
+            active_players = self.player_manager.get_players_with_balance()
+            if len(active_players) == 1 and active_players[0] == player_name:
+                return f"{player_name}: ${player['balance']} (WINNER)", COLOR_WIN
+        return f"{player_name}: ${player['balance']}", COLOR_TEXT_DARK
+
+    def _on_sort_change(self, sort_key: str) -> None:
+        """
+        Re-sort both player lists by seat, balance or rounds won.
+        """
+        self.player_listbox.set_sort(sort_key)
+        self.player_info_area.set_sort(sort_key)
+
     def _update_player_dropdown(self) -> None:
         """
         Update the player dropdown menu with current active players.
@@ -509,10 +668,11 @@ class CeeLoDiceGameApp:
         for widget in self.player_info_frame.winfo_children():
             widget.destroy()
 
-        create_label(
-            self.player_info_frame,
-            f"Player: {current_player} | Balance: ${player['balance']} | Current Bet: ${player['current_bet']}"
-        ).pack()
+        info = f"Player: {current_player} | Balance: ${player['balance']} | Current Bet: ${player['current_bet']}"
+        suggestion = self._suggested_bet(current_player)
+        if suggestion:
+            info += f" | Suggested Bet: ${suggestion}"
+        create_label(self.player_info_frame, info).pack()
 
         # Only show Place Bet button if current_bet is 0 and in betting phase
         if player["current_bet"] == 0 and getattr(self, 'betting_phase', False):
@@ -537,8 +697,36 @@ class CeeLoDiceGameApp:
 
         self._log_message(f"Betting UI updated for {current_player}")
 
+    def _suggested_bet(self, player_name: str) -> int:
+        """
+        The bet that gives a player the best chance of winning the whole table,
+        from the cached policy tables (0 when there is nothing to suggest).
+        """
+        player = self.player_manager.get_player(player_name)
+        opponents = len(self.player_manager.get_players_with_balance()) - 1
+        # Only cached tables are used here; _start_betting_phase solves the missing ones in the background
+        return self.bet_advisor.suggest(player["balance"], opponents, table_target(self.player_manager, self.ledger),
+                                        solve=False) or 0
+
+    def _show_message(self, title: str, message: str, message_type: str = "info") -> None:
+        """
+        show_message owned by this table; non-modal when the table is embedded in a
+        multi-table window, so a message on one table does not block the others.
+        """
+        show_message(title, message, message_type, parent=self.master, modal=not self.embedded)
+
+    def _run_dialog(self, dialog: tk.Toplevel) -> None:
+        """
+        Show one of this table's dialogs. A standalone table waits for it with a grab;
+        an embedded table only keeps it above the window, so the other tables stay usable.
+        """
+        dialog.transient(self.master.winfo_toplevel())
+        if not self.embedded:
+            dialog.grab_set()
+            dialog.wait_window()
+
     def _prompt_for_bet(self) -> None:
-        show_message("Info", "All bets are placed at the start of the round.", "info")
+        self._show_message("Info", "All bets are placed at the start of the round.", "info")
 
     def _log_message(self, message: str) -> None:
         """
@@ -562,7 +750,7 @@ class CeeLoDiceGameApp:
                 pass
         current_player = self.current_player_name_var.get()
         if current_player in ["No Player Selected", "No Players Available"]:
-            show_message("Error", "Please select a player to roll.", "error")
+            self._show_message("Error", "Please select a player to roll.", "error")
             return
 
         player = self.player_manager.get_player(current_player)
@@ -574,18 +762,16 @@ class CeeLoDiceGameApp:
             if player["current_bet"] <= 0:
                 return  # User cancelled or bet is still 0
 
-        # Animated dice roll effect
-        import random
-        animation_frames = 10
-        animation_delay = 50  # ms
-        def animate(frame=0):
+        # Animated dice roll effect, one frame per tick of the shared animation clock
+        animation_frames = self.roll_animation_frames
+        def animate(frame):
             if frame < animation_frames:
                 fake_rolls = [random.randint(1, 6) for _ in range(3)]
                 self._display_dice(fake_rolls)
-                self.master.after(animation_delay, lambda: animate(frame + 1))
-            else:
-                self._finalize_roll_dice(current_player)
-        animate()
+                return True
+            self._finalize_roll_dice(current_player)
+            return False
+        self.animation_clock.add(animate)
 
     def _finalize_roll_dice(self, current_player: str) -> None:
         """
@@ -593,8 +779,14 @@ class CeeLoDiceGameApp:
         Enforces strict round-based play: one roll per player per round, unless 'No Score'.
         """
         player = self.player_manager.get_player(current_player)
-        rolls = [roll_single_die() for _ in range(NUM_DICE)]
+        rolls = [roll_single_die(DICE_SIDES, self.rng) for _ in range(NUM_DICE)]
+        self.session_recorder.record_roll(current_player, rolls)
         outcome = evaluate_roll(rolls)
+        self.stats.record_roll(rolls, outcome)
+        if self.show_frequencies:
+            self.frequency_panel.notify()
+        self.spectators.publish("roll", round=self.round_number, player=current_player, rolls=rolls,
+                                outcome=outcome["outcome"], value=outcome["value"])
         print(f"DEBUG: outcome from evaluate_roll: {outcome}")
         self._display_dice(rolls)
         self._log_message(f"{current_player} rolled: {rolls}")
@@ -614,9 +806,8 @@ class CeeLoDiceGameApp:
             color = COLOR_PUSH
         if hasattr(self, 'outcome_label'):
             self.outcome_label.config(text=msg, fg=color)
-        # Update player state
-        player["last_roll_outcome"] = outcome["outcome"]
-        player["point_value"] = outcome["value"]
+        # Update player state through the command log
+        fields = {"last_roll_outcome": outcome["outcome"], "point_value": outcome["value"]}
         # Only record the roll in round_rolls if it's a scoring outcome
         if outcome["outcome"] in ["Win", "Lose", "Point"]:
             self.round_rolls[current_player] = {
@@ -625,7 +816,9 @@ class CeeLoDiceGameApp:
                 "value": outcome["value"],
                 "bet": player["current_bet"]
             }
-            player["current_bet"] = 0
+            fields["current_bet"] = 0
+        self.player_manager.update_player(current_player, **fields)
+        self._publish_state()
         self._update_player_listbox()
         self._update_player_dropdown()
         self._update_player_betting_ui()
@@ -712,24 +905,35 @@ class CeeLoDiceGameApp:
         Determine the winner(s) for the round, transfer the pot, announce, and reset for next round.
         Uses round_manager for ranking and payout logic.
         """
-        from round_manager import determine_winners, split_pot_among_winners
+        from round_manager import determine_winners
         if not self.round_rolls:
             return
         # Determine winners using modular logic
         winners = determine_winners(self.round_rolls)
-        # Deduct bets from all players
-        for player, info in self.round_rolls.items():
-            self.player_manager.players[player]["balance"] -= info["bet"]
-            self.player_manager.players[player]["current_bet"] = 0
-            if self.player_manager.players[player]["balance"] <= 0:
-                self.player_manager.players[player]["is_out"] = True
-        # Split pot and update rounds_won
-        split_pot_among_winners(self.round_rolls, winners, self.player_manager)
+        # Collect bets, split the pot and update rounds_won in one settlement
+        settlement = self.ledger.settle_round(self.player_manager, self.round_rolls, winners)
+        self.session_recorder.end_round()
+        if self.round_exporter is not None:
+            self.round_exporter.add_round(self.round_number, self.player_manager, self.round_rolls, settlement)
+        if self.spectators.subscribers:
+            self.spectators.publish("round", round=self.round_number, winners=winners, pot=settlement["pot"],
+                                    payouts=settlement["payouts"], carry_over=settlement["carry_over"],
+                                    balances={name: p["balance"] for name, p in self.player_manager.players.items()})
+            self._publish_state()
+        if self.leak_monitor is not None:
+            self.leak_monitor.on_round_end()
+        if self.round_profiler.on_round_end():
+            self._log_message(f"Profile saved to {self.round_profiler.stats_path}")
+            self._show_text_window("Profile Results", self.round_profiler.top_functions())
+        seats = self.player_manager.get_all_players()
+        self.stats.record_round(seats.index(w) for w in winners)
         # Log and save round summary
         if len(winners) == 1:
             self._log_message(f"🏆 {winners[0]} wins the round and takes the pot!")
         else:
             self._log_message(f"🤝 Tie! {' & '.join(winners)} split the pot.")
+        if settlement["carry_over"]:
+            self._log_message(f"${settlement['carry_over']} carries over to the next pot.")
         round_summary = []
         for player, info in self.round_rolls.items():
             msg = f"{player}: {info['rolls']} ({info['outcome']} - {info['value']})"
@@ -753,13 +957,17 @@ class CeeLoDiceGameApp:
         active_players = self.player_manager.get_players_with_balance()
         if len(active_players) == 1:
             winner = active_players[0]
+            paid = self.ledger.pay_carry_over(self.player_manager, winner)
+            if paid:
+                self._log_message(f"{winner} also takes the ${paid} carried over in the pot.")
+                self._update_player_listbox()
             self._log_message(f"🎉 {winner} is the last player with money and wins the game!")
             self._show_end_game_popup(winner)
         elif active_players:
             self.current_player_name_var.set(active_players[0])
             self._log_message("====================")
             self._log_message(f"New round is starting! {active_players[0]} goes first.")
-            messagebox.showinfo("New Round", f"A new round is starting! {active_players[0]} goes first.")
+            self._show_message("New Round", f"A new round is starting! {active_players[0]} goes first.")
         else:
             self._end_game_all_players_out()
 
@@ -767,23 +975,26 @@ class CeeLoDiceGameApp:
         """
         Handle game over when all players are out of money.
         """
-        show_message("Game Over", "All players are out of money! Game over.", "info")
+        self._show_message("Game Over", "All players are out of money! Game over.", "info")
         self._back_to_setup()
 
     def _show_leaderboard(self) -> None:
         """
-        Show a popup with the current leaderboard (rounds won by each player).
+        Show a popup with the top of the leaderboard (rounds won by each player).
         """
-        leaderboard = self.player_manager.get_leaderboard()
+        leaderboard = self.player_manager.get_leaderboard(LEADERBOARD_TOP_K)
         msg = "Leaderboard:\n\n" + "\n".join(f"{i+1}. {name}: {wins} round(s)" for i, (name, wins) in enumerate(leaderboard))
-        messagebox.showinfo("Leaderboard", msg)
+        hidden = len(self.player_manager.players) - len(leaderboard)
+        if hidden > 0:
+            msg += f"\n... and {hidden} more player(s)"
+        self._show_message("Leaderboard", msg)
 
     def _show_history(self) -> None:
         """
         Show a popup with the full round-by-round history.
         """
         if not self.round_history:
-            messagebox.showinfo("History", "No rounds played yet.")
+            self._show_message("History", "No rounds played yet.")
             return
         msg = ""
         for i, round_info in enumerate(self.round_history, 1):
@@ -791,7 +1002,7 @@ class CeeLoDiceGameApp:
             for line in round_info['summary']:
                 msg += f"  {line}\n"
             msg += "\n"
-        messagebox.showinfo("Round History", msg)
+        self._show_message("Round History", msg)
 
     def _setup_keyboard_navigation(self) -> None:
         """
@@ -799,19 +1010,55 @@ class CeeLoDiceGameApp:
         """
         # Tab/Shift-Tab navigation is default in Tkinter
         # Bind Enter/Space to activate focused button
+        for sequence, handler in self._keyboard_shortcuts().items():
+            self.master.bind(sequence, handler)
+
+    def _keyboard_shortcuts(self) -> dict:
+        """
+        Return the key sequence -> handler map. An embedded table's host binds these
+        once and forwards them to the visible table.
+        """
         def activate_focused(event):
             widget = self.master.focus_get()
             if isinstance(widget, tk.Button):
                 widget.invoke()
-        self.master.bind("<Return>", activate_focused)
-        self.master.bind("<KP_Enter>", activate_focused)
-        self.master.bind("<space>", activate_focused)
-        # Keyboard shortcuts
-        self.master.bind("<r>", lambda e: self._roll_dice() if self.roll_button['state'] == tk.NORMAL else None)
-        self.master.bind("<R>", lambda e: self._roll_dice() if self.roll_button['state'] == tk.NORMAL else None)
-        self.master.bind("<b>", lambda e: self._prompt_for_bet())
-        self.master.bind("<B>", lambda e: self._prompt_for_bet())
-        self.master.bind("<Escape>", lambda e: self._back_to_setup())
+        roll = lambda e: self._roll_dice() if self.roll_button['state'] == tk.NORMAL else None
+        bet = lambda e: self._prompt_for_bet()
+        return {
+            "<Return>": activate_focused,
+            "<KP_Enter>": activate_focused,
+            "<space>": activate_focused,
+            # Keyboard shortcuts
+            "<r>": roll,
+            "<R>": roll,
+            "<b>": bet,
+            "<B>": bet,
+            "<Escape>": lambda e: self._back_to_setup(),
+            "<Control-z>": lambda e: self._undo(),
+            "<Control-y>": lambda e: self._redo(),
+        }
+
+    def _undo(self) -> None:
+        """
+        Undo the last player change (add, remove, deposit, bet) on the setup screen.
+        """
+        self._undo_redo(self.player_manager.undo, "Undid the last change.")
+
+    def _redo(self) -> None:
+        """
+        Redo the last undone player change on the setup screen.
+        """
+        self._undo_redo(self.player_manager.redo, "Redid the last change.")
+
+    def _undo_redo(self, action, message: str) -> None:
+        if self.game_has_started:
+            # Rounds in progress keep their own state (rolls, recorded bets); only setup is undoable
+            self._show_message("Undo", "Undo and redo are available on the setup screen.", "info")
+            return
+        if action():
+            self._update_player_listbox()
+            self._update_player_dropdown()
+            self._log_message(message)
 
     def _increase_font_size(self) -> None:
         """
@@ -875,27 +1122,62 @@ class CeeLoDiceGameApp:
             "- Hover over buttons for tooltips.\n"
             "- Use keyboard shortcuts: R (Roll), B (Bet), Esc (Back), F11 (Fullscreen).\n"
         )
-        messagebox.showinfo("How to Play", rules)
+        self._show_message("How to Play", rules)
 
-    def _update_player_info_area(self) -> None:
+    def _show_leak_report(self) -> None:
         """
-        Update the persistent player info area with all player names and balances.
+        Show the leak monitor's summary (debug mode only).
         """
-        for widget in self.player_info_area.winfo_children():
-            widget.destroy()
-        all_players = self.player_manager.get_all_players()
-        if not all_players:
-            create_label(self.player_info_area, "No players added.").pack()
+        if self.leak_monitor is None:
             return
-        for player_name in all_players:
-            player = self.player_manager.get_player(player_name)
-            status = " (OUT)" if player["is_out"] else ""
-            create_label(
-                self.player_info_area,
-                f"{player_name}: ${player['balance']}{status}",
-                font_key='header_font',
-                fg=COLOR_TEXT_LIGHT if not player["is_out"] else COLOR_LOSE
-            ).pack(side=tk.LEFT, padx=10)
+        self.leak_monitor.sample()
+        self._show_text_window("Leak Report", self.leak_monitor.report())
+
+    def _toggle_frequency_panel(self) -> None:
+        """
+        Show or hide the live outcome-frequency panel on the game screen.
+        """
+        self.show_frequencies = not self.show_frequencies
+        if self.show_frequencies:
+            self.frequency_panel.grid(row=3, column=2, rowspan=3, padx=(20, 10), pady=10, sticky="ne")
+            self.frequency_panel.notify()
+        else:
+            self.frequency_panel.grid_remove()
+
+    def _profile_next_rounds(self) -> None:
+        """
+        Ask for a number of rounds and profile the app until they have been played.
+        """
+        if self.round_profiler.active:
+            if messagebox.askyesno("Profiler", f"Profiling is running ({self.round_profiler.remaining} round(s) left). Stop now?"):
+                self.round_profiler.stop()
+                self._show_text_window("Profile Results", self.round_profiler.top_functions())
+            return
+        rounds = simpledialog.askinteger("Profile Next N Rounds", "Number of rounds to profile:",
+                                         initialvalue=5, minvalue=1, maxvalue=1000, parent=self.master)
+        if rounds:
+            self.round_profiler.start(rounds)
+            self._log_message(f"Profiling the next {rounds} round(s)...")
+
+    def _show_text_window(self, title: str, content: str) -> None:
+        """
+        Show read-only monospaced text (reports and profiles) in its own window.
+        """
+        window = tk.Toplevel(self.master)
+        window.title(title)
+        window.configure(bg=COLOR_SECONDARY)
+        text = scrolledtext.ScrolledText(window, width=110, height=30, font=("Courier", 10),
+                                         bg=COLOR_PRIMARY, fg=COLOR_TEXT_LIGHT)
+        text.insert(tk.END, content)
+        text.config(state=tk.DISABLED)
+        text.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+        window.transient(self.master)
+
+    def _update_player_info_area(self) -> None:
+        """
+        Repaint the persistent player info area (a virtualized list of all players).
+        """
+        self.player_info_area.refresh()
 
     def _show_end_game_popup(self, winner: str) -> None:
         """
@@ -915,12 +1197,11 @@ class CeeLoDiceGameApp:
         # Play again or exit
         def on_play_again():
             popup.destroy()
-            for player in self.player_manager.players.values():
-                player["balance"] = INITIAL_PLAYER_BALANCE
-                player["is_out"] = False
-                player["current_bet"] = 0
-                player["last_roll_outcome"] = None
-                player["point_value"] = None
+            with self.player_manager.transaction():
+                for player_name in self.player_manager.get_all_players():
+                    self.player_manager.update_player(player_name, balance=INITIAL_PLAYER_BALANCE, is_out=False,
+                                                      current_bet=0, last_roll_outcome=None, point_value=None)
+            self.ledger.reset()
             self._log_message("Game reset! Add/remove players or click Start Game to play again.")
             self._back_to_setup()
         def on_exit():
@@ -930,9 +1211,7 @@ class CeeLoDiceGameApp:
         play_again_btn.pack(padx=20, pady=10)
         exit_btn = create_button(popup, "Exit", on_exit, bg=COLOR_LOSE, font_key='header_font')
         exit_btn.pack(padx=20, pady=(0, 15))
-        popup.grab_set()
-        popup.transient(self.master)
-        popup.wait_window()
+        self._run_dialog(popup)
 
     def _update_round_label(self):
         """Update the round number label."""
@@ -944,6 +1223,10 @@ class CeeLoDiceGameApp:
         """
         self.betting_phase = True
         self.round_rolls = {}
+        # Suggested bets: solve the tables this round can use, off the UI thread (cached tables are skipped)
+        target = table_target(self.player_manager, self.ledger)
+        players = len(self.player_manager.get_players_with_balance())
+        self.bet_advisor.precompute((opponents, target) for opponents in range(1, players))
         self._log_message("Betting phase: Enter bets for all players before rolling.")
         self._show_all_bets_dialog()
 
@@ -977,6 +1260,9 @@ class CeeLoDiceGameApp:
                         return
                 for player in players:
                     self.player_manager.set_bet(player, amount)
+                self.session_recorder.begin_round({player: amount for player in players})
+                self.spectators.publish("bets", round=self.round_number, bets={player: amount for player in players})
+                self._publish_state()
                 dialog.destroy()
                 self.betting_phase = False
                 self._log_message(f"All bets of ${amount} are in! First player may roll.")
@@ -987,13 +1273,184 @@ class CeeLoDiceGameApp:
                 error_label.config(text="Bet must be a number.")
         submit_btn = tk.Button(dialog, text="Submit Bets", command=submit_bets, font=("Arial", 12, "bold"), bg=COLOR_WIN, fg=COLOR_TEXT_DARK)
         submit_btn.pack(pady=(10, 15))
-        dialog.grab_set()
-        dialog.transient(self.master)
-        dialog.wait_window()
+        self._run_dialog(dialog)
 
     def _prompt_next_bet(self):
         pass  # No longer needed with new betting dialog
 
+    def _save_session(self) -> None:
+        """
+        Save the recorded session (seed, bets and rolls) for later replay.
+        """
+        if not self.session_recorder.is_recording:
+            self._show_message("Error", "Start a game before saving a session.", "error")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Session files", "*.json")])
+        if path:
+            self.session_recorder.save(path)
+            self._log_message(f"Session saved to {path}")
+
+    def _start_export(self) -> None:
+        """
+        Export every round settled from now on (rolls, bets, payouts and balances) to CSV,
+        and to Parquet as well when pyarrow is installed.
+        """
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        self._stop_export()
+        try:
+            self.round_exporter = RoundExporter(os.path.splitext(path)[0])
+        except OSError as e:
+            self._show_message("Error", f"Could not start the export: {e}", "error")
+            return
+        self._log_message(f"Exporting rounds to {path}")
+
+    def _stop_export(self) -> None:
+        """
+        Flush and close the round export, if one is running.
+        """
+        if self.round_exporter is None:
+            return
+        exporter, self.round_exporter = self.round_exporter, None
+        exporter.close()
+        self._log_message(f"Round export stopped: {exporter.rows_written} row(s) written.")
+
+    def _open_replay(self) -> None:
+        """
+        Load a recorded session and open the replay controls.
+        Replaces the current table with the session's players.
+        """
+        path = filedialog.askopenfilename(filetypes=[("Session files", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            session = load_session(path)
+        except (OSError, ValueError, KeyError) as e:
+            self._show_message("Error", f"Could not load session: {e}", "error")
+            return
+        if self.player_manager.players and not messagebox.askyesno(
+                "Replay Session", "Replaying replaces the current table. Continue?"):
+            return
+        self._end_replay()
+        self.replayer = SessionReplayer(session)
+        if self.profile_store is not None:
+            self.profile_store.detach()  # Replayed balances must not overwrite player profiles
+        for name in self.player_manager.get_all_players():
+            self.player_manager.remove_player(name)
+        for name in self.replayer.player_manager.get_all_players():
+            self.player_manager.add_player(name)
+        self._sync_replay_state()
+        self.setup_frame.pack_forget()
+        self.game_frame.pack(expand=True, fill=tk.BOTH)
+        self.game_has_started = True
+        self.roll_button.config(state=tk.DISABLED)
+        self._log_message(f"Replaying session with {len(self.replayer)} round(s).")
+        self._show_replay_window()
+
+    def _end_replay(self) -> None:
+        """
+        Close the replay controls, clear the replayed seats and let the profile store
+        record changes again.
+        """
+        if self.replayer is None:
+            return
+        if self._replay_after_id is not None:
+            self.master.after_cancel(self._replay_after_id)
+            self._replay_after_id = None
+        self.replayer = None
+        if self._replay_window is not None:
+            self._replay_window.destroy()
+            self._replay_window = None
+        for name in self.player_manager.get_all_players():
+            self.player_manager.remove_player(name)  # Leaving the table keeps the saved profiles
+        self.player_manager.clear_history()
+        if self.profile_store is not None:
+            self.profile_store.attach(self.player_manager)
+        self._update_player_listbox()
+        self._update_player_dropdown()
+
+    def _sync_replay_state(self) -> None:
+        """
+        Copy the replayer's player state onto the table and show the last replayed round.
+        Skips animation and popups.
+        """
+        replayer = self.replayer
+        for name, data in replayer.player_manager.players.items():
+            self.player_manager.players[name].update(data)
+            self.player_manager.notify_player_changed(name)
+        self.round_number = replayer.position + 1
+        self._update_round_label()
+        self._update_player_listbox()
+        result = replayer.last_result
+        if result and result["round_rolls"]:
+            last_player = list(result["round_rolls"])[-1]
+            self.current_player_name_var.set(last_player)
+            self._display_dice(result["round_rolls"][last_player]["rolls"])
+            self._log_message(f"Round {result['round']}: Winner(s): {', '.join(result['winners'])}")
+
+    def _show_replay_window(self) -> None:
+        """
+        Show replay controls: speed (1x, 10x, max), pause and a scrubber over rounds.
+        """
+        window = self._replay_window = tk.Toplevel(self.master)
+        window.title("Session Replay")
+        window.configure(bg=COLOR_SECONDARY)
+        window.resizable(False, False)
+        total = len(self.replayer)
+        speed_var = tk.StringVar(window, value="Paused")
+        position_var = tk.IntVar(window, value=0)
+        status = tk.Label(window, text=f"Round 0 / {total}", font=("Arial", 14, "bold"),
+                          fg=COLOR_TEXT_LIGHT, bg=COLOR_SECONDARY)
+        status.pack(padx=20, pady=(15, 5))
+        delays = {"1x": 1000, "10x": 100, "Max": 0}
+
+        def update_status():
+            position_var.set(self.replayer.position)
+            status.config(text=f"Round {self.replayer.position} / {total}")
+
+        def tick():
+            self._replay_after_id = None
+            if self.replayer is None or speed_var.get() not in delays:
+                return
+            if speed_var.get() == "Max":
+                # Apply as many rounds as fit in one frame, then draw once
+                deadline = self.master.tk.call('clock', 'milliseconds') + 30
+                while self.replayer.step() and self.master.tk.call('clock', 'milliseconds') < deadline:
+                    pass
+            else:
+                self.replayer.step()
+            self._sync_replay_state()
+            update_status()
+            if self.replayer.position >= total:
+                speed_var.set("Paused")
+                return
+            self._replay_after_id = self.master.after(max(1, delays[speed_var.get()]), tick)
+
+        def set_speed(speed):
+            speed_var.set(speed)
+            if self._replay_after_id is None and speed in delays:
+                tick()
+
+        def on_scrub(value):
+            if self.replayer is not None and int(value) != self.replayer.position:
+                self.replayer.seek(int(value))
+                self._sync_replay_state()
+                update_status()
+
+        def on_close():
+            self._back_to_setup()  # Ends the replay and closes this window
+
+        tk.Scale(window, from_=0, to=total, orient=tk.HORIZONTAL, length=360, variable=position_var,
+                 command=on_scrub, bg=COLOR_SECONDARY, fg=COLOR_TEXT_LIGHT, highlightthickness=0).pack(padx=20, pady=5)
+        controls = create_frame(window)
+        controls.pack(padx=20, pady=(5, 15))
+        for label in ("1x", "10x", "Max"):
+            create_button(controls, label, lambda s=label: set_speed(s), font_key='player_label_font').pack(side=tk.LEFT, padx=3)
+        create_button(controls, "Pause", lambda: speed_var.set("Paused"), font_key='player_label_font').pack(side=tk.LEFT, padx=3)
+        window.protocol("WM_DELETE_WINDOW", on_close)
+        window.transient(self.master)
+
 
 def main() -> None:
     """
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Multi-table mode: several Cee-lo tables as tabs of one Tk window.
+
+Each tab is an embedded CeeLoDiceGameApp with its own PlayerManager, ledger
+and round state. All tables share the cached fonts from setup_fonts, the
+colour palette and one AnimationClock, so the whole venue runs in a
+single Python/Tk process. The menu bar and keyboard shortcuts belong to the
+window and act on the table in the visible tab.
+"""
+import argparse
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Optional
+
+from config import *
+from gui_components import AnimationClock, center_window
+from main import CeeLoDiceGameApp
+
+
+class MultiTableApp:
+    """
+    Hosts any number of tables in a ttk.Notebook.
+    """
+    def __init__(self, master: tk.Tk, tables: int = 2) -> None:
+        """
+        Args:
+            master (tk.Tk): The root Tkinter window.
+            tables (int): Number of tables to open at start.
+        """
+        self.master = master
+        self.master.title(f"{WINDOW_TITLE} - Tables")
+        self.master.configure(bg=COLOR_PRIMARY)
+        self.master.resizable(True, True)
+        self.animation_clock = AnimationClock(master)
+        self.tables: List[CeeLoDiceGameApp] = []
+        self._next_table_number = 1
+        self.notebook = ttk.Notebook(master)
+        self.notebook.pack(expand=True, fill=tk.BOTH)
+        self._create_menu_bar()
+        for _ in range(max(1, tables)):
+            self.add_table()
+        self._bind_shortcuts()
+        self.master.update_idletasks()
+        self.master.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
+        center_window(self.master)
+
+    def add_table(self) -> CeeLoDiceGameApp:
+        """
+        Open a new table in its own tab and show it.
+        """
+        frame = tk.Frame(self.notebook, bg=COLOR_PRIMARY)
+        table = CeeLoDiceGameApp(frame, embedded=True, animation_clock=self.animation_clock)
+        table.spectators.table = f"Table {self._next_table_number}"
+        self.tables.append(table)
+        self.notebook.add(frame, text=f"Table {self._next_table_number}")
+        self._next_table_number += 1
+        self.notebook.select(frame)
+        return table
+
+    def close_table(self) -> None:
+        """
+        Close the visible table (the last table stays open).
+        """
+        table = self.active_table()
+        if table is None or len(self.tables) == 1:
+            return
+        self.tables.remove(table)
+        self.notebook.forget(table.master)
+        table.master.destroy()
+
+    def active_table(self) -> Optional[CeeLoDiceGameApp]:
+        """
+        Return the table in the visible tab.
+        """
+        selected = self.notebook.select()
+        for table in self.tables:
+            if str(table.master) == selected:
+                return table
+        return None
+
+    def _create_menu_bar(self) -> None:
+        menubar = tk.Menu(self.master)
+        tables_menu = tk.Menu(menubar, tearoff=0)
+        tables_menu.add_command(label="New Table", command=self.add_table)
+        tables_menu.add_command(label="Close Table", command=self.close_table)
+        menubar.add_cascade(label="Tables", menu=tables_menu)
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label="Undo", command=lambda: self._for_active("_undo"), accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Redo", command=lambda: self._for_active("_redo"), accelerator="Ctrl+Y")
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        accessibility_menu = tk.Menu(menubar, tearoff=0)
+        accessibility_menu.add_command(label="Toggle High Contrast Mode", command=self._toggle_high_contrast_mode)
+        accessibility_menu.add_command(label="Increase Font Size", command=lambda: self._for_all("_increase_font_size"))
+        accessibility_menu.add_command(label="Decrease Font Size", command=lambda: self._for_all("_decrease_font_size"))
+        accessibility_menu.add_command(label="Toggle Fullscreen", command=self._toggle_fullscreen, accelerator="F11")
+        menubar.add_cascade(label="Accessibility", menu=accessibility_menu)
+        session_menu = tk.Menu(menubar, tearoff=0)
+        session_menu.add_command(label="Save Session...", command=lambda: self._for_active("_save_session"))
+        session_menu.add_command(label="Replay Session...", command=lambda: self._for_active("_open_replay"))
+        session_menu.add_separator()
+        session_menu.add_command(label="Export Rounds...", command=lambda: self._for_active("_start_export"))
+        session_menu.add_command(label="Stop Export", command=lambda: self._for_active("_stop_export"))
+        menubar.add_cascade(label="Session", menu=session_menu)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_command(label="Show/Hide Outcome Frequencies", command=lambda: self._for_active("_toggle_frequency_panel"))
+        tools_menu.add_command(label="Profile Next N Rounds...", command=lambda: self._for_active("_profile_next_rounds"))
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        if LEAK_MONITOR_ROUNDS:
+            debug_menu = tk.Menu(menubar, tearoff=0)
+            debug_menu.add_command(label="Leak Report...", command=lambda: self._for_active("_show_leak_report"))
+            menubar.add_cascade(label="Debug", menu=debug_menu)
+        help_menu = tk.Menu(menubar, tearoff=0)
+        help_menu.add_command(label="How to Play", command=lambda: self._for_active("_show_how_to_play"))
+        menubar.add_cascade(label="Help", menu=help_menu)
+        self.master.config(menu=menubar)
+
+    def _bind_shortcuts(self) -> None:
+        """
+        Bind each table shortcut once on the window and forward it to the visible table.
+        """
+        def forward(sequence):
+            def handler(event):
+                table = self.active_table()
+                if table is not None:
+                    return table._keyboard_shortcuts()[sequence](event)
+            return handler
+        for sequence in self.tables[0]._keyboard_shortcuts():
+            self.master.bind(sequence, forward(sequence))
+        self.master.bind("<F11>", lambda e: self._toggle_fullscreen())
+
+    def _for_active(self, method: str) -> None:
+        table = self.active_table()
+        if table is not None:
+            getattr(table, method)()
+
+    def _for_all(self, method: str) -> None:
+        for table in self.tables:
+            getattr(table, method)()
+
+    def _toggle_high_contrast_mode(self) -> None:
+        # The palette lives in shared module globals; every table flips its mode and rebuilds
+        self._for_all("_toggle_high_contrast_mode")
+
+    def _toggle_fullscreen(self) -> None:
+        self.master.attributes('-fullscreen', not self.master.attributes('-fullscreen'))
+
+
+def main() -> None:
+    """
+    Command-line entry point: open a window with several tables.
+    """
+    parser = argparse.ArgumentParser(description="Run several Cee-lo tables in one window.")
+    parser.add_argument("--tables", type=int, default=2, help="Tables to open at start")
+    args = parser.parse_args()
+    root = tk.Tk()
+    MultiTableApp(root, args.tables)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,198 @@
+from collections import deque
+from contextlib import contextmanager
 from config import INITIAL_PLAYER_BALANCE
-from typing import Dict, List, Tuple, Optional, Any
+from leaderboard import LeaderboardIndex
+from typing import Dict, Iterator, List, Tuple, Optional, Any, Callable
+
+# A command is (seq, op, player_name, data):
+#   ("add" | "remove", name, (seat, player_dict))  - inverse of each other
+#   ("update", name, (old_fields, new_fields))     - inverse swaps old and new
+Command = Tuple[int, str, str, Any]
+
+_INVERSE_OPS = {"add": "remove", "remove": "add", "update": "update"}
 
 
 class PlayerManager:
     """
     Manages player data and actions for the Cee-lo game.
+
+    Every mutation made through the manager is recorded as a compact command
+    with a cheap inverse. The commands back undo/redo, transactional rollback
+    and a sequence-numbered command stream (see commands_since).
     """
-    def __init__(self) -> None:
-        """Initialize the player manager with an empty player dictionary."""
+    def __init__(self, history_limit: int = 1000) -> None:
+        """
+        Initialize the player manager with an empty player dictionary.
+        Args:
+            history_limit (int): Commands kept for the stream and undo steps kept
+                for undo (0 disables both, e.g. for bulk simulations).
+        """
         self.players: Dict[str, Dict[str, Any]] = {}
+        self._change_listeners: List[Callable[[str, str], None]] = []
+        self.leaderboard = LeaderboardIndex()
+        self.history_limit = history_limit
+        self.command_log: deque = deque(maxlen=history_limit)
+        self.last_seq = 0
+        self._undo: deque = deque(maxlen=history_limit)
+        self._redo: List[List[Command]] = []
+        self._transaction: Optional[List[Command]] = None
+
+    def subscribe_changes(self, listener: Callable[[str, str], None]) -> None:
+        """
+        Register a listener for the player change feed.
+        The listener is called as listener(player_name, change) where change is
+        "add", "remove" or "update".
+        """
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def unsubscribe_changes(self, listener: Callable[[str, str], None]) -> None:
+        """
+        Remove a listener previously registered with subscribe_changes.
+        """
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def notify_player_changed(self, player_name: str, change: str = "update") -> None:
+        """
+        Publish a change for a single player to all listeners.
+        Code that edits a player's dictionary directly must call this afterwards.
+        """
+        if change == "remove":
+            self.leaderboard.remove(player_name)
+        elif player_name in self.players:
+            player = self.players[player_name]
+            self.leaderboard.update(player_name, player["rounds_won"], player["balance"])
+        for listener in list(self._change_listeners):
+            listener(player_name, change)
+
+    # --- Command log -----------------------------------------------------------
+
+    def _record(self, op: str, player_name: str, data: Any, undoable: bool = True) -> None:
+        """Append a command to the stream and to the open transaction or undo history."""
+        if not self.history_limit and self._transaction is None:
+            return
+        self.last_seq += 1
+        command = (self.last_seq, op, player_name, data)
+        self.command_log.append(command)
+        if not undoable:
+            return
+        if self._transaction is not None:
+            self._transaction.append(command)
+        else:
+            self._undo.append([command])
+            self._redo.clear()
+
+    def _apply(self, op: str, player_name: str, data: Any) -> None:
+        """Apply a command's effect to the players dict and notify listeners."""
+        if op == "update":
+            self.players[player_name].update(data[1])
+            self.notify_player_changed(player_name)
+        elif op == "add":
+            seat, player = data
+            items = list(self.players.items())
+            items.insert(seat, (player_name, dict(player)))
+            self.players.clear()
+            self.players.update(items)
+            self.notify_player_changed(player_name, "add")
+        else:
+            del self.players[player_name]
+            self.notify_player_changed(player_name, "remove")
+
+    def _revert(self, commands: List[Command]) -> None:
+        """Apply the inverses of commands, newest first (the inverses go to the stream too)."""
+        for _, op, name, data in reversed(commands):
+            inverse_op = _INVERSE_OPS[op]
+            inverse_data = (data[1], data[0]) if op == "update" else data
+            self._apply(inverse_op, name, inverse_data)
+            self._record(inverse_op, name, inverse_data, undoable=False)
+
+    def update_player(self, player_name: str, **fields: Any) -> bool:
+        """
+        Set fields of a player's dictionary through the command log (e.g. balance, is_out).
+        Returns False if the player is not found.
+        """
+        player = self.players.get(player_name)
+        if player is None:
+            return False
+        if self.history_limit or self._transaction is not None:
+            self._record("update", player_name, ({key: player.get(key) for key in fields}, fields))
+        player.update(fields)
+        self.notify_player_changed(player_name)
+        return True
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the mutations inside a with-block into one undo step.
+        If the block raises, its mutations are rolled back before the exception propagates.
+        Nested transactions join the outermost one.
+        """
+        if self._transaction is not None:
+            yield
+            return
+        self._transaction = []
+        try:
+            yield
+        except BaseException:
+            commands, self._transaction = self._transaction, None
+            self._revert(commands)
+            raise
+        commands, self._transaction = self._transaction, None
+        if commands and self.history_limit:
+            self._undo.append(commands)
+            self._redo.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear_history(self) -> None:
+        """
+        Forget every undo and redo step (the command log stream is kept), e.g. when a
+        game starts or ends, so setup-screen undo cannot rewind settled rounds.
+        """
+        self._undo.clear()
+        self._redo.clear()
+
+    def undo(self) -> bool:
+        """
+        Revert the most recent undo step. Returns False if there is nothing to undo.
+        """
+        if not self._undo or self._transaction is not None:
+            return False
+        commands = self._undo.pop()
+        self._revert(commands)
+        self._redo.append(commands)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Re-apply the most recently undone step. Returns False if there is nothing to redo.
+        """
+        if not self._redo or self._transaction is not None:
+            return False
+        commands = self._redo.pop()
+        for _, op, name, data in commands:
+            self._apply(op, name, data)
+            self._record(op, name, data, undoable=False)
+        self._undo.append(commands)
+        return True
+
+    def commands_since(self, seq: int) -> Optional[List[Command]]:
+        """
+        Return the commands recorded after sequence number seq, oldest first.
+        Returns None if some of them have already left the bounded log, in which
+        case the consumer has to resynchronise from the full state.
+        """
+        if seq >= self.last_seq:
+            return []
+        if not self.command_log or self.command_log[0][0] > seq + 1:
+            return None
+        start = len(self.command_log) - (self.last_seq - seq)
+        return [self.command_log[i] for i in range(start, len(self.command_log))]
     
     def add_player(self, player_name: str) -> Tuple[bool, str]:
         """
@@ -29,6 +213,8 @@ class PlayerManager:
             "is_out": False,
             "rounds_won": 0
         }
+        self._record("add", player_name, (len(self.players) - 1, dict(self.players[player_name])))
+        self.notify_player_changed(player_name, "add")
         return True, f"Player '{player_name}' added with ${INITIAL_PLAYER_BALANCE} balance."
     
     def remove_player(self, player_name: str) -> Tuple[bool, str]:
@@ -39,7 +225,9 @@ class PlayerManager:
         if player_name not in self.players:
             return False, f"Player '{player_name}' not found."
         
-        del self.players[player_name]
+        seat = list(self.players).index(player_name)
+        self._record("remove", player_name, (seat, self.players.pop(player_name)))
+        self.notify_player_changed(player_name, "remove")
         return True, f"Player '{player_name}' removed from the game."
     
     def get_player(self, player_name: str) -> Optional[Dict[str, Any]]:
@@ -82,7 +270,7 @@ class PlayerManager:
         except ValueError:
             return False, "Deposit amount must be a valid number."
         
-        self.players[player_name]["balance"] += amount
+        self.update_player(player_name, balance=self.players[player_name]["balance"] + amount)
         return True, f"${amount} added to {player_name}'s balance. New balance: ${self.players[player_name]['balance']}"
     
     def set_bet(self, player_name: str, amount: int) -> Tuple[bool, str]:
@@ -105,7 +293,7 @@ class PlayerManager:
         if amount > player["balance"]:
             return False, f"Insufficient funds. Balance: ${player['balance']}, Bet: ${amount}"
         
-        player["current_bet"] = amount
+        self.update_player(player_name, current_bet=amount)
         return True, f"Bet set to ${amount} for {player_name}"
     
     def clear_bet(self, player_name: str) -> Tuple[bool, str]:
@@ -116,29 +304,18 @@ class PlayerManager:
         if player_name not in self.players:
             return False, f"Player '{player_name}' not found."
         
-        self.players[player_name]["current_bet"] = 0
+        self.update_player(player_name, current_bet=0)
         return True, f"Bet cleared for {player_name}"
     
     def update_player_outcome(self, player_name: str, outcome: str, value: Any) -> None:
         """
-        Update a player's last roll outcome and handle betting logic.
+        Record a player's last roll outcome.
+        Money only moves when the round is settled through SettlementLedger.settle_round.
         """
         if player_name not in self.players:
             return
         
-        player = self.players[player_name]
-        player["last_roll_outcome"] = outcome
-        player["point_value"] = value
-        
-        # Handle betting outcomes
-        if outcome == "Win":
-            player["balance"] += player["current_bet"]
-            player["current_bet"] = 0
-        elif outcome == "Lose":
-            player["balance"] -= player["current_bet"]
-            player["current_bet"] = 0
-            if player["balance"] <= 0:
-                player["is_out"] = True
+        self.update_player(player_name, last_roll_outcome=outcome, point_value=value)
     
     def get_next_player_name(self, current_player_name: str) -> Optional[str]:
         """
@@ -168,17 +345,20 @@ class PlayerManager:
         """
         Reset all players to initial state for a new game.
         """
-        for player_data in self.players.values():
-            player_data["current_bet"] = 0
-            player_data["last_roll_outcome"] = None
-            player_data["point_value"] = None
-            player_data["is_out"] = False 
+        with self.transaction():
+            for player_name in list(self.players):
+                self.update_player(player_name, current_bet=0, last_roll_outcome=None,
+                                   point_value=None, is_out=False)
     
-    def get_leaderboard(self) -> List[Tuple[str, int]]:
+    def get_leaderboard(self, top_k: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Return a sorted list of (player_name, rounds_won) tuples, best first.
+        Ties on rounds won are ordered by balance. Pass top_k to get only the best k.
+        """
+        return [(name, self.players[name]["rounds_won"]) for name in self.leaderboard.top(top_k)]
+
+    def get_player_rank(self, player_name: str) -> Optional[int]:
         """
-        Return a sorted list of (player_name, rounds_won) tuples.
+        Return the 1-based leaderboard position of a player, or None if not found.
         """
-        return sorted(
-            ((name, data["rounds_won"]) for name, data in self.players.items()),
-            key=lambda x: x[1], reverse=True
-        ) 
\ No newline at end of file
+        return self.leaderboard.rank(player_name) 
\ No newline at end of file
@@ -0,0 +1,223 @@
+import bisect
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import *
+from gui_components import setup_fonts
+
+
+class VirtualPlayerList(tk.Frame):
+    """
+    Scrollable player list that only draws the rows currently in view.
+
+    Rows are kept in sorted order and updated one player at a time from the
+    PlayerManager change feed, so large tables never rebuild the whole list.
+    """
+    SORT_KEYS = ("seat", "balance", "rounds_won")
+
+    def __init__(self, parent, player_manager: Any, visible_rows: int = 6, width: int = 420,
+                 row_height: int = 26, font_key: str = 'default_font',
+                 status_func: Optional[Callable[[str, Dict[str, Any]], Tuple[str, str]]] = None,
+                 **kwargs) -> None:
+        """
+        Args:
+            parent: The parent widget.
+            player_manager: The PlayerManager whose players are shown.
+            visible_rows (int): Number of rows visible without scrolling.
+            width (int): Width of the list in pixels.
+            row_height (int): Height of a single row in pixels.
+            font_key (str): Key into setup_fonts() for the row font.
+            status_func: Optional callable (name, player) -> (text, color) used to render a row.
+        """
+        super().__init__(parent, bg=COLOR_SECONDARY, **kwargs)
+        self.player_manager = player_manager
+        self.row_height = row_height
+        self.visible_rows = visible_rows
+        self.status_func = status_func or self._default_status
+        self.sort_key = "seat"
+        self.selected: Optional[str] = None
+        self._font = setup_fonts()[font_key]
+        self._seats: Dict[str, int] = {}
+        self._next_seat = 0
+        self._keys: Dict[str, tuple] = {}
+        self._order: List[Tuple[tuple, str]] = []
+        self._row_items: List[Tuple[int, int]] = []
+        self._redraw_pending = False
+
+        self.canvas = tk.Canvas(
+            self,
+            width=width,
+            height=visible_rows * row_height,
+            bg=COLOR_TEXT_LIGHT,
+            highlightthickness=0,
+            relief=tk.SUNKEN,
+            bd=2
+        )
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.canvas.config(yscrollcommand=self.scrollbar.set, yscrollincrement=row_height)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", lambda e: self._schedule_redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_units(1))
+        self.bind("<Destroy>", self._on_destroy)
+
+        for name in self.player_manager.get_all_players():
+            self._insert(name)
+        self.player_manager.subscribe_changes(self._on_player_changed)
+        self._schedule_redraw()
+
+    # --- Ordering -------------------------------------------------------
+
+    def _sort_tuple(self, name: str) -> tuple:
+        """Build the ordering key for a player under the current sort mode."""
+        player = self.player_manager.get_player(name)
+        seat = self._seats[name]
+        if self.sort_key == "balance":
+            return (-player["balance"], seat)
+        if self.sort_key == "rounds_won":
+            return (-player["rounds_won"], -player["balance"], seat)
+        return (seat,)
+
+    def _insert(self, name: str) -> int:
+        """Insert a player into the ordered rows and return its index."""
+        if name not in self._seats:
+            self._seats[name] = self._next_seat
+            self._next_seat += 1
+        key = self._sort_tuple(name)
+        self._keys[name] = key
+        entry = (key, name)
+        index = bisect.bisect_left(self._order, entry)
+        self._order.insert(index, entry)
+        return index
+
+    def _remove(self, name: str) -> Optional[int]:
+        """Remove a player from the ordered rows and return its old index."""
+        key = self._keys.pop(name, None)
+        if key is None:
+            return None
+        index = bisect.bisect_left(self._order, (key, name))
+        del self._order[index]
+        return index
+
+    def set_sort(self, sort_key: str) -> None:
+        """
+        Change the sort mode ("seat", "balance" or "rounds_won").
+        Re-sorts the row keys in place; no widgets are recreated.
+        """
+        if sort_key not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_key}")
+        self.sort_key = sort_key
+        self._keys = {name: self._sort_tuple(name) for name in self._keys}
+        self._order = sorted((key, name) for name, key in self._keys.items())
+        self._schedule_redraw()
+
+    def _on_player_changed(self, name: str, change: str) -> None:
+        """Apply a single change from the PlayerManager feed."""
+        if change == "remove":
+            self._remove(name)
+            self._seats.pop(name, None)
+            if self.selected == name:
+                self.selected = None
+            self._schedule_redraw()
+            return
+        if self.player_manager.get_player(name) is None:
+            return
+        if change == "update" and name in self._keys:
+            if self._sort_tuple(name) == self._keys[name]:
+                # Position unchanged: only its row text needs repainting, if visible
+                index = bisect.bisect_left(self._order, (self._keys[name], name))
+                if self._is_visible(index):
+                    self._schedule_redraw()
+                return
+            self._remove(name)
+        self._insert(name)
+        self._schedule_redraw()
+
+    # --- Rendering ------------------------------------------------------
+
+    def _first_visible_index(self) -> int:
+        return max(0, int(self.canvas.canvasy(0) // self.row_height))
+
+    def _visible_count(self) -> int:
+        height = max(self.canvas.winfo_height(), self.visible_rows * self.row_height)
+        return height // self.row_height + 1
+
+    def _is_visible(self, index: int) -> bool:
+        first = self._first_visible_index()
+        return first <= index < first + self._visible_count()
+
+    def _schedule_redraw(self) -> None:
+        """Coalesce redraw requests into a single idle callback."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def refresh(self) -> None:
+        """Repaint the visible rows (e.g. after a status that depends on other players changes)."""
+        self._schedule_redraw()
+
+    def _redraw(self) -> None:
+        """Draw the visible window of rows, reusing a fixed pool of canvas items."""
+        self._redraw_pending = False
+        if not self.winfo_exists():
+            return
+        total_height = len(self._order) * self.row_height
+        width = max(self.canvas.winfo_width(), int(self.canvas.cget("width")))
+        self.canvas.config(scrollregion=(0, 0, width, max(total_height, self.row_height)))
+        first = self._first_visible_index()
+        count = self._visible_count()
+        while len(self._row_items) < count:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, outline="", fill=COLOR_TEXT_LIGHT)
+            text = self.canvas.create_text(0, 0, anchor="w", font=self._font, fill=COLOR_TEXT_DARK)
+            self._row_items.append((rect, text))
+        for slot, (rect, text) in enumerate(self._row_items):
+            index = first + slot
+            if index >= len(self._order):
+                self.canvas.itemconfig(rect, state=tk.HIDDEN)
+                self.canvas.itemconfig(text, state=tk.HIDDEN)
+                continue
+            name = self._order[index][1]
+            player = self.player_manager.get_player(name)
+            label, color = self.status_func(name, player)
+            top = index * self.row_height
+            selected = name == self.selected
+            self.canvas.coords(rect, 0, top, width, top + self.row_height)
+            self.canvas.itemconfig(rect, state=tk.NORMAL, fill=COLOR_ACCENT if selected else COLOR_TEXT_LIGHT)
+            self.canvas.coords(text, 6, top + self.row_height // 2)
+            self.canvas.itemconfig(text, state=tk.NORMAL, text=label,
+                                   fill=COLOR_TEXT_LIGHT if selected else color)
+
+    @staticmethod
+    def _default_status(name: str, player: Dict[str, Any]) -> Tuple[str, str]:
+        status = " (OUT)" if player["is_out"] else ""
+        return f"{name}: ${player['balance']}{status}", COLOR_LOSE if player["is_out"] else COLOR_TEXT_DARK
+
+    # --- Interaction ----------------------------------------------------
+
+    def _on_scrollbar(self, *args) -> None:
+        self.canvas.yview(*args)
+        self._schedule_redraw()
+
+    def _scroll_units(self, units: int) -> None:
+        self.canvas.yview_scroll(units, "units")
+        self._schedule_redraw()
+
+    def _on_mousewheel(self, event) -> None:
+        self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _on_click(self, event) -> None:
+        index = int(self.canvas.canvasy(event.y) // self.row_height)
+        if 0 <= index < len(self._order):
+            self.selected = self._order[index][1]
+            self._schedule_redraw()
+
+    def get_selected(self) -> Optional[str]:
+        """Return the name of the selected player, or None."""
+        return self.selected
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self:
+            self.player_manager.unsubscribe_changes(self._on_player_changed)
@@ -0,0 +1,151 @@
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config import PROFILE_DB_FILE, PROFILE_FLUSH_INTERVAL_MS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    balance INTEGER NOT NULL,
+    rounds_won INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+)
+"""
+
+_UPSERT = """
+INSERT INTO profiles (name, balance, rounds_won, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET balance = excluded.balance, rounds_won = excluded.rounds_won,
+    updated_at = excluded.updated_at
+"""
+
+
+class ProfileStore:
+    """
+    Persistent player profiles (balance and rounds won) in SQLite, WAL mode.
+
+    Profiles are looked up by name (the primary key) only when a player joins,
+    never loaded in bulk. Changes arrive through the PlayerManager change feed
+    and are held in a write-behind cache; pending changes are written in one
+    transaction per flush, either when flush_interval_ms has passed since the
+    last flush or when max_pending players are dirty.
+    """
+    def __init__(self, path: str = PROFILE_DB_FILE, flush_interval_ms: int = PROFILE_FLUSH_INTERVAL_MS,
+                 max_pending: int = 500) -> None:
+        """
+        Args:
+            path (str): Database file (":memory:" for a throwaway store).
+            flush_interval_ms (int): Write pending changes at most this long after the last flush.
+            max_pending (int): Flush early once this many players have pending changes.
+        """
+        self.path = path
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._last_flush = time.monotonic()
+        self._player_manager: Any = None
+        self.flushes = 0
+
+    # --- Lookups ---------------------------------------------------------------
+
+    def get_profile(self, name: str) -> Optional[Dict[str, int]]:
+        """
+        Return {"balance", "rounds_won"} for a player, or None if they have no profile.
+        Pending (not yet flushed) changes take precedence over the database.
+        """
+        if name in self._pending:
+            balance, rounds_won = self._pending[name]
+            return {"balance": balance, "rounds_won": rounds_won}
+        row = self._conn.execute("SELECT balance, rounds_won FROM profiles WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return {"balance": row[0], "rounds_won": row[1]}
+
+    def restore_player(self, player_manager: Any, name: str) -> bool:
+        """
+        Load a returning player's profile into a seat that was just added.
+        The profile is applied through the command log; call this in the same
+        transaction as add_player so undo/redo treat the two as one step.
+        Returns True if a profile was found.
+        """
+        profile = self.get_profile(name)
+        if profile is None or name not in player_manager.players:
+            return False
+        player_manager.update_player(name, balance=profile["balance"], rounds_won=profile["rounds_won"],
+                                     is_out=profile["balance"] <= 0)
+        return True
+
+    # --- Write-behind cache -------------------------------------------------------
+
+    def attach(self, player_manager: Any) -> None:
+        """
+        Start recording changes from a PlayerManager's change feed.
+        """
+        self.detach()
+        self._player_manager = player_manager
+        player_manager.subscribe_changes(self._on_player_changed)
+
+    def detach(self) -> None:
+        """
+        Stop recording changes (pending changes are kept until the next flush).
+        """
+        if self._player_manager is not None:
+            self._player_manager.unsubscribe_changes(self._on_player_changed)
+            self._player_manager = None
+
+    def _on_player_changed(self, name: str, change: str) -> None:
+        if change == "remove":
+            return  # Leaving the table keeps the profile
+        if change == "add":
+            return  # A new seat holds defaults until restore_player loads the saved profile
+        player = self._player_manager.players.get(name)
+        if player is None:
+            return
+        self._pending[name] = (player["balance"], player["rounds_won"])
+        self.flush_if_due()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush_if_due(self) -> bool:
+        """
+        Flush if the interval has elapsed or too many changes are pending.
+        Returns True if a flush happened.
+        """
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.max_pending or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """
+        Write every pending change in a single transaction.
+        """
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        now = time.time()
+        rows = [(name, balance, rounds_won, now) for name, (balance, rounds_won) in self._pending.items()]
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        self._pending.clear()
+        self.flushes += 1
+
+    def close(self) -> None:
+        """
+        Flush pending changes and close the database.
+        """
+        if self._conn is None:
+            return
+        self.detach()
+        self.flush()
+        self._conn.close()
+        self._conn = None
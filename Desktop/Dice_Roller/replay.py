@@ -0,0 +1,168 @@
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+from config import DICE_SIDES, NUM_DICE, REMAINDER_POLICY
+from dice_logic import evaluate_roll, roll_single_die
+from ledger import SettlementLedger
+from player_manager import PlayerManager
+from round_manager import determine_winners
+
+SESSION_FORMAT_VERSION = 1
+
+
+class SessionRecorder:
+    """
+    Records a session as its seed, starting players and, per round, every
+    player's bet and every roll (including 'No Score' re-rolls).
+    A session with rolls replays exactly; one with only seed and bets replays
+    by re-drawing the dice from the seed.
+    """
+    def __init__(self) -> None:
+        self.session: Dict[str, Any] = {}
+        self._current: Optional[Dict[str, Any]] = None
+
+    def start(self, player_manager: Any, seed: int, remainder_policy: str = REMAINDER_POLICY) -> None:
+        """Begin a new recording from the current players."""
+        self.session = {
+            "version": SESSION_FORMAT_VERSION,
+            "seed": seed,
+            "remainder_policy": remainder_policy,
+            "players": {name: {"balance": p["balance"], "rounds_won": p["rounds_won"]}
+                        for name, p in player_manager.players.items()},
+            "rounds": [],
+        }
+        self._current = None
+
+    @property
+    def is_recording(self) -> bool:
+        return bool(self.session)
+
+    def begin_round(self, bets: Dict[str, int]) -> None:
+        """Start recording a round once all bets are in."""
+        if self.is_recording:
+            self._current = {"bets": dict(bets), "rolls": {name: [] for name in bets}}
+
+    def record_roll(self, player_name: str, rolls: List[int]) -> None:
+        """Record one roll of the round in progress."""
+        if self._current is not None:
+            self._current["rolls"].setdefault(player_name, []).append(list(rolls))
+
+    def end_round(self) -> None:
+        """Close the round in progress."""
+        if self._current is not None:
+            self.session["rounds"].append(self._current)
+            self._current = None
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.session, f)
+
+
+def load_session(path: str) -> Dict[str, Any]:
+    """
+    Load a recorded session from a JSON file.
+    """
+    with open(path) as f:
+        session = json.load(f)
+    if session.get("version") != SESSION_FORMAT_VERSION:
+        raise ValueError(f"Unsupported session format: {session.get('version')}")
+    return session
+
+
+class SessionReplayer:
+    """
+    Deterministically re-plays a recorded session without a GUI.
+
+    A state checkpoint (players, ledger and RNG) is kept every checkpoint_every
+    rounds, so jumping to any round restores the nearest earlier checkpoint and
+    only replays the rounds after it.
+    """
+    def __init__(self, session: Dict[str, Any], checkpoint_every: int = 25) -> None:
+        self.session = session
+        self.rounds: List[Dict[str, Any]] = session["rounds"]
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.player_manager = PlayerManager()
+        for name, data in session["players"].items():
+            self.player_manager.add_player(name)
+            self.player_manager.players[name].update(data)
+            self.player_manager.notify_player_changed(name)
+        self.ledger = SettlementLedger(session.get("remainder_policy", REMAINDER_POLICY))
+        self.rng = random.Random(session["seed"])
+        self.position = 0  # Number of rounds applied
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._checkpoints: Dict[int, Dict[str, Any]] = {0: self._snapshot()}
+
+    def __len__(self) -> int:
+        return len(self.rounds)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            "players": {name: dict(p) for name, p in self.player_manager.players.items()},
+            "carry_over": self.ledger.carry_over,
+            "house_total": self.ledger.house_total,
+            "rounds_settled": self.ledger.rounds_settled,
+            "rng": self.rng.getstate(),
+        }
+
+    def _restore(self, position: int) -> None:
+        snapshot = self._checkpoints[position]
+        for name, data in snapshot["players"].items():
+            self.player_manager.players[name].update(data)
+            self.player_manager.notify_player_changed(name)
+        self.ledger.carry_over = snapshot["carry_over"]
+        self.ledger.house_total = snapshot["house_total"]
+        self.ledger.rounds_settled = snapshot["rounds_settled"]
+        self.rng.setstate(snapshot["rng"])
+        self.position = position
+        self.last_result = None
+
+    def _roll(self, recorded: List[List[int]], index: int) -> List[int]:
+        if index < len(recorded):
+            return recorded[index]
+        return [roll_single_die(DICE_SIDES, self.rng) for _ in range(NUM_DICE)]
+
+    def step(self) -> Optional[Dict[str, Any]]:
+        """
+        Apply the next round. Returns its round_rolls, winners and settlement, or None at the end.
+        """
+        if self.position >= len(self.rounds):
+            return None
+        record = self.rounds[self.position]
+        pm = self.player_manager
+        round_rolls: Dict[str, Dict[str, Any]] = {}
+        for name, bet in record["bets"].items():
+            recorded = record.get("rolls", {}).get(name, [])
+            attempt = 0
+            while True:
+                rolls = self._roll(recorded, attempt)
+                outcome = evaluate_roll(rolls)
+                attempt += 1
+                if outcome["outcome"] != "No Score":
+                    break
+            pm.players[name]["last_roll_outcome"] = outcome["outcome"]
+            pm.players[name]["point_value"] = outcome["value"]
+            round_rolls[name] = {"rolls": rolls, "outcome": outcome["outcome"],
+                                 "value": outcome["value"], "bet": bet}
+        winners = determine_winners(round_rolls)
+        settlement = self.ledger.settle_round(pm, round_rolls, winners)
+        self.position += 1
+        if self.position % self.checkpoint_every == 0 and self.position not in self._checkpoints:
+            self._checkpoints[self.position] = self._snapshot()
+        self.last_result = {"round": self.position, "round_rolls": round_rolls,
+                            "winners": winners, "settlement": settlement}
+        return self.last_result
+
+    def seek(self, position: int) -> Optional[Dict[str, Any]]:
+        """
+        Jump to the state after `position` rounds, starting from the nearest checkpoint.
+        Returns the result of the last round applied, or None if no round had to be applied.
+        """
+        position = max(0, min(position, len(self.rounds)))
+        if position < self.position or position - self.position > self.checkpoint_every:
+            start = max(k for k in self._checkpoints if k <= position)
+            if start > self.position or position < self.position:
+                self._restore(start)
+        while self.position < position:
+            self.step()
+        return self.last_result
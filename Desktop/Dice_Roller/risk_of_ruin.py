@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Exact risk of ruin for one player at a Cee-lo table, from a Markov chain over balances.
+
+Each round the player stakes min(bet, balance) against `opponents` players who
+always bet the full amount, everybody rolls until the roll counts, and the best
+rank(s) split the pot (determine_winners / SettlementLedger.split_pot). The
+player's balance is then a Markov chain on 0..target: 0 is ruin, target (or
+more) is the player's exit, and every balance in between is transient. With Q
+the transient part of the transition matrix, the probabilities of ruin u and
+the expected rounds until the game ends t solve
+
+    (I - Q) u = r0        (I - Q) t = 1
+
+where r0 is the one-round probability of going broke. One solve gives the
+answers for every starting balance. scipy.sparse is used when installed,
+otherwise a dense numpy solve, otherwise a banded elimination in plain Python
+(a round moves the balance down by at most one bet and up by at most
+opponents * bet, so I - Q is banded).
+
+The chain follows one player, so a remainder carried over to the next pot
+("carry") is treated like the "house" policy: it leaves the player's hands.
+"""
+import argparse
+from math import comb
+from typing import Any, Dict, List, Optional
+
+from config import INITIAL_PLAYER_BALANCE, REMAINDER_POLICY
+from rules import get_active_rules
+
+# numpy and scipy are optional; without them the chain is solved in plain Python
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import spsolve
+    _scipy_available = True
+except ImportError:
+    _scipy_available = False
+
+SOLVERS = ("auto", "sparse", "dense", "python")
+
+
+def round_outcomes(opponents: int, rules: Any = None) -> Dict[int, float]:
+    """
+    How one round ends for the player against `opponents` rollers.
+    Args:
+        opponents (int): Number of other players in the round.
+        rules (Any): RuleSet to use (the active rules if None).
+    Returns:
+        Dict[int, float]: Number of winners sharing the pot (the player included) -> probability;
+        key 0 is the probability that the player does not win.
+    """
+    if opponents < 0:
+        raise ValueError("opponents must not be negative")
+    ranks = (rules or get_active_rules()).rank_probabilities()
+    outcomes = dict.fromkeys(range(opponents + 2), 0.0)
+    below = 0.0  # Probability that one roller ends below the current rank
+    for _, q in ranks:
+        # The player rolls this rank; j opponents tie it and the rest roll lower
+        for j in range(opponents + 1):
+            outcomes[j + 1] += q * comb(opponents, j) * q ** j * below ** (opponents - j)
+        below += q
+    outcomes[0] = max(0.0, 1.0 - sum(outcomes.values()))
+    return outcomes
+
+
+def transitions(balance: int, bet: int, opponents: int, target: int, outcomes: Dict[int, float],
+                remainder_policy: str = REMAINDER_POLICY, seat: int = 0, match_all_in: bool = False) -> Dict[int, float]:
+    """
+    One-round transition probabilities from a balance.
+    Args:
+        balance (int): The player's balance (1 <= balance < target).
+        bet (int): Bet per player; the player goes all-in when the balance is smaller.
+        opponents (int): Number of other players, each betting `bet`.
+        target (int): Balances at or above this are merged into one exit state.
+        outcomes (Dict[int, float]): round_outcomes(opponents).
+        remainder_policy (str): How a pot that does not split evenly is settled.
+        seat (int): Opponents seated before the player (matters for "first_seat").
+        match_all_in (bool): Opponents only match a short player's all-in, as when one flat bet
+            must be covered by everyone (the app's bets dialog); otherwise they bet `bet` as in play_round.
+    Returns:
+        Dict[int, float]: Next balance -> probability.
+    """
+    stake = min(bet, balance)
+    pot = stake + opponents * (stake if match_all_in else bet)
+    result: Dict[int, float] = {}
+    for winners, p in outcomes.items():
+        if not p:
+            continue
+        if winners == 0:
+            branches = [(balance - stake, p)]
+        else:
+            split, remainder = divmod(pot, winners)
+            first = 0.0
+            if remainder and remainder_policy == "first_seat":
+                # Chance that none of the tied opponents sits before the player
+                first = comb(opponents - seat, winners - 1) / comb(opponents, winners - 1)
+            base = balance - stake + split
+            branches = [(base, p * (1 - first)), (base + remainder, p * first)]
+        for nxt, q in branches:
+            if q:
+                nxt = min(nxt, target)
+                result[nxt] = result.get(nxt, 0.0) + q
+    return result
+
+
+def _solve_python(rows: List[Dict[int, float]], rhs: List[List[float]]) -> List[List[float]]:
+    """
+    Gaussian elimination on the banded system (I - Q) x = b, for each right-hand side.
+    I - Q is an M-matrix, so no pivoting is needed and no fill-in leaves the band.
+    """
+    n = len(rows)
+    a = [dict(row) for row in rows]
+    b = [list(values) for values in rhs]
+    band = max((i - j for i, row in enumerate(a) for j in row), default=0)  # Lower bandwidth
+    for p in range(n):
+        upper = [(j, value) for j, value in a[p].items() if j > p]
+        for i in range(p + 1, min(n, p + band + 1)):
+            if p not in a[i]:
+                continue
+            factor = a[i].pop(p) / a[p][p]
+            for j, value in upper:
+                a[i][j] = a[i].get(j, 0.0) - factor * value
+            for values in b:
+                values[i] -= factor * values[p]
+    x = [[0.0] * n for _ in b]
+    for i in range(n - 1, -1, -1):
+        upper = [(j, value) for j, value in a[i].items() if j > i]
+        for k, values in enumerate(b):
+            x[k][i] = (values[i] - sum(value * x[k][j] for j, value in upper)) / a[i][i]
+    return x
+
+
+def solve_chain(rows: List[Dict[int, float]], rhs: List[List[float]], solver: str = "auto") -> List[List[float]]:
+    """
+    Solve (I - Q) x = b for each right-hand side b.
+    Args:
+        rows (List[Dict[int, float]]): Sparse rows of I - Q (column -> value).
+        rhs (List[List[float]]): Right-hand sides, one list per system.
+        solver (str): "auto", "sparse" (scipy), "dense" (numpy) or "python".
+    Returns:
+        List[List[float]]: One solution per right-hand side.
+    """
+    if solver == "auto":
+        solver = "sparse" if _scipy_available else "dense" if _numpy_available else "python"
+    if solver == "python":
+        return _solve_python(rows, rhs)
+    if solver == "sparse" and not _scipy_available or solver == "dense" and not _numpy_available:
+        raise RuntimeError(f"The {solver} solver needs {'scipy' if solver == 'sparse' else 'numpy'}")
+    n = len(rows)
+    r = [i for i, row in enumerate(rows) for _ in row]
+    c = [j for row in rows for j in row]
+    v = [value for row in rows for value in row.values()]
+    b = np.array(rhs).T
+    if solver == "sparse":
+        x = spsolve(csr_matrix((v, (r, c)), shape=(n, n)), b)
+    else:
+        a = np.zeros((n, n))
+        np.add.at(a, (r, c), v)
+        x = np.linalg.solve(a, b)
+    return np.asarray(x).reshape(n, len(rhs)).T.tolist()
+
+
+def risk_of_ruin(balance: int = INITIAL_PLAYER_BALANCE, bet: int = 10, opponents: int = 3,
+                 target: Optional[int] = None, rules: Any = None, remainder_policy: str = REMAINDER_POLICY,
+                 seat: int = 0, solver: str = "auto", match_all_in: bool = False) -> Dict[str, Any]:
+    """
+    Probability of going broke before reaching a target balance, and the expected game length.
+    Args:
+        balance (int): Starting balance.
+        bet (int): Bet per round.
+        opponents (int): Number of other players, each with enough money to always bet `bet`.
+        target (Optional[int]): Balance at which the player stops; defaults to the whole
+            table's starting money, (opponents + 1) * INITIAL_PLAYER_BALANCE.
+        rules (Any): RuleSet to use (the active rules if None).
+        remainder_policy (str): "first_seat", "house" or "carry" (see the module docstring).
+        seat (int): Opponents seated before the player.
+        solver (str): "auto", "sparse" (scipy), "dense" (numpy) or "python".
+        match_all_in (bool): Opponents only match a short player's all-in (see transitions).
+    Returns:
+        Dict[str, Any]: ruin_probability, target_probability and expected_rounds from `balance`,
+        plus ruin_by_balance and rounds_by_balance for every balance 0..target.
+    """
+    if target is None:
+        target = (opponents + 1) * INITIAL_PLAYER_BALANCE
+    if bet < 1:
+        raise ValueError("bet must be at least 1")
+    if opponents < 1:
+        raise ValueError("opponents must be at least 1")
+    if not 0 <= seat <= opponents:
+        raise ValueError("seat must be between 0 and opponents")
+    if balance < 0 or target < 2:
+        raise ValueError("balance must not be negative and target must be at least 2")
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver: {solver}")
+    outcomes = round_outcomes(opponents, rules)
+    n = target - 1  # Transient balances 1..target-1 are rows 0..n-1
+    rows: List[Dict[int, float]] = []
+    ruin_rhs = [0.0] * n
+    for b in range(1, target):
+        row = {b - 1: 1.0}
+        for nxt, p in transitions(b, bet, opponents, target, outcomes, remainder_policy, seat, match_all_in).items():
+            if nxt == 0:
+                ruin_rhs[b - 1] += p
+            elif nxt < target:
+                row[nxt - 1] = row.get(nxt - 1, 0.0) - p
+        rows.append(row)
+    ruin, rounds = solve_chain(rows, [ruin_rhs, [1.0] * n], solver)
+    ruin_by_balance = [1.0] + ruin + [0.0]
+    rounds_by_balance = [0.0] + rounds + [0.0]
+    start = min(balance, target)
+    return {"balance": balance, "bet": bet, "opponents": opponents, "target": target,
+            "ruin_probability": ruin_by_balance[start], "target_probability": 1 - ruin_by_balance[start],
+            "expected_rounds": rounds_by_balance[start],
+            "ruin_by_balance": ruin_by_balance, "rounds_by_balance": rounds_by_balance}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exact Cee-lo risk of ruin.")
+    parser.add_argument("--balance", type=int, default=INITIAL_PLAYER_BALANCE)
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--opponents", type=int, default=3)
+    parser.add_argument("--target", type=int, default=None)
+    parser.add_argument("--remainder-policy", default=REMAINDER_POLICY, choices=("carry", "house", "first_seat"))
+    parser.add_argument("--seat", type=int, default=0)
+    parser.add_argument("--solver", default="auto", choices=SOLVERS)
+    parser.add_argument("--match-all-in", action="store_true", help="Opponents only match a short player's all-in")
+    args = parser.parse_args()
+    result = risk_of_ruin(args.balance, args.bet, args.opponents, args.target, remainder_policy=args.remainder_policy,
+                          seat=args.seat, solver=args.solver, match_all_in=args.match_all_in)
+    print(f"Balance {result['balance']}, bet {result['bet']}, {result['opponents']} opponent(s), "
+          f"target {result['target']}")
+    print(f"  Risk of ruin:      {result['ruin_probability']:.6f}")
+    print(f"  Reach target:      {result['target_probability']:.6f}")
+    print(f"  Expected rounds:   {result['expected_rounds']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
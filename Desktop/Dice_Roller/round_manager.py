@@ -1,4 +1,14 @@
 from typing import Dict, List, Tuple, Any
+from config import BATCH_SETTLE_MIN_SEATS, DICE_SIDES, NUM_DICE
+from dice_logic import evaluate_roll, roll_single_die
+from rules import RANK_BASE, RuleSet, encode_rank, get_active_rules
+
+# numpy is optional; without it the batch settlement path falls back to plain Python
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
 
 
 def ceelo_rank(outcome: str, value: Any) -> Tuple[int, int]:
@@ -10,6 +20,10 @@ def ceelo_rank(outcome: str, value: Any) -> Tuple[int, int]:
     Returns:
         Tuple[int, int]: A tuple representing the rank (higher is better).
     """
+    rank = get_active_rules().rank_of(outcome, value)
+    if rank is not None:
+        return rank
+    # Outcomes the active rule set never produces: fall back to parsing the value
     if outcome == "Win":
         if value == "4-5-6 (Cee-lo!)":
             return (4, 6)  # Highest
@@ -39,11 +53,20 @@ def determine_winners(round_rolls: Dict[str, Dict[str, Any]]) -> List[str]:
         round_rolls (Dict[str, Dict[str, Any]]): Player roll/outcome data for the round.
     Returns:
         List[str]: List of winner player names.
+    Large rounds (BATCH_SETTLE_MIN_SEATS seats or more) are ranked from their dice with rank_rolls_batch.
     """
+    if len(round_rolls) >= BATCH_SETTLE_MIN_SEATS and all(
+            "rolls" in info and "rank" not in info for info in round_rolls.values()):
+        names = list(round_rolls)
+        ranks = rank_rolls_batch([round_rolls[name]["rolls"] for name in names])
+        if _numpy_available:
+            return [names[i] for i in np.flatnonzero(ranks == ranks.max())]
+        best = max(ranks)
+        return [name for name, rank in zip(names, ranks) if rank == best]
     best_rank = (-2, 0)
     winners: List[str] = []
     for player, info in round_rolls.items():
-        rank = ceelo_rank(info["outcome"], info["value"])
+        rank = info.get("rank") or ceelo_rank(info["outcome"], info["value"])
         if rank > best_rank:
             best_rank = rank
             winners = [player]
@@ -52,22 +75,154 @@ def determine_winners(round_rolls: Dict[str, Dict[str, Any]]) -> List[str]:
     return winners
 
 
-def split_pot_among_winners(round_rolls: Dict[str, Dict[str, Any]], winners: List[str], player_manager: Any) -> None:
+def split_pot_among_winners(round_rolls: Dict[str, Dict[str, Any]], winners: List[str], player_manager: Any,
+                            ledger: Any = None) -> None:
     """
     Split the pot among winners and update player balances. Assumes player_manager.players is accessible.
+    Bets are not deducted here; use SettlementLedger.settle_round for a full settlement.
     Args:
         round_rolls (Dict[str, Dict[str, Any]]): Player roll/outcome data for the round.
         winners (List[str]): List of winner player names.
         player_manager (Any): The player manager instance (must have .players dict).
+        ledger (Any): Optional SettlementLedger deciding where the remainder of a tied pot goes.
+            Defaults to giving it to the first winner, so no money is lost.
     Returns:
         None
     """
+    from ledger import SettlementLedger
+    if ledger is None:
+        ledger = SettlementLedger("first_seat")
     pot = sum(info["bet"] for info in round_rolls.values())
-    if len(winners) == 1:
-        player_manager.players[winners[0]]["balance"] += pot
-        player_manager.players[winners[0]]["rounds_won"] += 1
-    else:
-        split = pot // len(winners)
+    for w, amount in ledger.split_pot(pot, winners).items():
+        player_manager.players[w]["balance"] += amount
+        player_manager.players[w]["rounds_won"] += 1
+    notify = getattr(player_manager, "notify_player_changed", None)
+    if notify is not None:
         for w in winners:
-            player_manager.players[w]["balance"] += split
-            player_manager.players[w]["rounds_won"] += 1 
\ No newline at end of file
+            notify(w)
+
+
+_rank_table_cache: Dict[Tuple[Tuple[str, Any], ...], RuleSet] = {}
+
+
+def get_rank_table(num_dice: int = NUM_DICE, sides: int = DICE_SIDES) -> Any:
+    """
+    Return the packed rank (see rules.encode_rank) of every possible roll under the
+    active house rules, indexed by the roll's base-`sides` code
+    (sum of (die - 1) * sides ** position).
+    """
+    rules = get_active_rules()
+    if (rules.num_dice, rules.sides) == (num_dice, sides):
+        return rules.rank_codes
+    spec = dict(rules.to_spec(), num_dice=num_dice, sides=sides)
+    key = tuple(sorted(spec.items()))
+    if key not in _rank_table_cache:
+        _rank_table_cache[key] = RuleSet.from_spec(spec)
+    return _rank_table_cache[key].rank_codes
+
+
+def rank_rolls_batch(dice: Any, sides: int = DICE_SIDES) -> Any:
+    """
+    Rank many rolls at once by table lookup.
+    Args:
+        dice (Any): A (count, num_dice) array or list of rolls.
+        sides (int): Number of sides on each die.
+    Returns:
+        Any: Packed ranks (numpy int16 array, or list of int without numpy).
+    """
+    if _numpy_available:
+        dice = np.asarray(dice)
+        weights = sides ** np.arange(dice.shape[1], dtype=np.int64)
+        codes = (dice.astype(np.int64) - 1) @ weights
+        return get_rank_table(dice.shape[1], sides)[codes]
+    ranks = []
+    for roll in dice:
+        table = get_rank_table(len(roll), sides)
+        code = 0
+        for position, die in enumerate(roll):
+            code += (die - 1) * sides ** position
+        ranks.append(table[code])
+    return ranks
+
+
+def settle_round_batch(ranks: Any, bets: Any, balances: Any, extra_pot: int = 0) -> Dict[str, Any]:
+    """
+    Settle a whole round in one pass: every player pays their bet into the pot and the
+    best rank(s) split it, using the same semantics as determine_winners and
+    split_pot_among_winners.
+    Args:
+        ranks (Any): Packed rank per seat (see encode_rank / rank_rolls_batch).
+        bets (Any): Bet per seat.
+        balances (Any): Balance per seat before settlement.
+        extra_pot (int): Amount already in the pot (e.g. carried over from an earlier round).
+    Returns:
+        Dict[str, Any]: winner_mask, pot, split, remainder and the new balances.
+    """
+    if _numpy_available:
+        ranks = np.asarray(ranks)
+        bets = np.asarray(bets, dtype=np.int64)
+        balances = np.asarray(balances, dtype=np.int64)
+        if ranks.size == 0:
+            return {"winner_mask": np.zeros(0, dtype=bool), "pot": extra_pot, "split": 0,
+                    "remainder": extra_pot, "balances": balances.copy()}
+        winner_mask = ranks == ranks.max()
+        pot = int(bets.sum()) + extra_pot
+        num_winners = int(winner_mask.sum())
+        split, remainder = divmod(pot, num_winners)
+        new_balances = balances - bets + winner_mask * split
+        return {"winner_mask": winner_mask, "pot": pot, "split": split,
+                "remainder": remainder, "balances": new_balances}
+    ranks = list(ranks)
+    if not ranks:
+        return {"winner_mask": [], "pot": extra_pot, "split": 0, "remainder": extra_pot, "balances": list(balances)}
+    best = max(ranks)
+    winner_mask = [rank == best for rank in ranks]
+    pot = sum(bets) + extra_pot
+    split, remainder = divmod(pot, winner_mask.count(True))
+    new_balances = [balance - bet + (split if won else 0)
+                    for balance, bet, won in zip(balances, bets, winner_mask)]
+    return {"winner_mask": winner_mask, "pot": pot, "split": split,
+            "remainder": remainder, "balances": new_balances}
+
+
+def play_round(player_manager: Any, bet: int, ledger: Any = None, rng: Any = None,
+               max_rerolls: int = 1000, stats: Any = None) -> Dict[str, Any]:
+    """
+    Play one full round without a GUI, following the same flow as the app:
+    every player with money bets, rolls in seat order (re-rolling on 'No Score'),
+    then the best roll(s) take the pot.
+    Players who cannot cover the bet go all-in with their remaining balance.
+    Args:
+        player_manager (Any): The PlayerManager for the table.
+        bet (int): Bet per player.
+        ledger (Any): SettlementLedger to settle through (a first-seat ledger if None).
+        rng (Any): Optional random.Random instance for reproducible rolls.
+        max_rerolls (int): Safety cap on 'No Score' re-rolls per player.
+        stats (Any): Optional stats.GameStats that records every roll and the winning seats.
+    Returns:
+        Dict[str, Any]: round_rolls, winners and the settlement result.
+    """
+    from ledger import SettlementLedger
+    if ledger is None:
+        ledger = SettlementLedger("first_seat")
+    round_rolls: Dict[str, Dict[str, Any]] = {}
+    for name in player_manager.get_players_with_balance():
+        player = player_manager.players[name]
+        amount = min(bet, player["balance"])
+        for _ in range(max_rerolls):
+            rolls = [roll_single_die(DICE_SIDES, rng) for _ in range(NUM_DICE)]
+            outcome = evaluate_roll(rolls)
+            if stats is not None:
+                stats.record_roll(rolls, outcome)
+            if outcome["outcome"] != "No Score":
+                break
+        player["last_roll_outcome"] = outcome["outcome"]
+        player["point_value"] = outcome["value"]
+        round_rolls[name] = {"rolls": rolls, "outcome": outcome["outcome"],
+                             "value": outcome["value"], "bet": amount}
+    winners = determine_winners(round_rolls)
+    settlement = ledger.settle_round(player_manager, round_rolls, winners)
+    if stats is not None:
+        seats = list(player_manager.players)
+        stats.record_round(seats.index(w) for w in winners)
+    return {"round_rolls": round_rolls, "winners": winners, "settlement": settlement}
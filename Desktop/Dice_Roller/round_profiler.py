@@ -0,0 +1,92 @@
+"""
+On-demand profiling of a running table for a fixed number of rounds.
+
+Operators start it from Tools > Profile Next N Rounds...; cProfile is enabled
+on the Tk thread (where every callback runs) and switched off after the Nth
+round ends. The raw stats are written to a .prof file for offline analysis
+(python -m pstats, snakeviz) and the top functions are shown in the app.
+"""
+import cProfile
+import io
+import pstats
+import time
+from typing import Optional
+
+
+class RoundProfiler:
+    """
+    Profiles everything the UI thread does until a number of rounds have ended.
+    """
+    def __init__(self) -> None:
+        self._profile: Optional[cProfile.Profile] = None
+        self.remaining = 0
+        self.rounds = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self.stats_path: Optional[str] = None
+        self._stats: Optional[pstats.Stats] = None
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self, rounds: int) -> None:
+        """
+        Start profiling; it stops by itself after `rounds` calls to on_round_end.
+        """
+        if rounds < 1:
+            raise ValueError("rounds must be at least 1")
+        if self.active:
+            raise RuntimeError("A profile is already running")
+        self.remaining = self.rounds = rounds
+        self.stats_path = None
+        self._stats = None
+        self.started_at = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def on_round_end(self, stats_path: Optional[str] = None) -> bool:
+        """
+        Count a finished round. After the last one, stop and save the stats.
+        Args:
+            stats_path (Optional[str]): Where to save the raw stats (timestamped file in the working directory if None).
+        Returns:
+            bool: True if this round completed the profile.
+        """
+        if not self.active:
+            return False
+        self.remaining -= 1
+        if self.remaining > 0:
+            return False
+        self.stop(stats_path)
+        return True
+
+    def stop(self, stats_path: Optional[str] = None) -> Optional[str]:
+        """
+        Stop profiling early or on schedule and save the raw stats.
+        Returns:
+            Optional[str]: The .prof file written (None if no profile was running).
+        """
+        if not self.active:
+            return None
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self.started_at
+        self.rounds -= self.remaining
+        self.remaining = 0
+        self.stats_path = stats_path or time.strftime("round_profile_%Y%m%d-%H%M%S.prof")
+        self._profile.dump_stats(self.stats_path)
+        self._stats = pstats.Stats(self._profile)
+        self._profile = None
+        return self.stats_path
+
+    def top_functions(self, limit: int = 25, sort: str = "cumulative") -> str:
+        """
+        Format the top functions of the last completed profile (pstats layout).
+        """
+        if self._stats is None:
+            return "No profile has been captured yet."
+        out = io.StringIO()
+        self._stats.stream = out
+        self._stats.sort_stats(sort).print_stats(limit)
+        header = f"{self.rounds} round(s) in {self.elapsed:.2f}s; raw stats saved to {self.stats_path}\n"
+        return header + out.getvalue()
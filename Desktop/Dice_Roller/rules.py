@@ -0,0 +1,223 @@
+import itertools
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from config import DICE_SIDES, NUM_DICE, HOUSE_RULES
+
+# numpy is optional; it only provides the array form of the rank table for batch ranking
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+# Ranks are packed into single integers (major * RANK_BASE + minor) for table lookups.
+# Minor values go up to DICE_SIDES + 1 (a high "ace" point), hence the + 2.
+RANK_BASE = DICE_SIDES + 2
+
+# Outcome values shared by every rule set (the GUI matches on these strings)
+VALUE_LOW_STRAIGHT = "1-2-3 (Automatic Loss)"
+VALUE_CEELO = "4-5-6 (Cee-lo!)"
+VALUE_NO_SCORE = "No point established"
+
+
+def encode_rank(rank: Tuple[int, int]) -> int:
+    """
+    Pack a (major, minor) rank tuple into one integer that sorts the same way.
+    """
+    return rank[0] * RANK_BASE + rank[1]
+
+
+def _orderings(roll: Tuple[int, ...]) -> int:
+    """Number of ordered rolls that sort to this combination."""
+    ways = math.factorial(len(roll))
+    for count in Counter(roll).values():
+        ways //= math.factorial(count)
+    return ways
+
+
+class RuleSet:
+    """
+    A declarative Cee-lo house rule set, compiled once into lookup tables.
+
+    Every possible roll (as a sorted tuple) maps to its outcome dictionary and
+    rank, so evaluating or ranking a roll at the table is a single dict lookup.
+    """
+    def __init__(self, name: str = "standard", low_straight_loses: bool = True,
+                 high_straight_wins: bool = True, trips_win: bool = True,
+                 trips_beat_high_straight: bool = False, ace_point_high: bool = False,
+                 num_dice: int = NUM_DICE, sides: int = DICE_SIDES) -> None:
+        """
+        Args:
+            name (str): Name of the variant.
+            low_straight_loses (bool): 1-2-3 is an automatic loss (otherwise it is No Score).
+            high_straight_wins (bool): 4-5-6 is an automatic win (otherwise it is No Score).
+            trips_win (bool): Three of a kind is an automatic win (otherwise it is No Score).
+            trips_beat_high_straight (bool): Trips outrank 4-5-6.
+            ace_point_high (bool): A point of 1 ranks above a point of 6.
+            num_dice (int): Dice per roll.
+            sides (int): Sides per die.
+        """
+        self.name = name
+        self.low_straight_loses = low_straight_loses
+        self.high_straight_wins = high_straight_wins
+        self.trips_win = trips_win
+        self.trips_beat_high_straight = trips_beat_high_straight
+        self.ace_point_high = ace_point_high
+        self.num_dice = num_dice
+        self.sides = sides
+        self._compile()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "RuleSet":
+        """
+        Build a rule set from a plain dictionary, e.g. loaded from JSON.
+        """
+        return cls(**spec)
+
+    def to_spec(self) -> Dict[str, Any]:
+        """
+        Return the declarative spec this rule set was compiled from.
+        """
+        return {
+            "name": self.name,
+            "low_straight_loses": self.low_straight_loses,
+            "high_straight_wins": self.high_straight_wins,
+            "trips_win": self.trips_win,
+            "trips_beat_high_straight": self.trips_beat_high_straight,
+            "ace_point_high": self.ace_point_high,
+            "num_dice": self.num_dice,
+            "sides": self.sides,
+        }
+
+    def _classify(self, roll: Tuple[int, ...]) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """Apply the rule spec to one sorted roll. Only used while compiling."""
+        counts = Counter(roll)
+        if list(roll) == [1, 2, 3] and self.low_straight_loses:
+            return {"outcome": "Lose", "value": VALUE_LOW_STRAIGHT}, (-1, 0)
+        if list(roll) == [4, 5, 6] and self.high_straight_wins:
+            return {"outcome": "Win", "value": VALUE_CEELO}, (4, 6)
+        if len(counts) == 1 and self.trips_win:
+            face = roll[0]
+            major = 5 if self.trips_beat_high_straight else 3
+            return {"outcome": "Win", "value": f"Trips! ({face}-{face}-{face})"}, (major, face)
+        if len(counts) == 2:
+            for face, count in counts.items():
+                if count == 1:
+                    minor = self.sides + 1 if (face == 1 and self.ace_point_high) else face
+                    return {"outcome": "Point", "value": face}, (1, minor)
+        return {"outcome": "No Score", "value": VALUE_NO_SCORE}, (0, 0)
+
+    def _compile(self) -> None:
+        """Build the roll -> outcome/rank tables and the outcome -> rank table."""
+        self._outcomes: Dict[Tuple[int, ...], Dict[str, Any]] = {}
+        self._ranks: Dict[Tuple[int, ...], Tuple[int, int]] = {}
+        self._rank_by_result: Dict[Tuple[str, Any], Tuple[int, int]] = {}
+        self._theoretical: Optional[Dict[str, Dict[Any, float]]] = None
+        self._rank_probabilities: Optional[List[Tuple[Tuple[int, int], float]]] = None
+        faces = range(1, self.sides + 1)
+        for roll in itertools.combinations_with_replacement(faces, self.num_dice):
+            outcome, rank = self._classify(roll)
+            self._outcomes[roll] = outcome
+            self._ranks[roll] = rank
+            self._rank_by_result[(outcome["outcome"], outcome["value"])] = rank
+        # Rank of every ordered roll, indexed by sum((die - 1) * sides ** position)
+        codes = []
+        for combo in itertools.product(faces, repeat=self.num_dice):
+            codes.append(encode_rank(self._ranks[tuple(sorted(combo))]))
+        self.rank_codes: Any = np.array(codes, dtype=np.int16) if _numpy_available else codes
+
+    def theoretical_frequencies(self) -> Dict[str, Dict[Any, float]]:
+        """
+        Exact probabilities of each outcome category and point value for fair dice,
+        and the share of each face among all dice rolled.
+        Returns:
+            Dict[str, Dict[Any, float]]: {"outcomes": {...}, "points": {...}, "faces": {...}}.
+        """
+        if self._theoretical is None:
+            total = self.sides ** self.num_dice
+            outcomes: Dict[str, float] = {}
+            points: Dict[Any, float] = {}
+            for roll, outcome in self._outcomes.items():
+                p = _orderings(roll) / total
+                outcomes[outcome["outcome"]] = outcomes.get(outcome["outcome"], 0.0) + p
+                if outcome["outcome"] == "Point":
+                    points[outcome["value"]] = points.get(outcome["value"], 0.0) + p
+            self._theoretical = {"outcomes": outcomes, "points": dict(sorted(points.items())),
+                                 "faces": {face: 1 / self.sides for face in range(1, self.sides + 1)}}
+        return self._theoretical
+
+    def rank_probabilities(self) -> List[Tuple[Tuple[int, int], float]]:
+        """
+        Distribution of a player's final rank for fair dice, with 'No Score' re-rolled
+        until the roll counts (as at the table).
+        Returns:
+            List[Tuple[Tuple[int, int], float]]: (rank, probability) pairs, lowest rank first.
+        """
+        if self._rank_probabilities is None:
+            weights: Dict[Tuple[int, int], int] = {}
+            for roll, outcome in self._outcomes.items():
+                if outcome["outcome"] != "No Score":
+                    rank = self._ranks[roll]
+                    weights[rank] = weights.get(rank, 0) + _orderings(roll)
+            total = sum(weights.values())
+            self._rank_probabilities = [(rank, weights[rank] / total) for rank in sorted(weights)]
+        return self._rank_probabilities
+
+    def evaluate(self, rolls: List[int]) -> Dict[str, Any]:
+        """
+        Return the outcome dictionary for a roll.
+        """
+        outcome = self._outcomes.get(tuple(sorted(rolls)))
+        if outcome is None:
+            # Not a roll this rule set was compiled for (wrong dice count or faces)
+            outcome, _ = self._classify(tuple(sorted(rolls)))
+        return dict(outcome)
+
+    def rank(self, rolls: List[int]) -> Tuple[int, int]:
+        """
+        Return the rank tuple for a roll (higher is better).
+        """
+        rank = self._ranks.get(tuple(sorted(rolls)))
+        if rank is None:
+            _, rank = self._classify(tuple(sorted(rolls)))
+        return rank
+
+    def rank_of(self, outcome: str, value: Any) -> Optional[Tuple[int, int]]:
+        """
+        Return the rank for an (outcome, value) pair produced by this rule set, or None.
+        """
+        try:
+            return self._rank_by_result.get((outcome, value))
+        except TypeError:  # unhashable value
+            return None
+
+
+RULE_VARIANTS: Dict[str, RuleSet] = {
+    "standard": RuleSet("standard"),
+    "trips_high": RuleSet("trips_high", trips_beat_high_straight=True),
+    "no_auto_loss": RuleSet("no_auto_loss", low_straight_loses=False),
+    "ace_point": RuleSet("ace_point", ace_point_high=True),
+}
+
+_active_rules: RuleSet = RULE_VARIANTS.get(HOUSE_RULES, RULE_VARIANTS["standard"])
+
+
+def get_active_rules() -> RuleSet:
+    """
+    Return the rule set used by evaluate_roll, ceelo_rank and batch ranking.
+    """
+    return _active_rules
+
+
+def set_active_rules(rules: Any) -> RuleSet:
+    """
+    Select the active rule set by variant name or RuleSet instance.
+    """
+    global _active_rules
+    if isinstance(rules, str):
+        if rules not in RULE_VARIANTS:
+            raise ValueError(f"Unknown rule variant: {rules}")
+        rules = RULE_VARIANTS[rules]
+    _active_rules = rules
+    return _active_rules
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Shared-memory result aggregation for multi-process simulations.
+
+The parent allocates one block of int64 counters with a slot per worker. Each
+worker attaches to the block by name and increments counters in its own slot
+while it plays (outcome categories, die faces, wins per seat, game lengths and
+a final-balance histogram), so nothing is pickled per game or per round. When
+the workers finish, the parent sums the slots in place.
+"""
+import argparse
+import random
+import time
+from multiprocessing import Pool, shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import DICE_SIDES, INITIAL_PLAYER_BALANCE, REMAINDER_POLICY
+from simulation import game_seed, play_game
+from stats import OUTCOME_CATEGORIES
+
+# numpy is optional; it only speeds up the parent's reduction
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+_OUTCOME_INDEX = {category: i for i, category in enumerate(OUTCOME_CATEGORIES)}
+
+
+def slot_layout(max_seats: int, balance_high: int, buckets: int, sides: int = DICE_SIDES) -> Dict[str, Any]:
+    """
+    Describe one worker slot: field name -> (offset, length) in int64 counters.
+    Histogram fields have underflow/overflow counters at the end.
+    """
+    fields = [("games", 1), ("rounds", 1), ("rounds_sq", 1), ("rolls", 1),
+              ("outcomes", len(OUTCOME_CATEGORIES)), ("faces", sides),
+              ("wins_by_seat", max_seats), ("balance_hist", buckets + 2)]
+    layout: Dict[str, Any] = {"balance_high": balance_high, "buckets": buckets, "fields": {}}
+    offset = 0
+    for name, length in fields:
+        layout["fields"][name] = (offset, length)
+        offset += length
+    layout["slot_size"] = offset
+    return layout
+
+
+class SlotWriter:
+    """
+    A worker's view of its own slot. Implements the record_roll/record_round/
+    record_game interface of stats.GameStats, so it can be passed as the stats
+    argument of play_round and simulation.play_game.
+    """
+    def __init__(self, shm_name: str, layout: Dict[str, Any], slot: int) -> None:
+        self._shm = shared_memory.SharedMemory(name=shm_name)
+        self._counters = self._shm.buf.cast("q")
+        base = slot * layout["slot_size"]
+        fields = layout["fields"]
+        self._games = base + fields["games"][0]
+        self._rounds = base + fields["rounds"][0]
+        self._rounds_sq = base + fields["rounds_sq"][0]
+        self._rolls = base + fields["rolls"][0]
+        self._outcomes = base + fields["outcomes"][0]
+        self._faces = base + fields["faces"][0] - 1  # faces start at 1
+        self._wins = base + fields["wins_by_seat"][0]
+        self._max_seats = fields["wins_by_seat"][1]
+        self._hist = base + fields["balance_hist"][0]
+        self._buckets = layout["buckets"]
+        self._width = layout["balance_high"] / layout["buckets"]
+
+    def record_roll(self, rolls: Iterable[int], outcome: Dict[str, Any]) -> None:
+        c = self._counters
+        c[self._rolls] += 1
+        c[self._outcomes + _OUTCOME_INDEX[outcome["outcome"]]] += 1
+        for face in rolls:
+            c[self._faces + face] += 1
+
+    def record_round(self, winner_seats: Iterable[int]) -> None:
+        c = self._counters
+        for seat in winner_seats:
+            if seat < self._max_seats:
+                c[self._wins + seat] += 1
+
+    def record_game(self, rounds: int, final_balances: Iterable[int]) -> None:
+        c = self._counters
+        c[self._games] += 1
+        c[self._rounds] += rounds
+        c[self._rounds_sq] += rounds * rounds
+        for balance in final_balances:
+            if balance < 0:
+                bucket = self._buckets  # underflow
+            else:
+                bucket = int(balance / self._width)
+                bucket = self._buckets + 1 if bucket >= self._buckets else bucket  # overflow
+            c[self._hist + bucket] += 1
+
+    def close(self) -> None:
+        self._counters.release()
+        self._shm.close()
+
+
+class SharedAggregator:
+    """
+    Owns the shared counter block. Create it in the parent, hand (name, layout, slot)
+    to each worker, then call reduce() once the workers are done and close() at the end.
+    """
+    def __init__(self, num_slots: int, max_seats: int = 8,
+                 balance_high: int = 8 * INITIAL_PLAYER_BALANCE, buckets: int = 50) -> None:
+        self.num_slots = num_slots
+        self.layout = slot_layout(max_seats, balance_high, buckets)
+        nbytes = max(1, num_slots * self.layout["slot_size"]) * 8
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._shm.buf[:nbytes] = bytes(nbytes)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __enter__(self) -> "SharedAggregator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _sum_slots(self) -> List[int]:
+        size = self.layout["slot_size"]
+        if _numpy_available:
+            block = np.ndarray((self.num_slots, size), dtype=np.int64, buffer=self._shm.buf)
+            totals = block.sum(axis=0).tolist()
+            del block  # Release the buffer export so the block can be closed
+            return totals
+        counters = self._shm.buf.cast("q")
+        try:
+            return [sum(counters[slot * size + i] for slot in range(self.num_slots)) for i in range(size)]
+        finally:
+            counters.release()
+
+    def reduce(self) -> Dict[str, Any]:
+        """
+        Sum every worker slot into one result.
+        Returns:
+            Dict[str, Any]: games, rounds mean/stddev, rolls, outcomes, faces, wins_by_seat
+            and the balance histogram (counts, underflow, overflow, edges).
+        """
+        totals = self._sum_slots()
+        fields = self.layout["fields"]
+
+        def field(name: str) -> List[int]:
+            offset, length = fields[name]
+            return totals[offset:offset + length]
+
+        games = field("games")[0]
+        rounds, rounds_sq = field("rounds")[0], field("rounds_sq")[0]
+        mean = rounds / games if games else 0.0
+        variance = (rounds_sq - games * mean * mean) / (games - 1) if games > 1 else 0.0
+        hist = field("balance_hist")
+        buckets, high = self.layout["buckets"], self.layout["balance_high"]
+        return {
+            "games": games,
+            "rounds_mean": mean,
+            "rounds_stddev": max(0.0, variance) ** 0.5,
+            "rolls": field("rolls")[0],
+            "outcomes": dict(zip(OUTCOME_CATEGORIES, field("outcomes"))),
+            "faces": {face + 1: count for face, count in enumerate(field("faces"))},
+            "wins_by_seat": {seat: count for seat, count in enumerate(field("wins_by_seat")) if count},
+            "balance_hist": {"counts": hist[:buckets], "underflow": hist[buckets], "overflow": hist[buckets + 1],
+                             "edges": [i * high / buckets for i in range(buckets + 1)]},
+        }
+
+    def close(self) -> None:
+        """Free the shared block."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def simulate_into_slot(task: Tuple[str, Dict[str, Any], int, int, int, int, int, int, int, str]) -> int:
+    """
+    Worker: play a range of games and count their results into one shared slot.
+    Args:
+        task: (shm_name, layout, slot, first_game, count, seed, players, bet, max_rounds, remainder_policy).
+    Returns:
+        int: Number of games played (the only value sent back to the parent).
+    """
+    shm_name, layout, slot, first_game, count, seed, players, bet, max_rounds, remainder_policy = task
+    writer = SlotWriter(shm_name, layout, slot)
+    try:
+        for game_index in range(first_game, first_game + count):
+            play_game(game_seed(seed, game_index), players, bet, max_rounds, remainder_policy, writer)
+    finally:
+        writer.close()
+    return count
+
+
+def run_shared_simulation(games: int, players: int = 4, bet: int = 10, seed: Optional[int] = None,
+                          workers: int = 4, max_rounds: int = 500,
+                          remainder_policy: str = REMAINDER_POLICY) -> Dict[str, Any]:
+    """
+    Play games across worker processes that aggregate into shared memory.
+    Uses the same per-game seeds as simulation.CheckpointedSimulation.
+    Args:
+        games (int): Total number of games.
+        players (int): Players per game.
+        bet (int): Bet per player per round.
+        seed (Optional[int]): Run seed (random if None).
+        workers (int): Worker processes, one shared slot each (0 = in-process, one slot).
+        max_rounds (int): Cap on the length of each game.
+        remainder_policy (str): Remainder policy of each game's ledger.
+    Returns:
+        Dict[str, Any]: The reduced result (see SharedAggregator.reduce) plus seed and seconds.
+    """
+    seed = seed if seed is not None else random.randrange(2 ** 32)
+    slots = max(1, workers)
+    per_slot, extra = divmod(games, slots)
+    start = time.perf_counter()
+    with SharedAggregator(slots, max_seats=players, balance_high=players * INITIAL_PLAYER_BALANCE) as aggregator:
+        tasks = []
+        first_game = 0
+        for slot in range(slots):
+            count = per_slot + (1 if slot < extra else 0)
+            tasks.append((aggregator.name, aggregator.layout, slot, first_game, count,
+                          seed, players, bet, max_rounds, remainder_policy))
+            first_game += count
+        if workers == 0:
+            for task in tasks:
+                simulate_into_slot(task)
+        else:
+            with Pool(workers) as pool:
+                pool.map(simulate_into_slot, tasks)
+        result = aggregator.reduce()
+    result["seed"] = seed
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def main() -> None:
+    """
+    Command-line entry point: run a shared-memory simulation and print the totals.
+    """
+    parser = argparse.ArgumentParser(description="Simulate Cee-lo games with shared-memory aggregation.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes (0 = in-process)")
+    parser.add_argument("--max-rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    result = run_shared_simulation(args.games, args.players, args.bet, args.seed, args.workers, args.max_rounds)
+    print(f"{result['games']:,} games in {result['seconds']:.1f}s (seed {result['seed']})")
+    print(f"Game length: mean {result['rounds_mean']:.2f} rounds (sd {result['rounds_stddev']:.2f})")
+    print(f"Rolls: {result['rolls']:,}; outcomes: "
+          + ", ".join(f"{k} {v:,}" for k, v in result["outcomes"].items()))
+    print("Wins by seat: " + ", ".join(f"{seat + 1}: {wins}" for seat, wins in sorted(result["wins_by_seat"].items())))
+
+
+if __name__ == "__main__":
+    main()
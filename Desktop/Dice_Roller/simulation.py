@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Checkpointed, resumable batch simulation of full Cee-lo games.
+
+Games are played headlessly with round_manager.play_round in fixed-size chunks.
+Every game draws its dice from its own RNG seeded from (seed, game index), so a
+chunk's result depends only on the run configuration and never on what ran
+before it. After each chunk the merged accumulators and the completed-work
+manifest are written atomically (temp file + os.replace); a restarted run picks
+up after the last completed chunk and produces the same results, bit for bit,
+as an uninterrupted run.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import INITIAL_PLAYER_BALANCE, REMAINDER_POLICY
+from ledger import SettlementLedger
+from player_manager import PlayerManager
+from round_manager import play_round
+from stats import GameStats
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def game_seed(seed: int, game_index: int) -> int:
+    """Seed of one game's RNG, derived from the run seed and the game index."""
+    return hash((seed, game_index)) & 0xFFFFFFFF
+
+
+def play_game(seed: int, players: int = 4, bet: int = 10, max_rounds: int = 500,
+              remainder_policy: str = REMAINDER_POLICY, stats: Optional[GameStats] = None) -> int:
+    """
+    Play one game until a single player has money left (or max_rounds is reached).
+    Args:
+        seed (int): Seed for the game's dice.
+        players (int): Number of players, each starting with INITIAL_PLAYER_BALANCE.
+        bet (int): Bet per player per round.
+        max_rounds (int): Cap on the game length.
+        remainder_policy (str): Remainder policy of the game's ledger.
+        stats (Optional[GameStats]): Accumulators that record every roll, round and the final balances.
+    Returns:
+        int: Number of rounds played.
+    """
+    pm = PlayerManager(history_limit=0)  # No undo history needed for bulk play
+    for i in range(players):
+        pm.add_player(f"Player{i + 1}")
+    ledger = SettlementLedger(remainder_policy)
+    rng = random.Random(seed)
+    rounds = 0
+    while rounds < max_rounds and len(pm.get_players_with_balance()) > 1:
+        play_round(pm, bet, ledger, rng, stats=stats)
+        rounds += 1
+    if stats is not None:
+        stats.record_game(rounds, (p["balance"] for p in pm.players.values()))
+    return rounds
+
+
+def simulate_chunk(task: Tuple[int, int, int, int, int, int, str]) -> Dict[str, Any]:
+    """
+    Play one chunk of games and return its accumulators as plain data.
+    Args:
+        task: (first_game, count, seed, players, bet, max_rounds, remainder_policy).
+    Returns:
+        Dict[str, Any]: GameStats.to_dict() for the chunk.
+    """
+    first_game, count, seed, players, bet, max_rounds, remainder_policy = task
+    stats = GameStats(max_game_length=max_rounds, max_balance=players * INITIAL_PLAYER_BALANCE)
+    for game_index in range(first_game, first_game + count):
+        play_game(game_seed(seed, game_index), players, bet, max_rounds, remainder_policy, stats)
+    return stats.to_dict()
+
+
+def _write_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Write JSON to path so that a crash leaves either the old or the new file, never a partial one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class CheckpointedSimulation:
+    """
+    A batch simulation that checkpoints after every chunk and resumes from its checkpoint file.
+    """
+    def __init__(self, checkpoint_path: str, games: int, players: int = 4, bet: int = 10,
+                 seed: Optional[int] = None, chunk_games: int = 1000, max_rounds: int = 500,
+                 remainder_policy: str = REMAINDER_POLICY) -> None:
+        """
+        Args:
+            checkpoint_path (str): Checkpoint file; an existing one with the same configuration is resumed.
+            games (int): Total number of games to play.
+            players (int): Players per game.
+            bet (int): Bet per player per round.
+            seed (Optional[int]): Run seed (random if None; kept in the checkpoint).
+            chunk_games (int): Games per chunk, i.e. between checkpoints.
+            max_rounds (int): Cap on the length of each game.
+            remainder_policy (str): Remainder policy of each game's ledger.
+        """
+        self.checkpoint_path = checkpoint_path
+        self._seed_given = seed is not None
+        self.config = {
+            "games": games, "players": players, "bet": bet,
+            "seed": seed if seed is not None else random.randrange(2 ** 32),
+            "chunk_games": max(1, chunk_games), "max_rounds": max_rounds,
+            "remainder_policy": remainder_policy,
+        }
+        self.completed_chunks = 0
+        self.stats = GameStats(max_game_length=max_rounds, max_balance=players * INITIAL_PLAYER_BALANCE)
+        self.elapsed = 0.0
+        self.resumed = False
+        if os.path.exists(checkpoint_path):
+            self._load()
+
+    @property
+    def num_chunks(self) -> int:
+        return -(-self.config["games"] // self.config["chunk_games"])
+
+    @property
+    def completed_games(self) -> int:
+        return min(self.completed_chunks * self.config["chunk_games"], self.config["games"])
+
+    @property
+    def done(self) -> bool:
+        return self.completed_chunks >= self.num_chunks
+
+    def _load(self) -> None:
+        with open(self.checkpoint_path) as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format: {data.get('version')}")
+        saved = data["config"]
+        if not self._seed_given:
+            self.config["seed"] = saved["seed"]  # No seed requested; keep the saved one
+        if self.config != saved:
+            raise ValueError(f"Checkpoint {self.checkpoint_path} was written with a different configuration: {saved}")
+        self.config = saved
+        self.completed_chunks = data["completed_chunks"]
+        self.stats = GameStats.from_dict(data["stats"])
+        self.elapsed = data["elapsed"]
+        self.resumed = True
+
+    def save(self) -> None:
+        """Persist the manifest and merged accumulators atomically."""
+        _write_atomic(self.checkpoint_path, {
+            "version": CHECKPOINT_FORMAT_VERSION,
+            "config": self.config,
+            "completed_chunks": self.completed_chunks,
+            "completed_games": self.completed_games,
+            "stats": self.stats.to_dict(),
+            "elapsed": self.elapsed,
+        })
+
+    def _task(self, chunk_id: int) -> Tuple[int, int, int, int, int, int, str]:
+        c = self.config
+        first_game = chunk_id * c["chunk_games"]
+        count = min(c["chunk_games"], c["games"] - first_game)
+        return (first_game, count, c["seed"], c["players"], c["bet"], c["max_rounds"], c["remainder_policy"])
+
+    def run(self, workers: Optional[int] = 0, max_chunks: Optional[int] = None,
+            progress: Optional[Callable[["CheckpointedSimulation"], None]] = None) -> GameStats:
+        """
+        Play the remaining chunks, checkpointing after each one.
+        Chunks are merged in order, so the result does not depend on the number of workers.
+        Args:
+            workers (Optional[int]): Worker processes (0 = in-process, None = one per CPU).
+            max_chunks (Optional[int]): Stop after this many chunks (the run can be resumed later).
+            progress (Optional[Callable]): Called after every checkpoint.
+        Returns:
+            GameStats: The merged accumulators so far.
+        """
+        pending = range(self.completed_chunks, self.num_chunks)
+        if max_chunks is not None:
+            pending = pending[:max_chunks]
+        tasks = [self._task(chunk_id) for chunk_id in pending]
+        pool = Pool(workers) if workers != 0 else None
+        try:
+            parts = pool.imap(simulate_chunk, tasks) if pool is not None else map(simulate_chunk, tasks)
+            last = time.perf_counter()
+            for part in parts:
+                self.stats.merge(GameStats.from_dict(part))
+                self.completed_chunks += 1
+                now = time.perf_counter()
+                self.elapsed += now - last
+                last = now
+                self.save()
+                if progress is not None:
+                    progress(self)
+        finally:
+            if pool is not None:
+                pool.terminate()
+        return self.stats
+
+
+def main() -> None:
+    """
+    Command-line entry point: run or resume a checkpointed simulation.
+    """
+    parser = argparse.ArgumentParser(description="Run a resumable batch simulation of Cee-lo games.")
+    parser.add_argument("checkpoint", help="Checkpoint file (resumed if it exists)")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-games", type=int, default=1000, help="Games between checkpoints")
+    parser.add_argument("--max-rounds", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    args = parser.parse_args()
+
+    sim = CheckpointedSimulation(args.checkpoint, args.games, args.players, args.bet, args.seed,
+                                 args.chunk_games, args.max_rounds)
+    if sim.resumed:
+        print(f"Resuming at game {sim.completed_games:,} of {args.games:,} (seed {sim.config['seed']})")
+
+    def report(s: CheckpointedSimulation) -> None:
+        print(f"\r{s.completed_games:,}/{s.config['games']:,} games ({s.elapsed:.0f}s)", end="", flush=True)
+
+    try:
+        stats = sim.run(args.workers, progress=report)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; {sim.completed_games:,} games are saved in {args.checkpoint}.")
+        return
+    print()
+    print(f"Game length: mean {stats.game_length.mean:.2f} rounds (sd {stats.game_length.stddev:.2f})")
+    print(f"Rolls: {stats.outcomes.rolls:,}; outcome shares: "
+          + ", ".join(f"{k} {v:.4f}" for k, v in stats.outcomes.frequencies().items()))
+    print("Wins by seat: " + ", ".join(f"{seat + 1}: {wins}" for seat, wins in sorted(stats.wins_by_seat.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Read-only spectator feed of a table's events (bets, rolls, round results).
+
+Each event is encoded once, as one JSON line, and the same bytes object is
+appended to every subscriber's bounded queue, so publishing costs one encode
+plus one append per subscriber and never blocks the table. A subscriber that
+falls behind either loses its oldest events, which are replaced by a single
+"gap" notice telling it how many it missed (coalesce), or is disconnected
+(drop). Spectators can read in-process or connect over loopback TCP, where
+one writer thread per connection drains that connection's queue.
+
+A broadcaster can be given a snapshot callable: its "state" event is queued
+for each new subscriber as it joins and right after every gap notice, so a
+spectator never waits for the next periodic snapshot to catch up.
+"""
+import json
+import socketserver
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+OVERFLOW_POLICIES = ("coalesce", "drop")
+
+
+def encode_event(seq: int, table: str, kind: str, payload: Dict[str, Any]) -> bytes:
+    """
+    Encode one event as a compact JSON line: {"seq", "table", "type", ...payload}.
+    """
+    event = {"seq": seq, "table": table, "type": kind}
+    event.update(payload)
+    return (json.dumps(event, separators=(",", ":")) + "\n").encode()
+
+
+class Subscriber:
+    """
+    One spectator's bounded queue of encoded events.
+    """
+    def __init__(self, limit: int = 256, policy: str = "coalesce") -> None:
+        """
+        Args:
+            limit (int): Events held before the overflow policy applies.
+            policy (str): "coalesce" (drop the oldest, report a gap) or "drop" (disconnect).
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.policy = policy
+        self.resync: Optional[Callable[[], Optional[bytes]]] = None  # Snapshot frame sent after a gap
+        self.skipped = 0  # Events lost since the last drain (coalesce)
+        self.closed = False
+        self._queue: deque = deque(maxlen=limit)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def offer(self, frame: bytes) -> bool:
+        """
+        Queue an event without blocking. Returns False if the subscriber was dropped.
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            if len(self._queue) == self.limit:
+                if self.policy == "drop":
+                    self.closed = True
+                    self._ready.set()  # Wake the reader so it notices
+                    return False
+                self.skipped += 1  # The deque discards the oldest event
+            self._queue.append(frame)
+        self._ready.set()
+        return True
+
+    def drain(self) -> List[bytes]:
+        """
+        Take every queued event, preceded by a gap notice (and a fresh snapshot, when the
+        subscriber has a resync source) if events were lost.
+        """
+        with self._lock:
+            frames = list(self._queue)
+            self._queue.clear()
+            skipped, self.skipped = self.skipped, 0
+            self._ready.clear()
+        if skipped:
+            snapshot = self.resync() if self.resync is not None else None
+            if snapshot is not None:
+                frames.insert(0, snapshot)
+            frames.insert(0, (json.dumps({"type": "gap", "skipped": skipped}, separators=(",", ":")) + "\n").encode())
+        return frames
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until events are queued (or the subscriber is closed). Returns False on timeout.
+        """
+        return self._ready.wait(timeout)
+
+    def close(self) -> None:
+        """Mark the subscriber closed and wake its reader."""
+        with self._lock:
+            self.closed = True
+        self._ready.set()
+
+
+class SpectatorBroadcaster:
+    """
+    Fans a table's events out to any number of subscribers.
+    """
+    def __init__(self, table: str = "table", snapshot: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+        """
+        Args:
+            table (str): Table name included in every event.
+            snapshot (Optional[Callable]): Returns the payload of a "state" event holding the
+                table's full state; sent to each new subscriber and after every gap notice.
+                It is called from the subscriber's thread.
+        """
+        self.table = table
+        self.snapshot = snapshot
+        self.seq = 0
+        self.dropped = 0
+        self._subscribers: List[Subscriber] = []
+        self._subscribers_lock = threading.Lock()  # Serializes writers; publish reads without it
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, limit: int = 256, policy: str = "coalesce") -> Subscriber:
+        """
+        Add a spectator. See Subscriber for limit and policy.
+        """
+        subscriber = Subscriber(limit, policy)
+        subscriber.resync = self._snapshot_frame
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + [subscriber]  # Copy-on-write; publish iterates lock-free
+        frame = self._snapshot_frame()
+        if frame is not None:
+            subscriber.offer(frame)  # Joins with the full state instead of waiting for a keyframe
+        return subscriber
+
+    def _snapshot_frame(self) -> Optional[bytes]:
+        """The encoded "state" snapshot event for one subscriber (None without a snapshot source)."""
+        if self.snapshot is None:
+            return None
+        return encode_event(self.seq, self.table, "state", self.snapshot())
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscriber.close()
+        with self._subscribers_lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    def publish(self, kind: str, **payload: Any) -> int:
+        """
+        Encode an event once and queue it for every subscriber.
+        Args:
+            kind (str): Event type, e.g. "bets", "roll" or "round".
+            **payload: JSON-serializable event fields.
+        Returns:
+            int: The event's sequence number.
+        """
+        self.seq += 1
+        subscribers = self._subscribers
+        if not subscribers:
+            return self.seq
+        frame = encode_event(self.seq, self.table, kind, payload)
+        for subscriber in subscribers:
+            if not subscriber.offer(frame):
+                self.dropped += 1
+                self.unsubscribe(subscriber)
+        return self.seq
+
+    # --- Loopback TCP ----------------------------------------------------------
+
+    def serve_tcp(self, port: int = 0, host: str = "127.0.0.1", limit: int = 256,
+                  policy: str = "coalesce") -> int:
+        """
+        Serve the feed as JSON lines to TCP clients from a background thread.
+        Args:
+            port (int): Port to listen on (0 picks a free one).
+            host (str): Interface (loopback by default).
+            limit (int): Queue limit of each connection.
+            policy (str): Overflow policy of each connection.
+        Returns:
+            int: The port being served.
+        """
+        broadcaster = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                subscriber = broadcaster.subscribe(limit, policy)
+                try:
+                    while not subscriber.closed:
+                        if subscriber.wait(1.0):
+                            frames = subscriber.drain()
+                            if frames:
+                                self.request.sendall(b"".join(frames))
+                except OSError:
+                    pass  # Spectator went away
+                finally:
+                    broadcaster.unsubscribe(subscriber)
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        if self._server is not None:
+            raise RuntimeError("The feed is already being served")
+        self._server = Server((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="spectator-feed", daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self) -> None:
+        """Stop the TCP server (if any) and disconnect every subscriber."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._subscribers_lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for subscriber in subscribers:
+            subscriber.close()
@@ -0,0 +1,214 @@
+"""
+Versioned table state for remote mirrors, sent as snapshots and compact deltas.
+
+TableStateServer listens to a PlayerManager's change feed. Every change gets
+the next sequence number, and each synced player field remembers the
+sequence number at which it last changed, so a delta since any sequence
+number contains exactly the fields that changed after it (plus removed players
+and the seat order when membership changed). The cost of a delta is
+proportional to what changed, not to the size of the table.
+
+A client applies a snapshot on join and then deltas in order. A delta that
+does not start where the client is (a lost message) is rejected, and the client
+resyncs with delta_since(client.seq) or a new snapshot. Deltas carry the
+latest value of each changed field, so a client that is already past a
+delta's start (e.g. it joined with a newer snapshot) can still apply it, and
+a delta it has already covered is skipped. The push helper (next_message)
+interleaves periodic snapshots so that clients that only listen, e.g. on the
+spectator feed, also recover from gaps.
+
+snapshot() may be called from other threads (e.g. the spectator feed's); the
+server's state is guarded by a lock.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+SYNCED_FIELDS = ("balance", "current_bet", "last_roll_outcome", "point_value", "is_out", "rounds_won")
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Compact JSON encoding of a snapshot or delta."""
+    return json.dumps(message, separators=(",", ":")).encode()
+
+
+def decode_message(data: bytes) -> Dict[str, Any]:
+    return json.loads(data)
+
+
+class TableStateServer:
+    """
+    Tracks per-field versions of a table and produces snapshots and deltas.
+    """
+    def __init__(self, player_manager: Any, round_state: Optional[Callable[[], Dict[str, Any]]] = None,
+                 keyframe_every: int = 50, max_tombstones: int = 1000) -> None:
+        """
+        Args:
+            player_manager (Any): PlayerManager whose change feed is mirrored.
+            round_state (Optional[Callable]): Returns small round-level state (round number, player up...)
+                that is included in every message.
+            keyframe_every (int): next_message sends a snapshot instead of a delta this often.
+            max_tombstones (int): Removed players remembered for deltas; older clients get a snapshot.
+        """
+        self.player_manager = player_manager
+        self.round_state = round_state or dict
+        self.keyframe_every = keyframe_every
+        self.max_tombstones = max_tombstones
+        self.seq = 0
+        self._shadow: Dict[str, Dict[str, Any]] = {}
+        self._field_versions: Dict[str, Dict[str, int]] = {}
+        self._changed: "OrderedDict[str, int]" = OrderedDict()  # name -> last version, oldest first
+        self._tombstones: "OrderedDict[str, int]" = OrderedDict()
+        self._order_version = 0
+        self._floor = 0  # Deltas from before this sequence number need a snapshot
+        self._pushed_seq: Optional[int] = None
+        self._pushes = 0
+        self.last_round: Dict[str, Any] = {}  # Round state of the latest push
+        self._lock = threading.RLock()
+        for name in player_manager.players:
+            self._on_change(name, "add")
+        player_manager.subscribe_changes(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the PlayerManager's change feed."""
+        self.player_manager.unsubscribe_changes(self._on_change)
+
+    def _on_change(self, name: str, change: str) -> None:
+        with self._lock:
+            self._apply_change(name, change)
+
+    def _apply_change(self, name: str, change: str) -> None:
+        player = self.player_manager.players.get(name)
+        if change == "remove" or player is None:
+            if self._shadow.pop(name, None) is None:
+                return
+            self.seq += 1
+            self._field_versions.pop(name, None)
+            self._changed.pop(name, None)
+            self._tombstones[name] = self.seq
+            self._order_version = self.seq
+            if len(self._tombstones) > self.max_tombstones:
+                _, version = self._tombstones.popitem(last=False)
+                self._floor = version
+            return
+        shadow = self._shadow.get(name)
+        if shadow is None:
+            self.seq += 1
+            self._shadow[name] = {field: player.get(field) for field in SYNCED_FIELDS}
+            self._field_versions[name] = dict.fromkeys(SYNCED_FIELDS, self.seq)
+            self._tombstones.pop(name, None)
+            self._order_version = self.seq
+        else:
+            changed = [field for field in SYNCED_FIELDS if shadow[field] != player.get(field)]
+            if not changed:
+                return
+            self.seq += 1
+            versions = self._field_versions[name]
+            for field in changed:
+                shadow[field] = player.get(field)
+                versions[field] = self.seq
+        self._changed[name] = self.seq
+        self._changed.move_to_end(name)
+
+    def snapshot(self, round_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Full state: {"kind": "snapshot", "seq", "order", "players", "round"}.
+        Args:
+            round_state (Optional[Dict[str, Any]]): Round state to include instead of calling
+                round_state() (e.g. last_round, from a thread that must not touch the UI).
+        """
+        with self._lock:
+            return {"kind": "snapshot", "seq": self.seq, "order": list(self.player_manager.players),
+                    "players": {name: dict(fields) for name, fields in self._shadow.items()},
+                    "round": self.round_state() if round_state is None else round_state}
+
+    def delta_since(self, seq: int) -> Dict[str, Any]:
+        """
+        Changes after sequence number seq, or a snapshot if seq is too old (or from the future).
+        Returns:
+            Dict[str, Any]: {"kind": "delta", "from", "seq", "players": {name: {changed fields}},
+            "removed": [...], "round"} plus "order" if players joined or left.
+        """
+        with self._lock:
+            return self._delta_since(seq)
+
+    def _delta_since(self, seq: int) -> Dict[str, Any]:
+        if seq < self._floor or seq > self.seq:
+            return self.snapshot()
+        players = {}
+        for name in reversed(self._changed):
+            if self._changed[name] <= seq:
+                break
+            versions = self._field_versions[name]
+            shadow = self._shadow[name]
+            players[name] = {field: shadow[field] for field in SYNCED_FIELDS if versions[field] > seq}
+        removed = []
+        for name in reversed(self._tombstones):
+            if self._tombstones[name] <= seq:
+                break
+            removed.append(name)
+        delta = {"kind": "delta", "from": seq, "seq": self.seq, "players": players,
+                 "removed": removed, "round": self.round_state()}
+        if self._order_version > seq:
+            delta["order"] = list(self.player_manager.players)
+        return delta
+
+    def next_message(self, snapshot: bool = False) -> Dict[str, Any]:
+        """
+        The next message for a push stream: a delta since the previous push, with a
+        snapshot first, every keyframe_every messages, and whenever snapshot is True
+        (e.g. because new listeners joined).
+        """
+        with self._lock:
+            if snapshot or self._pushed_seq is None or self._pushes % self.keyframe_every == 0:
+                message = self.snapshot()
+            else:
+                message = self._delta_since(self._pushed_seq)
+            self._pushed_seq = message["seq"]
+            self._pushes += 1
+            self.last_round = message["round"]
+        return message
+
+
+class TableStateClient:
+    """
+    A mirror of a table built from snapshots and deltas.
+    """
+    def __init__(self) -> None:
+        self.seq: Optional[int] = None
+        self.order: List[str] = []
+        self.players: Dict[str, Dict[str, Any]] = {}
+        self.round: Dict[str, Any] = {}
+        self.needs_resync = True
+
+    def apply(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply a snapshot, or a delta that starts at or before this client's sequence number
+        (one that ends there or earlier is already covered and skipped).
+        Returns:
+            bool: False if the delta was rejected; needs_resync is then set and the client
+            should ask for delta_since(self.seq) or a snapshot.
+        """
+        if message["kind"] == "snapshot":
+            self.seq = message["seq"]
+            self.order = list(message["order"])
+            self.players = {name: dict(fields) for name, fields in message["players"].items()}
+            self.round = message["round"]
+            self.needs_resync = False
+            return True
+        if self.seq is None or message["from"] > self.seq:
+            self.needs_resync = True
+            return False
+        if message["seq"] < self.seq:
+            return True  # Older than what this client has
+        for name in message["removed"]:
+            self.players.pop(name, None)
+        for name, fields in message["players"].items():
+            self.players.setdefault(name, {}).update(fields)
+        if "order" in message:
+            self.order = list(message["order"])
+        self.round = message["round"]
+        self.seq = message["seq"]
+        self.needs_resync = False
+        return True
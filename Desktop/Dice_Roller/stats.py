@@ -0,0 +1,249 @@
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+# The outcome categories produced by evaluate_roll, in display order
+OUTCOME_CATEGORIES = ("Win", "Lose", "Point", "No Score")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(round(q / 100 * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+
+class RunningStats:
+    """
+    Online mean/variance accumulator (Welford), mergeable across workers.
+    Uses constant memory no matter how many values are added.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine another accumulator into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two observations)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable state (see from_dict)."""
+        return {"count": self.count, "mean": self.mean, "m2": self._m2,
+                "min": self.minimum, "max": self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Rebuild an accumulator from to_dict output."""
+        stats = cls()
+        stats.count, stats.mean, stats._m2 = data["count"], data["mean"], data["m2"]
+        stats.minimum, stats.maximum = data["min"], data["max"]
+        return stats
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram over [low, high) with underflow and overflow counts.
+    Mergeable with any histogram that has the same buckets.
+    """
+    def __init__(self, low: float, high: float, buckets: int) -> None:
+        if high <= low or buckets < 1:
+            raise ValueError("Histogram needs high > low and at least one bucket.")
+        self.low = low
+        self.high = high
+        self.buckets = buckets
+        self.width = (high - low) / buckets
+        self.counts: List[int] = [0] * buckets
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Count a value (count times)."""
+        if value < self.low:
+            self.underflow += count
+        elif value >= self.high:
+            self.overflow += count
+        else:
+            # Rounding can put a value just below high at index buckets; it belongs to the last bucket
+            self.counts[min(int((value - self.low) / self.width), self.buckets - 1)] += count
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Combine another histogram with identical buckets into this one."""
+        if (other.low, other.high, other.buckets) != (self.low, self.high, self.buckets):
+            raise ValueError("Cannot merge histograms with different buckets.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self) -> int:
+        """Number of values counted, underflow and overflow included."""
+        return sum(self.counts) + self.underflow + self.overflow
+
+    def bucket_edges(self) -> List[float]:
+        """The buckets + 1 bucket boundaries from low to high."""
+        return [self.low + i * self.width for i in range(self.buckets + 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable state (see from_dict)."""
+        return {"low": self.low, "high": self.high, "buckets": self.buckets,
+                "counts": list(self.counts), "underflow": self.underflow, "overflow": self.overflow}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        """Rebuild a histogram from to_dict output."""
+        hist = cls(data["low"], data["high"], data["buckets"])
+        hist.counts = list(data["counts"])
+        hist.underflow, hist.overflow = data["underflow"], data["overflow"]
+        return hist
+
+
+class OutcomeCounter:
+    """
+    Frequency counters for roll results: evaluate_roll category, each die face
+    and each point value. O(1) per roll, mergeable.
+    """
+    def __init__(self) -> None:
+        self.rolls = 0
+        self.outcomes: Dict[str, int] = {category: 0 for category in OUTCOME_CATEGORIES}
+        self.faces: Dict[int, int] = {}
+        self.points: Dict[int, int] = {}
+
+    def add(self, rolls: Iterable[int], outcome: Dict[str, Any]) -> None:
+        """Count one roll and its evaluate_roll outcome."""
+        self.rolls += 1
+        category = outcome["outcome"]
+        self.outcomes[category] = self.outcomes.get(category, 0) + 1
+        for face in rolls:
+            self.faces[face] = self.faces.get(face, 0) + 1
+        if category == "Point":
+            self.points[outcome["value"]] = self.points.get(outcome["value"], 0) + 1
+
+    def merge(self, other: "OutcomeCounter") -> "OutcomeCounter":
+        """Combine another counter into this one."""
+        self.rolls += other.rolls
+        for target, source in ((self.outcomes, other.outcomes), (self.faces, other.faces),
+                               (self.points, other.points)):
+            for key, count in source.items():
+                target[key] = target.get(key, 0) + count
+        return self
+
+    def frequencies(self) -> Dict[str, float]:
+        """Share of rolls in each outcome category."""
+        return {k: (v / self.rolls if self.rolls else 0.0) for k, v in self.outcomes.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable state (see from_dict)."""
+        return {"rolls": self.rolls, "outcomes": dict(self.outcomes),
+                "faces": {str(k): v for k, v in self.faces.items()},
+                "points": {str(k): v for k, v in self.points.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OutcomeCounter":
+        """Rebuild a counter from to_dict output."""
+        counter = cls()
+        counter.rolls = data["rolls"]
+        counter.outcomes = dict(data["outcomes"])
+        counter.faces = {int(k): v for k, v in data["faces"].items()}
+        counter.points = {int(k): v for k, v in data["points"].items()}
+        return counter
+
+
+class GameStats:
+    """
+    The standard bundle of accumulators for simulations and live play:
+    game length, final balances, per-roll outcomes and rounds won per seat.
+    """
+    def __init__(self, max_game_length: int = 500, max_balance: int = 1000, buckets: int = 50) -> None:
+        self.game_length = RunningStats()
+        self.game_length_hist = Histogram(0, max_game_length, buckets)
+        self.balance = RunningStats()
+        self.balance_hist = Histogram(0, max_balance, buckets)
+        self.outcomes = OutcomeCounter()
+        self.wins_by_seat: Dict[int, int] = {}
+
+    def record_roll(self, rolls: Iterable[int], outcome: Dict[str, Any]) -> None:
+        """Count one roll and its evaluate_roll outcome."""
+        self.outcomes.add(rolls, outcome)
+
+    def record_round(self, winner_seats: Iterable[int]) -> None:
+        """Credit a round win to each winning seat."""
+        for seat in winner_seats:
+            self.wins_by_seat[seat] = self.wins_by_seat.get(seat, 0) + 1
+
+    def record_game(self, rounds: int, final_balances: Iterable[int]) -> None:
+        """Record a finished game's length and every player's final balance."""
+        self.game_length.add(rounds)
+        self.game_length_hist.add(rounds)
+        for balance in final_balances:
+            self.balance.add(balance)
+            self.balance_hist.add(balance)
+
+    def merge(self, other: "GameStats") -> "GameStats":
+        """Combine another bundle (e.g. from a worker process) into this one."""
+        self.game_length.merge(other.game_length)
+        self.game_length_hist.merge(other.game_length_hist)
+        self.balance.merge(other.balance)
+        self.balance_hist.merge(other.balance_hist)
+        self.outcomes.merge(other.outcomes)
+        for seat, wins in other.wins_by_seat.items():
+            self.wins_by_seat[seat] = self.wins_by_seat.get(seat, 0) + wins
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable state (see from_dict)."""
+        return {
+            "game_length": self.game_length.to_dict(),
+            "game_length_hist": self.game_length_hist.to_dict(),
+            "balance": self.balance.to_dict(),
+            "balance_hist": self.balance_hist.to_dict(),
+            "outcomes": self.outcomes.to_dict(),
+            "wins_by_seat": {str(k): v for k, v in self.wins_by_seat.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameStats":
+        """Rebuild a bundle from to_dict output."""
+        stats = cls.__new__(cls)
+        stats.game_length = RunningStats.from_dict(data["game_length"])
+        stats.game_length_hist = Histogram.from_dict(data["game_length_hist"])
+        stats.balance = RunningStats.from_dict(data["balance"])
+        stats.balance_hist = Histogram.from_dict(data["balance_hist"])
+        stats.outcomes = OutcomeCounter.from_dict(data["outcomes"])
+        stats.wins_by_seat = {int(k): v for k, v in data["wins_by_seat"].items()}
+        return stats
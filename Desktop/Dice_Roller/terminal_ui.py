@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Curses terminal frontend for the Cee-lo game.
+
+Plays the same flow as the Tk app (add players, one bet for everyone, roll in
+seat order re-rolling 'No Score', best roll takes the pot) through
+PlayerManager, round_manager and the settlement ledger, and draws the dice with
+get_die_ascii_face. The screen is split into windows that are redrawn only
+when their content changes, and the loop blocks on input, so it is cheap to
+run over SSH.
+
+Keys: a = add player, s = start game, space/r = roll, q = quit.
+"""
+import curses
+import locale
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DICE_SIDES, NUM_DICE, REMAINDER_POLICY
+from dice_logic import evaluate_roll, get_die_ascii_face, roll_single_die
+from ledger import SettlementLedger
+from player_manager import PlayerManager
+from round_manager import determine_winners
+
+LOG_LINES = 200  # Messages kept for the log window
+
+
+class TerminalTable:
+    """
+    Round state for one table, advanced one roll at a time. Holds no UI code.
+    """
+    def __init__(self, player_manager: Optional[PlayerManager] = None, ledger: Optional[SettlementLedger] = None,
+                 rng: Optional[random.Random] = None) -> None:
+        self.player_manager = player_manager or PlayerManager()
+        self.ledger = ledger or SettlementLedger(REMAINDER_POLICY)
+        self.rng = rng
+        self.round_number = 1
+        self.bets: Dict[str, int] = {}
+        self.round_rolls: Dict[str, Dict[str, Any]] = {}
+        self.last_roll: Optional[Tuple[str, List[int], Dict[str, Any]]] = None
+
+    @property
+    def current_player(self) -> Optional[str]:
+        """The next player to roll this round, or None when no round is in progress."""
+        for name in self.bets:
+            if name not in self.round_rolls:
+                return name
+        return None
+
+    @property
+    def round_complete(self) -> bool:
+        return bool(self.bets) and len(self.round_rolls) == len(self.bets)
+
+    @property
+    def game_over(self) -> bool:
+        return len(self.player_manager.get_players_with_balance()) <= 1
+
+    def start_round(self, amount: Any) -> Tuple[bool, str]:
+        """
+        Place the same bet for every player with money, as the Tk bet dialog does.
+        Returns (success, message).
+        """
+        players = self.player_manager.get_players_with_balance()
+        try:
+            amount = int(amount)
+        except (TypeError, ValueError):
+            return False, "Bet must be a number."
+        if amount <= 0:
+            return False, "Bet must be positive."
+        for name in players:
+            if amount > self.player_manager.get_player(name)["balance"]:
+                return False, f"{name} does not have enough balance."
+        for name in players:
+            self.player_manager.set_bet(name, amount)
+        self.bets = {name: amount for name in players}
+        self.round_rolls = {}
+        return True, f"All bets of ${amount} are in! {players[0]} rolls first."
+
+    def roll(self) -> Dict[str, Any]:
+        """
+        Roll for the current player. A 'No Score' leaves the same player to roll again.
+        Returns:
+            Dict[str, Any]: player, rolls and the evaluate_roll outcome.
+        """
+        name = self.current_player
+        if name is None:
+            raise ValueError("No round in progress.")
+        rolls = [roll_single_die(DICE_SIDES, self.rng) for _ in range(NUM_DICE)]
+        outcome = evaluate_roll(rolls)
+        self.last_roll = (name, rolls, outcome)
+        if outcome["outcome"] != "No Score":
+            self.round_rolls[name] = {"rolls": rolls, "outcome": outcome["outcome"],
+                                      "value": outcome["value"], "bet": self.bets[name]}
+        self.player_manager.update_player_outcome(name, outcome["outcome"], outcome["value"])
+        return {"player": name, "rolls": rolls, "outcome": outcome}
+
+    def finish_round(self) -> Dict[str, Any]:
+        """
+        Settle the completed round and get ready for the next one. When the game is over,
+        whatever is still carried over is paid to the last player with money, as in the Tk app.
+        Returns:
+            Dict[str, Any]: round number, winners, the ledger settlement and carry_over_paid.
+        """
+        winners = determine_winners(self.round_rolls)
+        settlement = self.ledger.settle_round(self.player_manager, self.round_rolls, winners)
+        left = self.player_manager.get_players_with_balance()
+        paid = self.ledger.pay_carry_over(self.player_manager, left[0]) if len(left) == 1 else 0
+        result = {"round": self.round_number, "winners": winners, "settlement": settlement,
+                  "carry_over_paid": paid}
+        self.round_number += 1
+        self.bets = {}
+        self.round_rolls = {}
+        return result
+
+
+def render_dice(rolls: List[int]) -> List[str]:
+    """
+    Lay out the ASCII faces of a roll side by side.
+    """
+    faces = [get_die_ascii_face(r) for r in rolls]
+    return ["  ".join(face[row] for face in faces) for row in range(len(faces[0]))]
+
+
+class TerminalApp:
+    """
+    The curses screen: header, player list, dice, log and prompt windows.
+    Each window is redrawn only when marked dirty.
+    """
+    WINDOWS = ("header", "players", "dice", "log", "prompt")
+
+    def __init__(self, stdscr: Any, table: TerminalTable) -> None:
+        self.stdscr = stdscr
+        self.table = table
+        self.log: List[str] = []
+        self.prompt = "a: add player   s: start game   q: quit"
+        self.dirty = set(self.WINDOWS)
+        self.windows: Dict[str, Any] = {}
+        self.started = False
+        table.player_manager.subscribe_changes(self._on_player_changed)
+        self._layout()
+
+    def _on_player_changed(self, name: str, change: str) -> None:
+        self.dirty.add("players")
+
+    def _layout(self) -> None:
+        """(Re)create the windows for the current terminal size."""
+        height, width = self.stdscr.getmaxyx()
+        dice_height = 8
+        list_width = max(20, width // 2)
+        self.windows = {
+            "header": curses.newwin(1, width, 0, 0),
+            "players": curses.newwin(dice_height, list_width, 1, 0),
+            "dice": curses.newwin(dice_height, max(1, width - list_width), 1, list_width),
+            "log": curses.newwin(max(1, height - dice_height - 2), width, 1 + dice_height, 0),
+            "prompt": curses.newwin(1, width, height - 1, 0),
+        }
+        self.dirty = set(self.WINDOWS)
+
+    def message(self, text: str) -> None:
+        self.log.append(text)
+        del self.log[:-LOG_LINES]
+        self.dirty.add("log")
+
+    def set_prompt(self, text: str) -> None:
+        if text != self.prompt:
+            self.prompt = text
+            self.dirty.add("prompt")
+
+    # --- Drawing -------------------------------------------------------------
+
+    def _put(self, win: Any, y: int, x: int, text: str, attr: int = 0) -> None:
+        height, width = win.getmaxyx()
+        if 0 <= y < height and x < width:
+            try:
+                win.addnstr(y, x, text, width - x - (1 if y == height - 1 else 0), attr)
+            except curses.error:
+                pass  # Terminal too small for this line
+
+    def _draw_header(self, win: Any) -> None:
+        table = self.table
+        pot = sum(table.bets.values())
+        carry = f"  Carry-over: ${table.ledger.carry_over}" if table.ledger.carry_over else ""
+        self._put(win, 0, 0, f" Cee-lo  |  Round {table.round_number}  |  Pot: ${pot}{carry}", curses.A_REVERSE)
+
+    def _draw_players(self, win: Any) -> None:
+        table = self.table
+        height, _ = win.getmaxyx()
+        names = list(table.player_manager.players)
+        current = table.current_player
+        rows = height - 1
+        first = 0
+        if current in names and names.index(current) >= rows:
+            first = names.index(current) - rows + 1  # Keep the roller in view
+        self._put(win, 0, 0, f"{'Player':<12}{'Balance':>9}{'Bet':>6}  {'Roll':<9}{'Wins':>5}", curses.A_BOLD)
+        for row, name in enumerate(names[first:first + rows], start=1):
+            data = table.player_manager.players[name]
+            status = "OUT" if data["is_out"] else (data["last_roll_outcome"] or "")
+            if status == "Point":
+                status = f"Point {data['point_value']}"
+            marker = ">" if name == current else " "
+            attr = curses.A_BOLD if name == current else (curses.A_DIM if data["is_out"] else 0)
+            bet = table.bets.get(name, 0)
+            self._put(win, row, 0, f"{marker}{name[:11]:<11}{'$' + str(data['balance']):>9}{bet:>6}  "
+                                   f"{status:<9}{data['rounds_won']:>5}", attr)
+
+    def _draw_dice(self, win: Any) -> None:
+        if self.table.last_roll is None:
+            self._put(win, 0, 1, "No dice rolled yet.")
+            return
+        name, rolls, outcome = self.table.last_roll
+        self._put(win, 0, 1, f"{name}: {outcome['outcome']} - {outcome['value']}", curses.A_BOLD)
+        for row, line in enumerate(render_dice(rolls), start=2):
+            self._put(win, row, 1, line)
+
+    def _draw_log(self, win: Any) -> None:
+        height, _ = win.getmaxyx()
+        for row, line in enumerate(self.log[-height:]):
+            self._put(win, row, 0, line)
+
+    def _draw_prompt(self, win: Any) -> None:
+        self._put(win, 0, 0, self.prompt, curses.A_REVERSE)
+
+    def redraw(self) -> None:
+        """Redraw only the dirty windows and push them to the terminal in one update."""
+        if "players" in self.dirty:
+            self.dirty.add("header")  # Pot and round follow player changes
+        for name in self.WINDOWS:
+            if name in self.dirty:
+                win = self.windows[name]
+                win.erase()
+                getattr(self, f"_draw_{name}")(win)
+                win.noutrefresh()
+        self.dirty.clear()
+        curses.doupdate()
+
+    # --- Input ---------------------------------------------------------------
+
+    def ask(self, question: str) -> str:
+        """Read a line of text on the prompt line."""
+        win = self.windows["prompt"]
+        win.erase()
+        self._put(win, 0, 0, question)
+        win.refresh()
+        curses.echo()
+        curses.curs_set(1)
+        try:
+            text = win.getstr(0, min(len(question), win.getmaxyx()[1] - 1), 40)
+        finally:
+            curses.noecho()
+            curses.curs_set(0)
+        self.dirty.add("prompt")
+        return text.decode(locale.getpreferredencoding(), "replace").strip()
+
+    def _add_player(self) -> None:
+        name = self.ask("Player name: ")
+        if name:
+            success, msg = self.table.player_manager.add_player(name)
+            self.message(msg)
+
+    def _start_game(self) -> None:
+        if len(self.table.player_manager.get_all_players()) < 2:
+            self.message("At least two players are needed to start.")
+            return
+        self.started = True
+        self.message("Game started!")
+        self._ask_bets()
+
+    def _ask_bets(self) -> None:
+        while True:
+            self.redraw()
+            answer = self.ask("Bet amount for ALL players (blank to quit): ")
+            if not answer:
+                raise KeyboardInterrupt
+            success, msg = self.table.start_round(answer)
+            self.message(msg)
+            if success:
+                break
+        self.dirty.add("players")
+
+    def _roll(self) -> None:
+        table = self.table
+        result = table.roll()
+        self.dirty.add("dice")
+        outcome = result["outcome"]
+        if outcome["outcome"] == "No Score":
+            self.message(f"{result['player']} rolled {result['rolls']}: No Score, roll again.")
+            return
+        self.message(f"{result['player']} rolled {result['rolls']}: {outcome['outcome']} - {outcome['value']}")
+        if not table.round_complete:
+            return
+        summary = table.finish_round()
+        payouts = summary["settlement"]["payouts"]
+        self.message(f"Round {summary['round']} winner(s): "
+                     + ", ".join(f"{w} (+${payouts.get(w, 0)})" for w in summary["winners"]))
+        if summary["carry_over_paid"]:
+            self.message(f"${summary['carry_over_paid']} carried over in the pot goes to the game winner.")
+        elif summary["settlement"]["carry_over"]:
+            self.message(f"${summary['settlement']['carry_over']} carries over to the next pot.")
+        if table.game_over:
+            left = table.player_manager.get_players_with_balance()
+            self.message(f"Game over! {left[0] if left else 'Nobody'} wins the game.")
+            self.set_prompt("q: quit")
+            return
+        self._ask_bets()
+
+    def run(self) -> None:
+        """Main loop: block on a key, update state, redraw what changed."""
+        while True:
+            if self.started and not self.table.game_over:
+                current = self.table.current_player
+                self.set_prompt(f"{current}: press space to roll   q: quit" if current else "q: quit")
+            self.redraw()
+            key = self.stdscr.getch()
+            if key in (ord("q"), ord("Q")):
+                return
+            if key == curses.KEY_RESIZE:
+                self._layout()
+            elif not self.started and key in (ord("a"), ord("A")):
+                self._add_player()
+            elif not self.started and key in (ord("s"), ord("S")):
+                self._start_game()
+            elif self.started and key in (ord(" "), ord("r"), ord("R")) and self.table.current_player:
+                self._roll()
+
+
+def _main(stdscr: Any) -> None:
+    curses.curs_set(0)
+    app = TerminalApp(stdscr, TerminalTable())
+    try:
+        app.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    """
+    Command-line entry point: start the terminal game.
+    """
+    locale.setlocale(locale.LC_ALL, "")  # Needed for the box-drawing dice faces
+    curses.wrapper(_main)
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,40 @@ def test_dice_logic():
         print(f"✗ Dice logic test failed: {e}")
         return False
 
+def test_rules():
+    """Test compiled house rule variants."""
+    print("Testing rules module...")
+    try:
+        from rules import RuleSet, RULE_VARIANTS, get_active_rules, set_active_rules
+        from dice_logic import evaluate_roll
+        from round_manager import determine_winners
+
+        standard = RULE_VARIANTS["standard"]
+        assert standard.evaluate([3, 1, 2])["outcome"] == "Lose"
+        assert standard.rank([6, 5, 4]) > standard.rank([6, 6, 6])
+        assert RULE_VARIANTS["trips_high"].rank([2, 2, 2]) > RULE_VARIANTS["trips_high"].rank([4, 5, 6])
+        assert RULE_VARIANTS["no_auto_loss"].evaluate([1, 2, 3])["outcome"] == "No Score"
+        assert RULE_VARIANTS["ace_point"].rank([5, 5, 1]) > RULE_VARIANTS["ace_point"].rank([2, 2, 6])
+        assert RuleSet.from_spec(standard.to_spec()).rank_of("Point", 4) == (1, 4)
+        print("✓ Variant outcomes and ranks")
+
+        round_rolls = {
+            "A": {"outcome": "Win", "value": "4-5-6 (Cee-lo!)", "bet": 10},
+            "B": {"outcome": "Win", "value": "Trips! (2-2-2)", "bet": 10}
+        }
+        assert determine_winners(round_rolls) == ["A"]
+        set_active_rules("trips_high")
+        try:
+            assert determine_winners(round_rolls) == ["B"]
+        finally:
+            set_active_rules("standard")
+        assert get_active_rules().name == "standard" and evaluate_roll([2, 2, 5])["value"] == 5
+        print("✓ Active rule set drives evaluation and ranking")
+        return True
+    except Exception as e:
+        print(f"✗ Rules test failed: {e}")
+        return False
+
 def test_player_manager():
     """Test player manager module."""
     print("Testing player manager module...")
@@ -57,12 +91,631 @@ def test_player_manager():
         # Test setting bet
         success, message = pm.set_bet("TestPlayer", 10)
         print(f"✓ Set bet: {message}")
+
+        # Test change feed
+        changes = []
+        pm.subscribe_changes(lambda name, change: changes.append((name, change)))
+        pm.add_player("Other")
+        pm.deposit_funds("Other", 5)
+        pm.remove_player("Other")
+        assert changes == [("Other", "add"), ("Other", "update"), ("Other", "remove")]
+        print(f"✓ Change feed: {len(changes)} events")
         
         return True
     except Exception as e:
         print(f"✗ Player manager test failed: {e}")
         return False
 
+def test_command_log():
+    """Test the player manager's command log, undo/redo and transactions."""
+    print("Testing command log...")
+    try:
+        from player_manager import PlayerManager
+        from ledger import SettlementLedger, ConservationError
+
+        pm = PlayerManager()
+        for name in ("A", "B", "C"):
+            pm.add_player(name)
+        pm.deposit_funds("B", 50)
+        pm.set_bet("B", 20)
+        pm.remove_player("B")
+        assert list(pm.players) == ["A", "C"]
+
+        # Undo restores the seat, then the bet and the deposit
+        assert pm.undo() and list(pm.players) == ["A", "B", "C"]
+        assert pm.undo() and pm.players["B"]["current_bet"] == 0
+        assert pm.undo() and pm.players["B"]["balance"] == 100
+        assert pm.redo() and pm.redo() and pm.players["B"]["current_bet"] == 20
+        print(f"✓ Undo/redo: B has ${pm.players['B']['balance']}, bet ${pm.players['B']['current_bet']}")
+
+        # A failing block rolls back every change it made
+        balances = {name: p["balance"] for name, p in pm.players.items()}
+        try:
+            with pm.transaction():
+                pm.deposit_funds("A", 10)
+                pm.remove_player("C")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert {name: p["balance"] for name, p in pm.players.items()} == balances
+        assert list(pm.players) == ["A", "B", "C"]
+
+        # A half-settled round is rolled back, ledger totals included
+        ledger = SettlementLedger(check_conservation=True)
+        totals = iter([0, 1])  # Pretend a dollar appeared during settlement
+        ledger._money_in_system = lambda player_manager: next(totals)
+        pm.set_bet("A", 10)
+        pm.set_bet("C", 10)
+        try:
+            ledger.settle_round(pm, {"A": {"bet": 10}, "C": {"bet": 10}}, ["A"])
+        except ConservationError:
+            pass
+        assert {name: p["balance"] for name, p in pm.players.items()} == balances
+        assert pm.players["A"]["current_bet"] == 10 and ledger.rounds_settled == 0
+        print("✓ Transaction rollback")
+
+        # Starting and leaving a game (as the app does) drops the undo history
+        game = PlayerManager()
+        game.add_player("A")
+        game.add_player("B")
+        game.clear_history()  # _start_game
+        game.set_bet("A", 10)
+        game.set_bet("B", 10)
+        SettlementLedger().settle_round(game, {"A": {"bet": 10}, "B": {"bet": 10}}, ["A"])
+        game.reset_game()
+        game.clear_history()  # _back_to_setup
+        assert not game.undo() and not game.can_redo()
+        assert game.players["A"]["balance"] == 110 and game.players["A"]["rounds_won"] == 1
+        print("✓ Settled rounds cannot be undone from the setup screen")
+
+        # Consumers read the stream incrementally until they fall behind the bounded log
+        seq = pm.last_seq
+        pm.deposit_funds("A", 5)
+        commands = pm.commands_since(seq)
+        assert [(op, name) for _, op, name, _ in commands] == [("update", "A")]
+        small = PlayerManager(history_limit=2)
+        for name in ("X", "Y", "Z"):
+            small.add_player(name)
+        assert small.commands_since(0) is None and len(small.commands_since(1)) == 2
+        print(f"✓ Command stream: seq {pm.last_seq}")
+
+        return True
+    except Exception as e:
+        print(f"✗ Command log test failed: {e}")
+        return False
+
+
+def test_leaderboard():
+    """Test leaderboard index module."""
+    print("Testing leaderboard module...")
+    try:
+        from leaderboard import LeaderboardIndex
+        from player_manager import PlayerManager
+
+        index = LeaderboardIndex(seed=1)
+        index.update("A", 2, 100)
+        index.update("B", 5, 50)
+        index.update("C", 2, 150)
+        assert index.top() == ["B", "C", "A"]
+        assert index.rank("A") == 3 and index.kth(2) == "C"
+        index.update("A", 6, 100)
+        index.remove("B")
+        assert index.top(2) == ["A", "C"] and len(index) == 2
+        print("✓ Index ordering, rank and top-k")
+
+        pm = PlayerManager()
+        for name in ("X", "Y", "Z"):
+            pm.add_player(name)
+        pm.deposit_funds("Z", 50)
+        pm.players["Y"]["rounds_won"] = 3
+        pm.notify_player_changed("Y")
+        assert pm.get_leaderboard() == [("Y", 3), ("Z", 0), ("X", 0)]
+        assert pm.get_player_rank("X") == 3
+        print("✓ PlayerManager leaderboard follows the change feed")
+        return True
+    except Exception as e:
+        print(f"✗ Leaderboard test failed: {e}")
+        return False
+
+def test_ledger():
+    """Test settlement ledger module (exact pot accounting)."""
+    print("Testing ledger module...")
+    try:
+        from ledger import SettlementLedger
+        from player_manager import PlayerManager
+
+        ledger = SettlementLedger("carry")
+        assert ledger.split_pot(10, ["A", "B", "C"]) == {"A": 3, "B": 3, "C": 3}
+        assert ledger.carry_over == 1
+        assert ledger.split_pot(10, ["A", "B"]) == {"A": 5, "B": 5} and ledger.carry_over == 1
+        assert SettlementLedger("first_seat").split_pot(10, ["A", "B", "C"])["A"] == 4
+        house = SettlementLedger("house")
+        house.split_pot(10, ["A", "B", "C"])
+        assert house.house_total == 1
+        print("✓ Remainder policies")
+
+        pm = PlayerManager()
+        for name in ("A", "B", "C"):
+            pm.add_player(name)
+        round_rolls = {
+            "A": {"outcome": "Point", "value": 6, "bet": 5},
+            "B": {"outcome": "Point", "value": 6, "bet": 5},
+            "C": {"outcome": "Lose", "value": "1-2-3 (Automatic Loss)", "bet": 5}
+        }
+        ledger = SettlementLedger("carry", check_conservation=True)
+        result = ledger.settle_round(pm, round_rolls, ["A", "B"])
+        assert result["pot"] == 15 and ledger.carry_over == 1
+        assert pm.players["A"]["balance"] == 102 and pm.players["C"]["balance"] == 95
+        assert pm.get_leaderboard(1)[0][1] == 1
+        batch = ledger.settle_batch([3, 1, 3], [5, 5, 5], [10, 10, 10])
+        assert [int(b) for b in batch["balances"]] == [13, 5, 13] and ledger.carry_over == 0
+        print("✓ settle_round and settle_batch conserve money")
+
+        ledger.carry_over = 3
+        assert ledger.pay_carry_over(pm, "A") == 3 and pm.players["A"]["balance"] == 105 and ledger.carry_over == 0
+        assert ledger.pay_carry_over(pm, "A") == 0 and pm.players["A"]["balance"] == 105
+        print("✓ Carry-over paid out at the end of a game")
+        return True
+    except Exception as e:
+        print(f"✗ Ledger test failed: {e}")
+        return False
+
+def test_tournament():
+    """Test tournament runner module."""
+    print("Testing tournament module...")
+    try:
+        from tournament import TournamentRunner, seat_tables
+        tables = seat_tables([f"P{i}" for i in range(17)], 8)
+        assert [len(t) for t in tables] == [6, 6, 5]
+        names = [f"P{i}" for i in range(30)]
+        events = list(TournamentRunner(names, table_size=6, seed=7, workers=0).run())
+        final = events[-1]
+        assert final["type"] == "tournament_complete" and final["winner"] in names
+        assert sum(balance for _, balance, _ in final["standings"]) == 30 * 100
+        print(f"✓ Elimination: {final['winner']} wins after {final['stages']} stage(s), chips conserved")
+        swiss = list(TournamentRunner(names, table_size=6, mode="swiss", swiss_rounds=3, seed=7, workers=0).run())
+        assert sum(1 for e in swiss if e["type"] == "stage_complete") == 3
+        print("✓ Swiss: 3 stages streamed")
+        return True
+    except Exception as e:
+        print(f"✗ Tournament test failed: {e}")
+        return False
+
+def test_stats():
+    """Test streaming statistics accumulators."""
+    print("Testing stats module...")
+    try:
+        import random
+        import statistics
+        from stats import RunningStats, Histogram, OutcomeCounter, GameStats
+        from dice_logic import evaluate_roll
+
+        values = [random.uniform(0, 100) for _ in range(1000)]
+        left, right = RunningStats(), RunningStats()
+        for v in values[:400]:
+            left.add(v)
+        for v in values[400:]:
+            right.add(v)
+        merged = left.merge(right)
+        assert merged.count == 1000 and abs(merged.mean - statistics.mean(values)) < 1e-9
+        assert abs(merged.variance - statistics.variance(values)) < 1e-6
+        print("✓ Welford merge matches batch mean/variance")
+
+        hist = Histogram(0, 10, 5)
+        for v in (-1, 0, 3, 9.9, 10):
+            hist.add(v)
+        other = Histogram.from_dict(hist.to_dict())
+        hist.merge(other)
+        assert hist.counts == [2, 2, 0, 0, 2] and hist.underflow == 2 and hist.overflow == 2
+        # The largest float below high can round up to index buckets; it lands in the last bucket
+        import math
+        import random
+        rng = random.Random(5)
+        for _ in range(2000):
+            low = rng.uniform(-1e6, 1e6)
+            high = low + rng.uniform(1e-6, 1e6)
+            edge = Histogram(low, high, rng.randint(1, 100))
+            edge.add(math.nextafter(high, -math.inf))
+            assert edge.counts[-1] == 1 and edge.overflow == 0
+        counter = OutcomeCounter()
+        counter.add([2, 2, 5], evaluate_roll([2, 2, 5]))
+        counter.add([1, 2, 3], evaluate_roll([1, 2, 3]))
+        assert counter.outcomes["Point"] == 1 and counter.points == {5: 1} and counter.faces[2] == 3
+        print("✓ Histogram and outcome counters")
+
+        stats = GameStats()
+        stats.record_game(12, [0, 200])
+        restored = GameStats.from_dict(stats.to_dict()).merge(stats)
+        assert restored.game_length.count == 2 and restored.balance.mean == 100
+        print("✓ GameStats round-trips and merges")
+        return True
+    except Exception as e:
+        print(f"✗ Stats test failed: {e}")
+        return False
+
+def test_export():
+    """Test columnar round exporter."""
+    print("Testing export module...")
+    try:
+        import csv
+        import os
+        import tempfile
+        from export import export_simulation
+
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, "rounds")
+            rows = export_simulation(prefix, 50, players=3, seed=1, chunk_rows=16, formats=("csv",))
+            with open(prefix + ".csv", newline="") as f:
+                data = list(csv.DictReader(f))
+        assert rows == 150 and len(data) == 150
+        assert all(1 <= int(row["die1"]) <= 6 for row in data)
+        print(f"✓ Exported {rows} rows in chunks of 16")
+
+        from export import _pyarrow_available
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, "rounds")
+            rows = export_simulation(prefix, 20, players=2, seed=1, chunk_rows=8, formats=("parquet",))
+            if _pyarrow_available:
+                import pyarrow.parquet as pq
+                table = pq.read_table(prefix + ".parquet")
+                assert rows == 40 and table.num_rows == 40 and str(table.schema.field("die1").type) == "uint8"
+                print(f"✓ Parquet export: {table.num_rows} rows")
+            else:
+                assert not os.path.exists(prefix + ".parquet")
+                print("✓ Skipped Parquet export check, pyarrow not installed")
+        return True
+    except Exception as e:
+        print(f"✗ Export test failed: {e}")
+        return False
+
+def test_fairness_audit():
+    """Test the RNG fairness audit on a small sample."""
+    print("Testing fairness audit module...")
+    try:
+        from fairness_audit import run_audit, chi_square_p_value
+        assert abs(chi_square_p_value(11.0705, 5) - 0.05) < 1e-4
+        reports = {}
+        for mode in ("single", "batch"):
+            report = reports[mode] = run_audit(60000, workers=0, mode=mode, chunk_dice=9000, seed=3)
+            assert report["totals"]["dice"] == 60000 and sum(report["totals"]["faces"]) == 60000
+            assert all(0.0 <= r["p_value"] <= 1.0 for r in report["results"])
+        # Both modes draw the same table-RNG dice through roll_single_die
+        assert reports["single"]["totals"] == reports["batch"]["totals"]
+        print(f"✓ Audit ran {len(report['results'])} tests in both modes")
+        return True
+    except Exception as e:
+        print(f"✗ Fairness audit test failed: {e}")
+        return False
+
+def test_replay():
+    """Test session recording and deterministic replay."""
+    print("Testing replay module...")
+    try:
+        import random
+        from player_manager import PlayerManager
+        from ledger import SettlementLedger
+        from round_manager import play_round
+        from replay import SessionRecorder, SessionReplayer
+
+        pm = PlayerManager()
+        for name in ("Alice", "Bob", "Cara"):
+            pm.add_player(name)
+        recorder = SessionRecorder()
+        recorder.start(pm, seed=5)
+        ledger = SettlementLedger()
+        rng = random.Random(5)
+        for _ in range(60):
+            if len(pm.get_players_with_balance()) < 2:
+                break
+            result = play_round(pm, 10, ledger, rng)
+            recorder.begin_round({n: info["bet"] for n, info in result["round_rolls"].items()})
+            for name, info in result["round_rolls"].items():
+                recorder.record_roll(name, info["rolls"])
+            recorder.end_round()
+
+        replayer = SessionReplayer(recorder.session, checkpoint_every=10)
+        while replayer.step():
+            pass
+        final = {n: p["balance"] for n, p in replayer.player_manager.players.items()}
+        assert final == {n: p["balance"] for n, p in pm.players.items()}
+        # Seeking backwards and forwards lands on the same state as stepping
+        middle = len(replayer) // 2
+        replayer.seek(middle)
+        at_middle = {n: p["balance"] for n, p in replayer.player_manager.players.items()}
+        replayer.seek(len(replayer))
+        assert {n: p["balance"] for n, p in replayer.player_manager.players.items()} == final
+        fresh = SessionReplayer(recorder.session)
+        for _ in range(middle):
+            fresh.step()
+        assert {n: p["balance"] for n, p in fresh.player_manager.players.items()} == at_middle
+        print(f"✓ Replayed {len(replayer)} rounds with matching balances")
+        return True
+    except Exception as e:
+        print(f"✗ Replay test failed: {e}")
+        return False
+
+def test_simulation():
+    """Test that an interrupted simulation resumes to identical results."""
+    print("Testing simulation module...")
+    try:
+        import json
+        import os
+        import tempfile
+        from simulation import CheckpointedSimulation
+
+        with tempfile.TemporaryDirectory() as tmp:
+            full = CheckpointedSimulation(os.path.join(tmp, "full.json"), 40, seed=7, chunk_games=8).run()
+            path = os.path.join(tmp, "resumed.json")
+            CheckpointedSimulation(path, 40, seed=7, chunk_games=8).run(max_chunks=2)
+            sim = CheckpointedSimulation(path, 40, seed=7, chunk_games=8)
+            assert sim.resumed and sim.completed_games == 16
+            resumed = sim.run()
+            assert sim.done and not os.path.exists(path + ".tmp")
+        assert json.dumps(full.to_dict()) == json.dumps(resumed.to_dict())
+        print(f"✓ Resumed run matches uninterrupted run ({full.game_length.count} games)")
+        return True
+    except Exception as e:
+        print(f"✗ Simulation test failed: {e}")
+        return False
+
+def test_shared_stats():
+    """Test shared-memory aggregation against the in-process accumulators."""
+    print("Testing shared stats module...")
+    try:
+        from shared_stats import run_shared_simulation
+        from simulation import simulate_chunk
+
+        result = run_shared_simulation(30, seed=11, workers=2)
+        reference = simulate_chunk((0, 30, 11, 4, 10, 500, "carry"))
+        assert result["games"] == 30
+        assert result["outcomes"] == reference["outcomes"]["outcomes"]
+        assert result["wins_by_seat"] == {int(k): v for k, v in reference["wins_by_seat"].items()}
+        assert result["balance_hist"]["counts"] == reference["balance_hist"]["counts"]
+        print(f"✓ Shared slots reduced to {result['rolls']} rolls matching in-process stats")
+        return True
+    except Exception as e:
+        print(f"✗ Shared stats test failed: {e}")
+        return False
+
+def test_terminal_ui():
+    """Test the terminal frontend's table flow and dice rendering."""
+    print("Testing terminal UI module...")
+    try:
+        import random
+        from terminal_ui import TerminalTable, render_dice
+
+        lines = render_dice([1, 5, 6])
+        assert len(lines) == 5 and lines[0].count("\u250c") == 3
+        table = TerminalTable(rng=random.Random(3))
+        for name in ("Alice", "Bob"):
+            table.player_manager.add_player(name)
+        assert table.start_round("abc")[0] is False
+        assert table.start_round(500)[0] is False
+        assert table.start_round(20)[0] is True
+        while not table.round_complete:
+            table.roll()
+        summary = table.finish_round()
+        balances = [p["balance"] for p in table.player_manager.players.values()]
+        assert summary["winners"] and sum(balances) + table.ledger.carry_over == 200
+        assert table.round_number == 2 and table.current_player is None
+        print(f"✓ Played round 1, winner(s): {', '.join(summary['winners'])}")
+
+        # Play to the end: the carried-over pot goes to the winner, so no money is left behind
+        while not table.game_over:
+            bet = min(p["balance"] for p in table.player_manager.players.values() if p["balance"] > 0)
+            assert table.start_round(bet)[0]
+            while not table.round_complete:
+                table.roll()
+            summary = table.finish_round()
+        balances = [p["balance"] for p in table.player_manager.players.values()]
+        assert table.ledger.carry_over == 0 and sum(balances) == 200
+        # A pot still carried over when the game ends is paid to the winner
+        winner = next(name for name, p in table.player_manager.players.items() if p["balance"] > 0)
+        table.ledger.carry_over = 3
+        summary = table.finish_round()
+        assert summary["carry_over_paid"] == 3 and table.ledger.carry_over == 0
+        assert table.player_manager.players[winner]["balance"] == 203
+        print(f"✓ Game over after round {summary['round'] - 1}, leftover pot paid to {winner}")
+        return True
+    except Exception as e:
+        print(f"✗ Terminal UI test failed: {e}")
+        return False
+
+def test_profile_store():
+    """Test persistent player profiles with write-behind flushing."""
+    print("Testing profile store module...")
+    try:
+        import os
+        import tempfile
+        from player_manager import PlayerManager
+        from profile_store import ProfileStore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profiles.db")
+            store = ProfileStore(path, flush_interval_ms=60000)
+            pm = PlayerManager()
+            store.attach(pm)
+            pm.add_player("Alice")
+            pm.deposit_funds("Alice", 50)
+            pm.set_bet("Alice", 20)
+            assert store.flushes == 0 and store.pending == 1  # Batched, not written per event
+            assert store.get_profile("Alice")["balance"] == 150
+            store.close()
+
+            store = ProfileStore(path)
+            pm = PlayerManager()
+            pm.add_player("Alice")
+            pm.add_player("Newcomer")
+            assert store.restore_player(pm, "Alice") and pm.get_player("Alice")["balance"] == 150
+            assert not store.restore_player(pm, "Newcomer")
+            store.close()
+
+            # The app's order: attached to the feed before the returning player sits down
+            store = ProfileStore(path, flush_interval_ms=0)
+            pm = PlayerManager()
+            store.attach(pm)
+            with pm.transaction():
+                pm.add_player("Alice")
+                assert store.restore_player(pm, "Alice") and pm.get_player("Alice")["balance"] == 150
+            store.flush()
+            assert store.get_profile("Alice") == {"balance": 150, "rounds_won": 0}
+            # Undo/redo of the seat brings the restored profile back with it
+            assert pm.undo() and "Alice" not in pm.players
+            assert pm.redo() and pm.get_player("Alice")["balance"] == 150
+            pm.set_bet("Alice", 10)
+            store.flush()
+            assert store.get_profile("Alice")["balance"] == 150
+            store.close()
+        print("✓ Profile survived a restart with a single batched write")
+        return True
+    except Exception as e:
+        print(f"✗ Profile store test failed: {e}")
+        return False
+
+def test_spectator():
+    """Test spectator fan-out, overflow policies and the loopback feed."""
+    print("Testing spectator module...")
+    try:
+        import json
+        import socket
+        import time
+        from spectator import SpectatorBroadcaster
+
+        feed = SpectatorBroadcaster("Table 1")
+        fast = feed.subscribe(limit=10)
+        slow = feed.subscribe(limit=2)
+        strict = feed.subscribe(limit=2, policy="drop")
+        for i in range(4):
+            feed.publish("roll", player="A", rolls=[i + 1, 2, 3])
+        frames = fast.drain()
+        assert len(frames) == 4
+        assert [json.loads(f)["type"] for f in slow.drain()] == ["gap", "roll", "roll"]
+        assert strict.closed and feed.subscribers == 2 and feed.dropped == 1
+        print(f"✓ Fan-out: {feed.seq} events, slow spectator coalesced, strict one dropped")
+
+        port = feed.serve_tcp(0)
+        try:
+            client = socket.create_connection(("127.0.0.1", port), timeout=5)
+            while feed.subscribers < 3:
+                time.sleep(0.01)
+            feed.publish("round", winners=["A"], pot=30)
+            line = client.makefile().readline()
+            client.close()
+            event = json.loads(line)
+            assert event["type"] == "round" and event["table"] == "Table 1" and event["seq"] == 5
+        finally:
+            feed.close()
+        print(f"✓ Loopback feed on port {port}")
+
+        return True
+    except Exception as e:
+        print(f"✗ Spectator test failed: {e}")
+        return False
+
+def test_state_sync():
+    """Test snapshot + delta mirroring of a table, including gaps and membership changes."""
+    print("Testing state sync module...")
+    try:
+        import random
+        from player_manager import PlayerManager
+        from ledger import SettlementLedger
+        from round_manager import play_round
+        from state_sync import TableStateServer, TableStateClient, SYNCED_FIELDS, encode_message, decode_message
+
+        pm = PlayerManager(history_limit=0)
+        for i in range(200):
+            pm.add_player(f"P{i}")
+        server = TableStateServer(pm)
+        client = TableStateClient()
+        client.apply(decode_message(encode_message(server.snapshot())))
+
+        def mirrored():
+            expected = {name: {f: p.get(f) for f in SYNCED_FIELDS} for name, p in pm.players.items()}
+            return client.players == expected and client.order == list(pm.players)
+
+        # A single deposit costs bytes for one field of one player, not the whole table
+        pm.deposit_funds("P7", 5)
+        delta = server.delta_since(client.seq)
+        assert delta["players"] == {"P7": {"balance": 105}}
+        assert len(encode_message(delta)) * 50 < len(encode_message(server.snapshot()))
+        client.apply(delta)
+
+        rng = random.Random(11)
+        ledger = SettlementLedger()
+        for _ in range(3):
+            play_round(pm, 5, ledger, rng)
+            assert client.apply(decode_message(encode_message(server.delta_since(client.seq))))
+        pm.remove_player("P3")
+        pm.add_player("Late")
+        assert client.apply(server.delta_since(client.seq)) and mirrored()
+        print(f"✓ Mirrored {len(client.players)} players at seq {client.seq}")
+
+        # A lost push is detected and repaired with a delta from the client's position
+        first = server.next_message()
+        assert client.apply(first)
+        pm.deposit_funds("P1", 1)
+        server.next_message()  # Lost
+        pm.deposit_funds("P2", 1)
+        assert not client.apply(server.next_message()) and client.needs_resync
+        assert client.apply(server.delta_since(client.seq)) and mirrored()
+        print("✓ Gap detected and resynced")
+
+        # Spectators get a snapshot as they join and after a gap, whatever the listener count did
+        import json
+        from spectator import SpectatorBroadcaster
+        feed = SpectatorBroadcaster("Table 1", snapshot=lambda: {"state": server.snapshot(server.last_round)})
+        leaving = feed.subscribe()
+        feed.publish("state", state=server.next_message())
+        feed.unsubscribe(leaving)
+        pm.deposit_funds("P4", 3)
+        viewer = TableStateClient()
+        joined = feed.subscribe(limit=3)  # Same listener count as before the leave
+        pm.deposit_funds("P5", 3)
+        feed.publish("state", state=server.next_message())  # A delta from before the join
+        for frame in joined.drain():
+            assert viewer.apply(json.loads(frame)["state"])
+        expected = {name: {f: p.get(f) for f in SYNCED_FIELDS} for name, p in pm.players.items()}
+        assert viewer.players == expected and viewer.seq == server.seq and not viewer.needs_resync
+        for _ in range(5):
+            pm.deposit_funds("P6", 1)
+            feed.publish("state", state=server.next_message())
+        frames = [json.loads(frame) for frame in joined.drain()]
+        assert frames[0]["type"] == "gap" and frames[1]["state"]["kind"] == "snapshot"
+        for frame in frames[1:]:
+            assert viewer.apply(frame["state"])
+        expected = {name: {f: p.get(f) for f in SYNCED_FIELDS} for name, p in pm.players.items()}
+        assert viewer.players == expected and viewer.seq == server.seq
+        print("✓ Joining and lagging spectators resync from a snapshot at once")
+
+        return True
+    except Exception as e:
+        print(f"✗ State sync test failed: {e}")
+        return False
+
+def test_load_test():
+    """Test the table-hosting load generator in-process and over loopback."""
+    print("Testing load test module...")
+    try:
+        import asyncio
+        from load_test import run_inprocess, run_loopback
+
+        recorder, host = run_inprocess(clients=50, rounds=20, bet=40, seats_per_table=4, seed=5)
+        report = recorder.report()
+        assert report["roll"]["count"] == 50 * 20 and report["roll"]["errors"] == 0
+        assert report["leave"]["count"] == report["bet"]["errors"]  # Broke players rejoin
+        assert len(host.tables) == 13 and host.rounds_settled == 13 * 20
+        print(f"✓ In-process: p99 roll {report['roll']['p99_us']:.1f} us")
+
+        recorder, host = asyncio.run(run_loopback(clients=20, rounds=5, bet=10, seats_per_table=4, seed=5))
+        report = recorder.report()
+        assert report["roll"]["count"] == 100 and report["sync"]["count"] == 100 and report["roll"]["errors"] == 0
+        print(f"✓ Loopback: {host.rounds_settled} rounds settled")
+
+        return True
+    except Exception as e:
+        print(f"✗ Load test test failed: {e}")
+        return False
+
 def test_music_manager():
     """Test music manager module."""
     print("Testing music manager module...")
@@ -89,12 +742,353 @@ def test_gui_components():
         
         color = get_outcome_color("Win")
         print(f"✓ Outcome color: {color}")
+
+        from gui_components import AnimationClock
+
+        class Timer:
+            """Collects `after` callbacks so the clock can be ticked by hand."""
+            def __init__(self):
+                self.pending = []
+            def after(self, ms, callback):
+                self.pending.append(callback)
+                return len(self.pending)
+
+        timer = Timer()
+        clock = AnimationClock(timer)
+        frames = {"a": [], "b": []}
+        clock.add(lambda f: frames["a"].append(f) or f < 3)
+        clock.add(lambda f: frames["b"].append(f) or f < 1)
+        while timer.pending:
+            timer.pending.pop(0)()
+        assert frames == {"a": [0, 1, 2, 3], "b": [0, 1]} and clock.active == 0
+        print("✓ Animation clock drove two animations on one timer")
         
         return True
     except Exception as e:
         print(f"✗ GUI components test failed: {e}")
         return False
 
+def test_frequency_panel():
+    """Test observed vs. theoretical frequency rows (the panel itself needs a display)."""
+    print("Testing frequency panel module...")
+    try:
+        import random
+        from frequency_panel import frequency_rows
+        from rules import RuleSet
+        from stats import OutcomeCounter
+
+        rules = RuleSet("standard")
+        theoretical = rules.theoretical_frequencies()
+        assert abs(sum(theoretical["outcomes"].values()) - 1) < 1e-12
+        assert abs(theoretical["outcomes"]["Win"] - 12 / 216) < 1e-12  # 4-5-6 (6 ways) + trips (6)
+
+        rng = random.Random(9)
+        fair, loaded = OutcomeCounter(), OutcomeCounter()
+        for _ in range(5000):
+            rolls = [rng.randint(1, 6) for _ in range(3)]
+            fair.add(rolls, rules.evaluate(rolls))
+            rolls = [rng.choice((1, 2, 3, 4, 5, 6, 6)) for _ in range(3)]  # A die that favours 6
+            loaded.add(rolls, rules.evaluate(rolls))
+        fair_z = {label: z for label, _, _, _, z in frequency_rows(fair, theoretical)}
+        loaded_z = {label: z for label, _, _, _, z in frequency_rows(loaded, theoretical)}
+        assert max(abs(z) for z in fair_z.values()) < 4
+        assert loaded_z["Face 6"] > 5
+        print(f"✓ Loaded die stands out: Face 6 z={loaded_z['Face 6']:+.1f} (fair {fair_z['Face 6']:+.1f})")
+
+        return True
+    except Exception as e:
+        print(f"✗ Frequency panel test failed: {e}")
+        return False
+
+def test_risk_of_ruin():
+    """Test the exact risk-of-ruin chain against gambler's ruin and simulated games."""
+    print("Testing risk of ruin module...")
+    try:
+        import random
+        from ledger import SettlementLedger
+        from player_manager import PlayerManager
+        from risk_of_ruin import risk_of_ruin, round_outcomes
+        from round_manager import play_round
+
+        outcomes = round_outcomes(3)
+        assert abs(sum(outcomes.values()) - 1) < 1e-12
+        # By symmetry the player's expected share of the pot is 1 / (players at the table)
+        assert abs(sum(p / w for w, p in outcomes.items() if w) - 1 / 4) < 1e-12
+
+        # Heads-up for 1 with ties pushed is a fair random walk: ruin = 1 - balance / target
+        walk = risk_of_ruin(30, 1, 1, 60, remainder_policy="house", solver="python")
+        assert abs(walk["ruin_probability"] - 0.5) < 1e-9
+        dense = risk_of_ruin(30, 1, 1, 60, remainder_policy="house")
+        assert abs(dense["expected_rounds"] - walk["expected_rounds"]) < 1e-6
+
+        exact = risk_of_ruin(30, 10, 2, 60, remainder_policy="house")
+        rng, ruined, rounds, games = random.Random(4), 0, 0, 3000
+        for _ in range(games):
+            pm = PlayerManager(history_limit=0)
+            for name in ("P", "A", "B"):
+                pm.add_player(name)
+            pm.players["P"]["balance"] = 30
+            pm.players["A"]["balance"] = pm.players["B"]["balance"] = 10 ** 9
+            ledger = SettlementLedger("house")
+            while 0 < pm.players["P"]["balance"] < 60:
+                play_round(pm, 10, ledger, rng)
+                rounds += 1
+            ruined += pm.players["P"]["balance"] == 0
+        assert abs(ruined / games - exact["ruin_probability"]) < 0.05
+        assert abs(rounds / games - exact["expected_rounds"]) < 0.5
+        print(f"✓ Ruin {exact['ruin_probability']:.3f} exact vs {ruined / games:.3f} over {games} games")
+
+        return True
+    except Exception as e:
+        print(f"✗ Risk of ruin test failed: {e}")
+        return False
+
+def test_bet_policy():
+    """Test the optimal bet-sizing tables, their disk cache and the bot/suggestion lookups."""
+    print("Testing bet policy module...")
+    try:
+        import os
+        import tempfile
+        import bet_policy
+        from bet_policy import BetAdvisor, solve_policy
+        from player_manager import PlayerManager
+        from risk_of_ruin import risk_of_ruin
+
+        policy = solve_policy(2, 60, remainder_policy="house")
+        assert policy.bet(0) == 0 and policy.bet(60) == 0
+        assert all(1 <= policy.bet(b) <= b for b in range(1, 60))
+        # No flat bet does better than the policy from any balance
+        for flat in (1, 3, 5, 10, 20):
+            ruin = risk_of_ruin(30, flat, 2, 60, remainder_policy="house", match_all_in=True)["ruin_by_balance"]
+            assert all(1 - ruin[b] <= policy.values[b] + 1e-9 for b in range(61))
+
+        saved = bet_policy._numpy_available
+        bet_policy._numpy_available = False
+        try:
+            plain = solve_policy(2, 60, remainder_policy="house", solver="python")
+        finally:
+            bet_policy._numpy_available = saved
+        assert plain.bets == policy.bets
+        print(f"✓ Policy at 30 of 60 bets {policy.bet(30)} (reach target {policy.values[30]:.4f})")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            advisor = BetAdvisor(remainder_policy="house", cache_dir=cache_dir, max_target=100)
+            # Interactive lookups never solve; precompute fills the cache off the calling thread
+            assert advisor.suggest(30, 2, 60, solve=False) is None
+            worker = advisor.precompute([(2, 60), (2, 60), (2, 500)])  # Duplicate and oversized skipped
+            worker.join(60)
+            assert advisor.precompute([(2, 60)]) is None
+            assert advisor.suggest(30, 2, 60, solve=False) == policy.bet(30)
+            assert advisor.suggest(30, 2, 500) is None  # Above max_target
+            assert len(os.listdir(cache_dir)) == 1
+            reloaded = BetAdvisor(remainder_policy="house", cache_dir=cache_dir).policy(2, 60)
+            assert reloaded.bets == policy.bets
+            assert advisor.suggest(0, 2, 60) is None and advisor.suggest(60, 2, 60) is None
+            assert advisor.suggest(30, 0, 60) is None
+            # Rules that differ in a flag but share a name do not share cached tables
+            from rules import RuleSet
+            variant = BetAdvisor(RuleSet(ace_point_high=True), remainder_policy="house", cache_dir=cache_dir)
+            assert variant.cached(2, 60) is None
+
+            pm = PlayerManager()
+            for name in ("Bot", "Alice", "Bob"):
+                pm.add_player(name)
+            pm.players["Bot"]["balance"] = 30
+            assert advisor.bot_bet(pm, "Bot", target=60) == policy.bet(30)
+            # The target is the money actually on the table, deposits and carried-over pots included
+            from ledger import SettlementLedger
+            from bet_policy import table_target
+            table_ledger = SettlementLedger("carry")
+            table_ledger.carry_over = 2
+            pm.deposit_funds("Alice", 50)
+            assert table_target(pm) == 280 and table_target(pm, table_ledger) == 282
+        print("✓ Tables are cached on disk and shared by suggestions and bots")
+
+        return True
+    except Exception as e:
+        print(f"✗ Bet policy test failed: {e}")
+        return False
+
+def test_leak_monitor():
+    """Test the widget and heap leak monitor against a stand-in widget tree."""
+    print("Testing leak monitor module...")
+    try:
+        from leak_monitor import LeakMonitor, count_widgets
+
+        class Interp:
+            """Answers the two Tcl queries the monitor makes."""
+            def __init__(self):
+                self.commands, self.afters = ["set", "after"], []
+            def call(self, *args):
+                return self.commands if args == ("info", "commands") else self.afters
+            def splitlist(self, value):
+                return tuple(value)
+
+        class Widget:
+            def __init__(self, cls, interp):
+                self.cls, self.tk, self.children = cls, interp, []
+            def winfo_class(self):
+                return self.cls
+            def winfo_children(self):
+                return list(self.children)
+
+        interp = Interp()
+        root = Widget("Tk", interp)
+        root.children.append(Widget("Frame", interp))
+        assert count_widgets(root) == {"Tk": 1, "Frame": 1}
+
+        monitor = LeakMonitor(root, every_rounds=2, window=3)
+        monitor.start()
+        try:
+            for _ in range(8):
+                # Every round leaks a tooltip Toplevel and its callback command
+                root.children.append(Widget("Toplevel", interp))
+                interp.commands.append("enter")
+                monitor.on_round_end()
+        finally:
+            monitor.stop()
+        growth = monitor.growing()
+        assert "widgets[Toplevel]" in growth and "tcl_commands" in growth
+        assert "widgets[Frame]" not in growth and "after_handles" not in growth
+        assert "Steady growth" in monitor.report()
+        print(f"✓ Flagged growth: widgets[Toplevel] {growth['widgets[Toplevel]']}")
+
+        return True
+    except Exception as e:
+        print(f"✗ Leak monitor test failed: {e}")
+        return False
+
+def test_gui_benchmark():
+    """Test the headless UI benchmark helpers (the benchmark itself needs a display)."""
+    print("Testing GUI benchmark module...")
+    try:
+        from tkinter import messagebox
+        from gui_benchmark import automated_popups, percentile
+
+        values = sorted(float(v) for v in range(1, 101))
+        assert percentile(values, 50) == 50 and percentile(values, 99) == 99 and percentile([], 50) == 0.0
+        original = messagebox.showinfo
+        with automated_popups(bet=1) as counts:
+            messagebox.showinfo("New Round", "A new round is starting!")
+        assert counts["message"] == 1 and messagebox.showinfo is original
+        print("✓ Percentiles and popup automation")
+
+        # A roll the app never completes aborts the run instead of spinning forever
+        from types import SimpleNamespace
+        from gui_benchmark import GuiBenchmark
+        app = SimpleNamespace(
+            player_entry=SimpleNamespace(insert=lambda index, text: None), _add_player=lambda: None,
+            _start_game=lambda: None, _end_round_and_declare_winner=lambda: None, _roll_dice=lambda: None,
+            round_number=1, stats=SimpleNamespace(outcomes=SimpleNamespace(rolls=0)),
+            player_manager=SimpleNamespace(get_players_with_balance=lambda: ["A", "B"]))
+        bench = GuiBenchmark(players=2, roll_timeout=0.05)
+        bench.root = SimpleNamespace(update=lambda: None)
+        try:
+            bench._play(app)
+            raise AssertionError("rejected roll was not detected")
+        except RuntimeError:
+            pass
+        print("✓ Stuck rolls hit the deadline")
+
+        return True
+    except Exception as e:
+        print(f"✗ GUI benchmark test failed: {e}")
+        return False
+
+def test_multi_table():
+    """Smoke test two embedded tables in one window (skipped without a display)."""
+    print("Testing multi-table module...")
+    try:
+        import tkinter as tk
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            print(f"✓ Skipped, no display: {e}")
+            return True
+        try:
+            from multi_table import MultiTableApp
+
+            host = MultiTableApp(root, tables=2)
+            first, second = host.tables
+            for table in host.tables:
+                table.bet_advisor.cache_dir = None  # Keep solved tables out of the working directory
+            first.player_manager.add_player("Alice")
+            first.player_manager.add_player("Bob")
+            first._start_game()
+            root.update()
+            # The first table's bets dialog is open but does not hold the window's input
+            assert root.grab_current() is None
+            second.player_entry.insert(0, "Carol")
+            second._add_player()
+            assert "Carol" in second.player_manager.players and "Carol" not in first.player_manager.players
+            print("✓ Two embedded tables, bets dialog on one does not block the other")
+
+            # The window's Session menu forwards every table command, round export included
+            session_menu = root.nametowidget(root["menu"]).nametowidget(
+                root.nametowidget(root["menu"]).entrycget("Session", "menu"))
+            labels = [session_menu.entrycget(i, "label") for i in range(session_menu.index("end") + 1)
+                      if session_menu.type(i) == "command"]
+            assert "Export Rounds..." in labels and "Stop Export" in labels
+
+            # Re-theming rebuilds the widgets without leaving the old player lists subscribed
+            listeners = len(second.player_manager._change_listeners)
+            second._refresh_colors()
+            root.update()
+            assert len(second.player_manager._change_listeners) == listeners
+            print("✓ Color refresh keeps one set of change listeners")
+
+            # Leaving a replay re-attaches the profile store that _open_replay detached
+            from replay import SessionReplayer
+            if second.profile_store is not None:
+                second.profile_store.detach()
+                second.replayer = SessionReplayer({"seed": 1, "players": {}, "rounds": []})
+                second._back_to_setup()
+                assert second.replayer is None and second.profile_store._player_manager is second.player_manager
+                print("✓ Profile store re-attached after a replay")
+        finally:
+            root.destroy()
+
+        return True
+    except Exception as e:
+        print(f"✗ Multi-table test failed: {e}")
+        return False
+
+def test_round_profiler():
+    """Test profiling a fixed number of rounds."""
+    print("Testing round profiler module...")
+    try:
+        import os
+        import tempfile
+        import pstats
+        import random
+        from round_profiler import RoundProfiler
+        from player_manager import PlayerManager
+        from ledger import SettlementLedger
+        from round_manager import play_round
+
+        pm = PlayerManager()
+        for name in ("A", "B", "C"):
+            pm.add_player(name)
+        ledger = SettlementLedger()
+        rng = random.Random(3)
+        profiler = RoundProfiler()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rounds.prof")
+            profiler.start(2)
+            finished = []
+            for _ in range(3):
+                play_round(pm, 5, ledger, rng)
+                finished.append(profiler.on_round_end(path))
+            assert finished == [False, True, False] and not profiler.active
+            assert pstats.Stats(path).total_calls > 0
+            assert "play_round" in profiler.top_functions(limit=20)
+        print(f"✓ Profiled {profiler.rounds} rounds in {profiler.elapsed * 1000:.1f} ms")
+
+        return True
+    except Exception as e:
+        print(f"✗ Round profiler test failed: {e}")
+        return False
+
 def test_round_manager():
     """Test round manager module (winner logic, pot splitting)."""
     print("Testing round manager module...")
@@ -141,6 +1135,58 @@ def test_round_manager():
         assert pm.players["A"]["balance"] == 10 and pm.players["B"]["balance"] == 10
         assert pm.players["A"]["rounds_won"] == 1 and pm.players["B"]["rounds_won"] == 1
         print("✓ split_pot_among_winners single and tie cases")
+        # Test batch ranking and settlement against the per-player path
+        from round_manager import encode_rank, rank_rolls_batch, settle_round_batch
+        from dice_logic import evaluate_roll
+        dice = [[4, 5, 6], [2, 2, 5], [1, 2, 3], [6, 5, 4]]
+        ranks = [int(r) for r in rank_rolls_batch(dice)]
+        expected = [encode_rank(ceelo_rank(o["outcome"], o["value"])) for o in map(evaluate_roll, dice)]
+        assert ranks == expected
+        result = settle_round_batch(ranks, [10, 10, 10, 10], [50, 50, 50, 50])
+        assert [bool(w) for w in result["winner_mask"]] == [True, False, False, True]
+        assert result["pot"] == 40 and result["split"] == 20 and result["remainder"] == 0
+        assert [int(b) for b in result["balances"]] == [60, 40, 40, 60]
+        print("✓ rank_rolls_batch and settle_round_batch")
+
+        # Large tables go through the batch path and match the per-seat path exactly
+        import random
+        import ledger as ledger_module
+        import round_manager
+        from ledger import SettlementLedger
+        from player_manager import PlayerManager
+        from round_manager import play_round
+
+        def play(policy, seats, batch_min):
+            saved = round_manager.BATCH_SETTLE_MIN_SEATS
+            round_manager.BATCH_SETTLE_MIN_SEATS = ledger_module.BATCH_SETTLE_MIN_SEATS = batch_min
+            try:
+                pm = PlayerManager(history_limit=0)
+                for i in range(seats):
+                    pm.add_player(f"P{i}")
+                table_ledger = SettlementLedger(policy, check_conservation=True)
+                rng = random.Random(7)
+                winners = [play_round(pm, 7, table_ledger, rng)["winners"] for _ in range(20)]
+                return winners, pm.players, table_ledger.carry_over, table_ledger.house_total
+            finally:
+                round_manager.BATCH_SETTLE_MIN_SEATS = ledger_module.BATCH_SETTLE_MIN_SEATS = saved
+
+        for policy in ("carry", "house", "first_seat"):
+            assert play(policy, 80, 2) == play(policy, 80, 10 ** 9)
+        print("✓ Batch settlement matches the per-seat path on an 80-seat table")
+
+        # Rank tables for other dice counts are cached per rule spec, not per rule name
+        from rules import RuleSet, get_active_rules, set_active_rules
+        from round_manager import get_rank_table
+        saved_rules = get_active_rules()
+        try:
+            set_active_rules(RuleSet("house", trips_win=True))
+            trips_win = list(get_rank_table(4, 6))
+            set_active_rules(RuleSet("house", trips_win=False))
+            trips_lose = list(get_rank_table(4, 6))
+        finally:
+            set_active_rules(saved_rules)
+        assert trips_win != trips_lose
+        print("✓ Same-name rule sets with different flags get separate rank tables")
         return True
     except Exception as e:
         print(f"✗ Round manager test failed: {e}")
@@ -153,9 +1199,32 @@ def main():
     tests = [
         test_config,
         test_dice_logic,
+        test_rules,
         test_player_manager,
+        test_command_log,
+        test_leaderboard,
+        test_ledger,
+        test_profile_store,
+        test_tournament,
+        test_stats,
+        test_export,
+        test_fairness_audit,
+        test_replay,
+        test_simulation,
+        test_shared_stats,
+        test_spectator,
+        test_state_sync,
+        test_load_test,
         test_music_manager,
         test_gui_components,
+        test_frequency_panel,
+        test_risk_of_ruin,
+        test_bet_policy,
+        test_leak_monitor,
+        test_gui_benchmark,
+        test_multi_table,
+        test_round_profiler,
+        test_terminal_ui,
         test_round_manager
     ]
     
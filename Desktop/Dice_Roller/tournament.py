@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Multi-process tournament runner for Cee-lo.
+
+Runs large fields through elimination or Swiss stages. Each table is a
+PlayerManager played headlessly with round_manager.play_round, tables run
+concurrently in a process pool, and results are yielded as soon as each
+table finishes.
+"""
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import INITIAL_PLAYER_BALANCE, REMAINDER_POLICY
+from ledger import SettlementLedger
+from player_manager import PlayerManager
+from round_manager import play_round
+
+TOURNAMENT_MODES = ("elimination", "swiss")
+
+
+def seat_tables(names: List[str], table_size: int, grouped: bool = False) -> List[List[str]]:
+    """
+    Split players into the fewest tables of at most table_size seats,
+    with table sizes differing by at most one.
+    By default players are dealt round-robin; with grouped=True neighbours
+    in the list share a table.
+    """
+    if not names:
+        return []
+    num_tables = -(-len(names) // table_size)
+    if not grouped:
+        tables: List[List[str]] = [[] for _ in range(num_tables)]
+        for i, name in enumerate(names):
+            tables[i % num_tables].append(name)
+        return tables
+    base, extra = divmod(len(names), num_tables)
+    tables = []
+    start = 0
+    for table_id in range(num_tables):
+        size = base + (1 if table_id < extra else 0)
+        tables.append(names[start:start + size])
+        start += size
+    return tables
+
+
+def play_table(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Play one table for a fixed number of rounds (or until one player is left).
+    Runs in a worker process, so it only takes and returns plain data.
+    Args:
+        task (Dict[str, Any]): table_id, stage, seats [(name, balance)], bet, rounds, seed, remainder_policy.
+    Returns:
+        Dict[str, Any]: The table result with per-player balance, rounds won and is_out.
+    """
+    pm = PlayerManager(history_limit=0)  # No undo history needed for bulk play
+    for name, balance in task["seats"]:
+        pm.add_player(name)
+        pm.players[name]["balance"] = balance
+        pm.notify_player_changed(name)
+    ledger = SettlementLedger(task["remainder_policy"])
+    rng = random.Random(task["seed"])
+    rounds_played = 0
+    while rounds_played < task["rounds"] and len(pm.get_players_with_balance()) > 1:
+        play_round(pm, task["bet"], ledger, rng)
+        rounds_played += 1
+    # Whatever is still carried over goes back to the chip leader, so no chips leave the event
+    if ledger.carry_over:
+        leader = max(pm.players, key=lambda n: pm.players[n]["balance"])
+        pm.players[leader]["balance"] += ledger.carry_over
+    return {
+        "table_id": task["table_id"],
+        "stage": task["stage"],
+        "rounds_played": rounds_played,
+        "players": [
+            (name, data["balance"], data["rounds_won"], data["balance"] <= 0)
+            for name, data in pm.players.items()
+        ],
+    }
+
+
+class TournamentRunner:
+    """
+    Schedules tables for a tournament and streams results back as they complete.
+
+    elimination: every stage plays each table for rounds_per_table rounds, removes
+        busted players and re-seats the survivors into balanced tables, until one
+        player holds all the chips (or max_stages is reached).
+    swiss: every stage gives each player a fresh stack, seats players with similar
+        scores together and awards placement points; runs swiss_rounds stages.
+    """
+    def __init__(self, player_names: List[str], table_size: int = 8, mode: str = "elimination",
+                 bet: int = 10, bet_growth: float = 1.25, rounds_per_table: int = 25, swiss_rounds: int = 5,
+                 max_stages: int = 1000, seed: Optional[int] = None, workers: Optional[int] = None,
+                 remainder_policy: str = REMAINDER_POLICY) -> None:
+        """
+        Args:
+            player_names (List[str]): Entrants.
+            table_size (int): Maximum seats per table.
+            mode (str): "elimination" or "swiss".
+            bet (int): Flat bet per round in the first stage.
+            bet_growth (float): Elimination bets grow by this factor each stage so big stacks keep moving.
+            rounds_per_table (int): Rounds played at each table before seats are rebalanced.
+            swiss_rounds (int): Number of stages in Swiss mode.
+            max_stages (int): Safety cap on elimination stages.
+            seed (Optional[int]): Seed for reproducible tournaments.
+            workers (Optional[int]): Process pool size (None for CPU count, 0 to run in-process).
+            remainder_policy (str): Remainder policy for each table's ledger.
+        """
+        if mode not in TOURNAMENT_MODES:
+            raise ValueError(f"Unknown tournament mode: {mode}")
+        if table_size < 2:
+            raise ValueError("Tables need at least 2 seats.")
+        if len(set(player_names)) != len(player_names):
+            raise ValueError("Player names must be unique.")
+        self.mode = mode
+        self.table_size = table_size
+        self.bet = bet
+        self.bet_growth = bet_growth
+        self.rounds_per_table = rounds_per_table
+        self.swiss_rounds = swiss_rounds
+        self.max_stages = max_stages
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.workers = workers
+        self.remainder_policy = remainder_policy
+        self.balances: Dict[str, int] = {name: INITIAL_PLAYER_BALANCE for name in player_names}
+        self.scores: Dict[str, int] = {name: 0 for name in player_names}
+        self.rounds_won: Dict[str, int] = {name: 0 for name in player_names}
+        self.eliminated: List[str] = []
+
+    def _table_seed(self, stage: int, table_id: int) -> int:
+        return hash((self.seed, stage, table_id)) & 0xFFFFFFFF
+
+    def _stage_bet(self, stage: int) -> int:
+        if self.mode == "swiss":
+            return self.bet
+        return max(self.bet, int(self.bet * self.bet_growth ** stage))
+
+    def _make_tasks(self, stage: int, tables: List[List[str]], fresh_stacks: bool) -> List[Dict[str, Any]]:
+        return [
+            {
+                "table_id": table_id,
+                "stage": stage,
+                "seats": [(name, INITIAL_PLAYER_BALANCE if fresh_stacks else self.balances[name]) for name in seats],
+                "bet": self._stage_bet(stage),
+                "rounds": self.rounds_per_table,
+                "seed": self._table_seed(stage, table_id),
+                "remainder_policy": self.remainder_policy,
+            }
+            for table_id, seats in enumerate(tables)
+        ]
+
+    def _run_tasks(self, executor: Optional[ProcessPoolExecutor], tasks: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Run tables in the pool (or in-process) and yield results in completion order."""
+        if executor is None:
+            for task in tasks:
+                yield play_table(task)
+            return
+        futures = [executor.submit(play_table, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def _apply_result(self, result: Dict[str, Any], stage: int) -> None:
+        players = result["players"]
+        if self.mode == "swiss":
+            # Placement points: last place at the table scores 0
+            placed = sorted(players, key=lambda p: (p[1], p[2]))
+            for points, (name, _, won, _) in enumerate(placed):
+                self.scores[name] += points
+                self.rounds_won[name] += won
+            return
+        for name, balance, won, is_out in players:
+            self.balances[name] = balance
+            self.rounds_won[name] += won
+            if is_out:
+                self.eliminated.append(name)
+
+    def _seating_order(self, stage: int) -> List[str]:
+        if self.mode == "swiss":
+            # Group players with similar scores; shuffle within equal scores
+            rng = random.Random(self._table_seed(stage, -1))
+            names = list(self.scores)
+            rng.shuffle(names)
+            return sorted(names, key=lambda n: -self.scores[n])
+        alive = [n for n, b in self.balances.items() if b > 0]
+        # Deal players round-robin in chip order so stacks stay balanced
+        return sorted(alive, key=lambda n: -self.balances[n])
+
+    def standings(self) -> List[Tuple[str, int, int]]:
+        """
+        Current standings as (name, score_or_balance, rounds_won), best first.
+        """
+        key = self.scores if self.mode == "swiss" else self.balances
+        return sorted(((n, key[n], self.rounds_won[n]) for n in key), key=lambda x: (-x[1], -x[2]))
+
+    def run(self) -> Iterator[Dict[str, Any]]:
+        """
+        Run the tournament, yielding events as they happen:
+        "table_result" for each finished table, "stage_complete" after each stage
+        and a final "tournament_complete" with the standings.
+        """
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 0 else None
+        try:
+            stage = 0
+            while True:
+                if self.mode == "swiss" and stage >= self.swiss_rounds:
+                    break
+                order = self._seating_order(stage)
+                if self.mode == "elimination" and (len(order) <= 1 or stage >= self.max_stages):
+                    break
+                tables = seat_tables(order, self.table_size, grouped=self.mode == "swiss")
+                tasks = self._make_tasks(stage, tables, fresh_stacks=self.mode == "swiss")
+                for result in self._run_tasks(executor, tasks):
+                    self._apply_result(result, stage)
+                    yield {"type": "table_result", **result}
+                remaining = sum(1 for b in self.balances.values() if b > 0)
+                yield {"type": "stage_complete", "stage": stage, "tables": len(tables),
+                       "remaining": remaining if self.mode == "elimination" else len(self.scores)}
+                stage += 1
+            standings = self.standings()
+            yield {"type": "tournament_complete", "stages": stage,
+                   "winner": standings[0][0] if standings else None, "standings": standings}
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+
+def main() -> None:
+    """
+    Command-line entry point: run a simulated tournament and print progress.
+    """
+    parser = argparse.ArgumentParser(description="Run a simulated Cee-lo tournament.")
+    parser.add_argument("--players", type=int, default=1000, help="Number of entrants")
+    parser.add_argument("--table-size", type=int, default=8, help="Seats per table")
+    parser.add_argument("--mode", choices=TOURNAMENT_MODES, default="elimination")
+    parser.add_argument("--bet", type=int, default=10, help="Flat bet per round")
+    parser.add_argument("--bet-growth", type=float, default=1.25, help="Elimination bet growth per stage")
+    parser.add_argument("--rounds-per-table", type=int, default=25, help="Rounds between reseating")
+    parser.add_argument("--swiss-rounds", type=int, default=5, help="Stages in Swiss mode")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    runner = TournamentRunner(
+        [f"Player{i + 1}" for i in range(args.players)],
+        table_size=args.table_size,
+        mode=args.mode,
+        bet=args.bet,
+        bet_growth=args.bet_growth,
+        rounds_per_table=args.rounds_per_table,
+        swiss_rounds=args.swiss_rounds,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    for event in runner.run():
+        if event["type"] == "stage_complete":
+            print(f"Stage {event['stage'] + 1}: {event['tables']} table(s), {event['remaining']} player(s) remaining")
+        elif event["type"] == "tournament_complete":
+            print(f"Winner: {event['winner']} after {event['stages']} stage(s)")
+            for place, (name, score, won) in enumerate(event["standings"][:10], 1):
+                print(f"{place}. {name}: {score} ({won} round(s) won)")
+
+
+if __name__ == "__main__":
+    main()